@@ -0,0 +1,278 @@
+"""Persistent SQLite cache for per-file analysis reports.
+
+Nightly analysis runs over a mostly unchanged library, so reports from
+:func:`refiner_core.analyzer.analyze_path` and ``uv_analyzer.analyze_file``
+are stored on disk. Entries are keyed by analyzer name, analyzer version,
+parameters and resolved file path. They stay valid while the file's size and
+mtime match, or, when a content digest was recorded, while its bytes still
+hash the same (so a touched but unchanged file is still a hit). Files the
+model references (glTF buffers and images, OBJ material libraries and their
+textures) are recorded with their size and mtime, and any change to them,
+including one appearing or disappearing, also invalidates the report. The
+table is trimmed least recently used first once the stored reports exceed a
+byte cap.
+
+The cache is meant to be used from one process (the parent of any worker
+pool): lookups touch only SQLite and ``os.stat``, and bookkeeping writes are
+committed with the next stored report or on :meth:`AnalysisCache.close`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import struct
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import unquote
+
+DEFAULT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+_HASH_CHUNK = 1 << 20
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    key TEXT PRIMARY KEY,
+    file TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    digest TEXT,
+    report TEXT NOT NULL,
+    nbytes INTEGER NOT NULL,
+    last_used REAL NOT NULL,
+    deps TEXT
+)
+"""
+
+# MTL statements whose last argument is a texture file
+_MTL_MAPS = (b'map_', b'bump', b'disp', b'decal', b'norm', b'refl')
+
+
+def content_hash(path: Path) -> str:
+    """BLAKE2b digest of a file's bytes, read in 1 MiB chunks."""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as fh:
+        for chunk in iter(lambda: fh.read(_HASH_CHUNK), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _gltf_uris(doc: Dict[str, Any]) -> List[str]:
+    uris = []
+    for section in ('buffers', 'images'):
+        for item in doc.get(section) or []:
+            uri = item.get('uri') if isinstance(item, dict) else None
+            if uri and not uri.startswith('data:'):
+                uris.append(unquote(uri))
+    return uris
+
+
+def _mtl_textures(mtl: Path) -> List[str]:
+    names = []
+    with open(mtl, 'rb') as fh:
+        for line in fh:
+            line = line.strip()
+            if line.startswith(_MTL_MAPS):
+                parts = line.split()
+                if len(parts) > 1:
+                    names.append(parts[-1].decode('utf-8', 'replace'))
+    return names
+
+
+def referenced_files(path: Path) -> List[Path]:
+    """External files a model loads alongside ``path`` (existing or not).
+
+    glTF/GLB: buffer and image URIs that are not embedded ``data:`` URIs.
+    OBJ: ``mtllib`` files and the textures their ``map_*``-style statements
+    name. Unreadable or malformed files yield what was found so far.
+    """
+    path = Path(path)
+    base = path.parent
+    ext = path.suffix.lower()
+    found: List[Path] = []
+    try:
+        if ext == '.gltf':
+            with open(path, 'r', encoding='utf-8') as fh:
+                found = [base / uri for uri in _gltf_uris(json.load(fh))]
+        elif ext == '.glb':
+            with open(path, 'rb') as fh:
+                header = fh.read(20)
+                if len(header) == 20 and header[:4] == b'glTF' and header[16:20] == b'JSON':
+                    length = struct.unpack('<I', header[12:16])[0]
+                    found = [base / uri for uri in _gltf_uris(json.loads(fh.read(length)))]
+        elif ext == '.obj':
+            with open(path, 'rb') as fh:
+                for line in fh:
+                    if line.startswith(b'mtllib'):
+                        found.extend(base / n.decode('utf-8', 'replace') for n in line.split()[1:])
+            for mtl in list(found):
+                if mtl.is_file():
+                    found.extend(mtl.parent / name for name in _mtl_textures(mtl))
+    except (OSError, ValueError):
+        pass
+    return found
+
+
+def _dep_stats(path: Path) -> List[List[Any]]:
+    # (path, size, mtime_ns) per referenced file; a missing one is (-1, -1)
+    stats = []
+    for dep in referenced_files(path):
+        try:
+            st = os.stat(dep)
+            stats.append([str(dep), st.st_size, st.st_mtime_ns])
+        except OSError:
+            stats.append([str(dep), -1, -1])
+    return stats
+
+
+def _deps_fresh(deps: Optional[str]) -> bool:
+    for dep, size, mtime_ns in json.loads(deps or '[]'):
+        try:
+            st = os.stat(dep)
+            current = (st.st_size, st.st_mtime_ns)
+        except OSError:
+            current = (-1, -1)
+        if current != (size, mtime_ns):
+            return False
+    return True
+
+
+def cache_key(path: Path, analyzer: str, version: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """Stable key for one file under one analyzer version and parameter set."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(json.dumps([analyzer, version, params or {}, str(path)], sort_keys=True).encode('utf-8'))
+    return h.hexdigest()
+
+
+class AnalysisCache:
+    """SQLite-backed report cache with stat/digest validation and a byte cap.
+
+    With ``verify_hash`` a content digest is stored with every report and
+    checked on every hit; otherwise size and mtime decide, and a digest is
+    only computed when they changed and one was stored earlier.
+    """
+
+    def __init__(self, path: Path, max_bytes: int = DEFAULT_CACHE_MAX_BYTES, verify_hash: bool = False):
+        self.path = Path(path)
+        self.max_bytes = int(max_bytes)
+        self.verify_hash = bool(verify_hash)
+        self.hits = 0
+        self.misses = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path))
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute('PRAGMA table_info(reports)')}
+        if 'deps' not in columns:
+            # Caches from before dependency tracking: their rows cannot be validated
+            self._conn.execute('DELETE FROM reports')
+            self._conn.execute('ALTER TABLE reports ADD COLUMN deps TEXT')
+        self._conn.commit()
+        # Running total of stored report bytes, kept in step by put/trim/invalidate
+        self._nbytes = int(self._conn.execute('SELECT COALESCE(SUM(nbytes), 0) FROM reports').fetchone()[0])
+
+    def get(self, path: Path, analyzer: str, version: str,
+            params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Cached report for ``path``, or ``None`` if missing or stale."""
+        path = Path(path).resolve()
+        key = cache_key(path, analyzer, version, params)
+        row = self._conn.execute(
+            'SELECT size, mtime_ns, digest, report, deps FROM reports WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        size, mtime_ns, digest, report, deps = row
+        try:
+            st = os.stat(path)
+        except OSError:
+            self.misses += 1
+            return None
+        fresh = st.st_size == size and st.st_mtime_ns == mtime_ns
+        if digest is not None and (self.verify_hash or not fresh):
+            # Re-hash: catches edits that kept size/mtime, and rescues touched files
+            fresh = st.st_size == size and content_hash(path) == digest
+            if fresh and st.st_mtime_ns != mtime_ns:
+                self._conn.execute('UPDATE reports SET mtime_ns = ? WHERE key = ?', (st.st_mtime_ns, key))
+        if not fresh or not _deps_fresh(deps):
+            self.misses += 1
+            return None
+        self._conn.execute('UPDATE reports SET last_used = ? WHERE key = ?', (time.time(), key))
+        self.hits += 1
+        return json.loads(report)
+
+    def put(self, path: Path, analyzer: str, version: str, params: Optional[Dict[str, Any]],
+            report: Dict[str, Any]) -> None:
+        """Store ``report`` for ``path`` and trim the cache to its byte cap."""
+        path = Path(path).resolve()
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        digest = content_hash(path) if self.verify_hash else None
+        text = json.dumps(report)
+        key = cache_key(path, analyzer, version, params)
+        old = self._conn.execute('SELECT nbytes FROM reports WHERE key = ?', (key,)).fetchone()
+        self._conn.execute(
+            'INSERT OR REPLACE INTO reports (key, file, size, mtime_ns, digest, report, nbytes, last_used, deps) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (key, str(path), st.st_size, st.st_mtime_ns, digest, text, len(text), time.time(),
+             json.dumps(_dep_stats(path))))
+        self._nbytes += len(text) - (old[0] if old else 0)
+        self._trim()
+        self._conn.commit()
+
+    def get_or_compute(self, path: Path, analyzer: str, version: str, params: Optional[Dict[str, Any]],
+                       compute: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        report = self.get(path, analyzer, version, params)
+        if report is None:
+            report = compute()
+            self.put(path, analyzer, version, params, report)
+        return report
+
+    def invalidate(self, path: Optional[Path] = None) -> int:
+        """Drop every entry for ``path`` (all entries if ``None``); returns the count."""
+        if path is None:
+            cur = self._conn.execute('DELETE FROM reports')
+        else:
+            cur = self._conn.execute('DELETE FROM reports WHERE file = ?', (str(Path(path).resolve()),))
+        self._conn.commit()
+        self._nbytes = int(self._conn.execute('SELECT COALESCE(SUM(nbytes), 0) FROM reports').fetchone()[0])
+        return int(cur.rowcount)
+
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    def __len__(self) -> int:
+        return int(self._conn.execute('SELECT COUNT(*) FROM reports').fetchone()[0])
+
+    def _trim(self) -> None:
+        excess = self.nbytes - self.max_bytes
+        if excess <= 0:
+            return
+        # Oldest first until the running total covers the excess
+        rows = self._conn.execute('SELECT key, nbytes FROM reports ORDER BY last_used ASC')
+        doomed = []
+        for key, nb in rows:
+            if excess <= 0:
+                break
+            doomed.append((key,))
+            excess -= nb
+            self._nbytes -= nb
+        self._conn.executemany('DELETE FROM reports WHERE key = ?', doomed)
+
+    def close(self) -> None:
+        try:
+            self._conn.commit()
+        finally:
+            self._conn.close()
+
+    def __enter__(self) -> 'AnalysisCache':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
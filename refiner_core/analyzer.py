@@ -6,12 +6,15 @@ Key features:
 - Symmetry probing using Chamfer distance metric
 - UV validation and out-of-bounds calculation
 - Component and degenerate face detection
+- Lazy, memoized metric tiers (quick, topology, uv, uv_quality, symmetry) via
+  MeshAnalysis, sharing one set of derived mesh arrays per mesh
 """
 
 from __future__ import annotations
 
+from functools import cached_property
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 
 
 def _imp_trimesh():
@@ -26,19 +29,141 @@ def _imp_numpy():
     return import_module('numpy')
 
 
-def _analyze_geometry(mesh) -> Dict[str, Any]:
-    """Analyze geometric properties of a mesh.
-    
-    Args:
-        mesh: A trimesh.Trimesh object.
-        
-    Returns:
-        Dictionary with keys: has_geometry, num_vertices, num_faces, is_watertight,
-        is_winding_consistent, euler_number, num_open_edges, num_degenerate_faces,
-        nonfinite_vertex_values, bbox_min, bbox_max, bbox_extents, centroid, num_components.
+def _edge_groups(faces) -> Dict[str, Any]:
+    """Directed half-edges grouped into undirected edges with one lexsort.
+
+    Half-edge ``3 * f + k`` runs from corner ``k`` of face ``f`` to corner
+    ``k + 1``. ``order`` sorts half-edges by undirected edge and
+    ``run_start`` marks where each edge's run begins (with a final
+    sentinel), so ``count`` is the number of faces on each edge.
     """
     np = _imp_numpy()
-    tm = _imp_trimesh()
+    F = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+    directed = F[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2)
+    key = np.sort(directed, axis=1)
+    order = np.lexsort(key.T[::-1])
+    ordered = key[order]
+    starts = np.empty(len(key) + 1, dtype=bool)
+    starts[0] = starts[-1] = True
+    np.any(ordered[1:] != ordered[:-1], axis=1, out=starts[1:-1])
+    run_start = np.flatnonzero(starts)
+    return {
+        'directed': directed,
+        'order': order,
+        'starts': starts,
+        'run_start': run_start,
+        'count': np.diff(run_start),
+    }
+
+
+def _edge_topology(verts, faces, groups: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Topology statistics from one shared edge/face incidence structure.
+
+    Directed half-edges are grouped into undirected edges once with a
+    lexsort (or taken from ``groups``, see :func:`_edge_groups`); boundary
+    and non-manifold edges, watertightness, winding consistency, the Euler
+    number and connected components (faces joined through shared edges, via
+    a sparse face-edge graph) all come from that grouping. The Euler number
+    is ``V - E + F`` over *referenced* vertices only, as current trimesh
+    computes it; older trimesh releases counted every vertex, so meshes with
+    unreferenced vertices may read lower than in older reports (the cache
+    key's analyzer version 4 marks the change). Degenerate faces
+    use :func:`refiner_core.repair.degenerate_faces` at trimesh's merge
+    tolerance.
+    """
+    np = _imp_numpy()
+    from .repair import degenerate_faces
+    F = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+    m = len(F)
+    if groups is None:
+        groups = _edge_groups(F)
+    directed, order, run_start, count = groups['directed'], groups['order'], groups['run_start'], groups['count']
+    num_edges = len(count)
+    edge_of = np.empty(len(directed), dtype=np.int64)
+    edge_of[order] = np.repeat(np.arange(num_edges), count)
+    # Edges shared by exactly two faces must be traversed in opposite directions
+    pairs = run_start[:-1][count == 2]
+    e1, e2 = order[pairs], order[pairs + 1]
+    winding = bool(np.all(directed[e1, 0] == directed[e2, 1]))
+    out: Dict[str, Any] = {
+        'num_edges': int(num_edges),
+        'num_boundary_edges': int(np.count_nonzero(count == 1)),
+        'num_nonmanifold_edges': int(np.count_nonzero(count > 2)),
+        'is_watertight': bool(np.all(count == 2)),
+        'is_winding_consistent': winding,
+    }
+    referenced = np.zeros(len(verts), dtype=bool)
+    referenced[F.ravel()] = True
+    out['euler_number'] = int(np.count_nonzero(referenced) - num_edges + m)
+    try:
+        from scipy import sparse
+        from scipy.sparse import csgraph
+        # Bipartite graph: node i < m is a face, m + e is undirected edge e
+        rows = np.repeat(np.arange(m), 3)
+        graph = sparse.csr_matrix((np.ones(3 * m, dtype=np.int8), (rows, m + edge_of)),
+                                  shape=(m + num_edges, m + num_edges))
+        out['num_components'] = int(csgraph.connected_components(graph, directed=False)[0])
+    except Exception:
+        out['num_components'] = None
+    out['num_degenerate_faces'] = int(np.count_nonzero(degenerate_faces(verts, F, 1e-8)))
+    return out
+
+
+class MeshArrays:
+    """Derived arrays of one mesh, built on first use and shared by every tier.
+
+    Vertices (float64), faces (int64), UVs, per-face areas and the half-edge
+    grouping are each computed at most once however many metric families
+    read them. Only call on meshes that have vertices and faces.
+    """
+
+    def __init__(self, mesh):
+        self.mesh = mesh
+
+    @cached_property
+    def vertices(self):
+        return _imp_numpy().asarray(self.mesh.vertices, dtype='float64')
+
+    @cached_property
+    def faces(self):
+        return _imp_numpy().asarray(self.mesh.faces, dtype='int64').reshape(-1, 3)
+
+    @cached_property
+    def uv(self):
+        """(n, 2) float64 UVs, or ``None`` when the mesh has none."""
+        np = _imp_numpy()
+        try:
+            uv = self.mesh.visual.uv
+        except Exception:
+            return None
+        if uv is None:
+            return None
+        uv = np.asarray(uv)
+        if uv.size == 0:
+            return None
+        return uv[:, :2].astype(np.float64, copy=False)
+
+    @cached_property
+    def face_areas(self):
+        from .uv_metrics import tri_areas_3d
+        return tri_areas_3d(self.vertices, self.faces)
+
+    @cached_property
+    def edges(self) -> Dict[str, Any]:
+        return _edge_groups(self.faces)
+
+    @cached_property
+    def face_pairs(self):
+        """Faces sharing an edge, as two index arrays (consecutive faces of each edge)."""
+        groups = self.edges
+        inner = ~groups['starts'][1:-1]
+        order = groups['order']
+        return order[:-1][inner] // 3, order[1:][inner] // 3
+
+
+def _analyze_quick(mesh, arrays: Optional[MeshArrays] = None) -> Dict[str, Any]:
+    """Counts, finiteness and bounds; no adjacency is built."""
+    np = _imp_numpy()
     out: Dict[str, Any] = {}
     v = getattr(mesh, 'vertices', None)
     f = getattr(mesh, 'faces', None)
@@ -50,32 +175,9 @@ def _analyze_geometry(mesh) -> Dict[str, Any]:
         return out
     out['num_vertices'] = int(len(verts))
     out['num_faces'] = int(len(faces))
-    # Basic quality flags
-    try:
-        out['is_watertight'] = bool(getattr(mesh, 'is_watertight', False))
-    except Exception:
-        out['is_watertight'] = False
-    try:
-        out['is_winding_consistent'] = bool(getattr(mesh, 'is_winding_consistent', False))
-    except Exception:
-        out['is_winding_consistent'] = False
-    try:
-        out['euler_number'] = float(getattr(mesh, 'euler_number', 0.0))
-    except Exception:
-        out['euler_number'] = 0.0
-    # Open edges / boundary
-    try:
-        out['num_open_edges'] = int(len(mesh.edges_boundary))
-    except Exception:
-        out['num_open_edges'] = None
-    # Degenerate faces
-    try:
-        out['num_degenerate_faces'] = int(len(mesh.faces_sparse)) - int(len(faces)) if hasattr(mesh, 'faces_sparse') else None
-    except Exception:
-        out['num_degenerate_faces'] = None
     # Non-finite vertices
     try:
-        nonfinite = np.count_nonzero(~np.isfinite(verts))
+        nonfinite = np.count_nonzero(~np.isfinite(arrays.vertices if arrays is not None else verts))
         out['nonfinite_vertex_values'] = int(nonfinite)
     except Exception:
         out['nonfinite_vertex_values'] = None
@@ -92,30 +194,59 @@ def _analyze_geometry(mesh) -> Dict[str, Any]:
         out['centroid'] = [float(x) for x in c]
     except Exception:
         out['centroid'] = None
-    # Components
+    return out
+
+
+def _analyze_topology(mesh, arrays: Optional[MeshArrays] = None) -> Dict[str, Any]:
+    """Watertightness, winding, Euler number, open/non-manifold edges,
+    components and degenerate faces, all from one edge grouping."""
+    v = getattr(mesh, 'vertices', None)
+    f = getattr(mesh, 'faces', None)
+    if v is None or f is None or len(v) == 0 or len(f) == 0:
+        return {}
+    arrays = arrays or MeshArrays(mesh)
     try:
-        comps = mesh.split(only_watertight=False)
-        out['num_components'] = int(len(comps))
+        topo = _edge_topology(arrays.vertices, arrays.faces, arrays.edges)
     except Exception:
-        out['num_components'] = None
+        topo = {}
+    return {
+        'is_watertight': topo.get('is_watertight', False),
+        'is_winding_consistent': topo.get('is_winding_consistent', False),
+        'euler_number': float(topo.get('euler_number', 0)),
+        'num_open_edges': topo.get('num_boundary_edges'),
+        'num_nonmanifold_edges': topo.get('num_nonmanifold_edges'),
+        'num_degenerate_faces': topo.get('num_degenerate_faces'),
+        'num_components': topo.get('num_components'),
+    }
+
+
+def _analyze_geometry(mesh) -> Dict[str, Any]:
+    """Analyze geometric properties of a mesh.
+    
+    Args:
+        mesh: A trimesh.Trimesh object.
+        
+    Returns:
+        Dictionary with keys: has_geometry, num_vertices, num_faces, is_watertight,
+        is_winding_consistent, euler_number, num_open_edges, num_nonmanifold_edges,
+        num_degenerate_faces, nonfinite_vertex_values, bbox_min, bbox_max, bbox_extents,
+        centroid, num_components.
+    """
+    out = _analyze_quick(mesh)
+    if out['has_geometry']:
+        out.update(_analyze_topology(mesh))
     return out
 
 
-def _analyze_uv(mesh) -> Dict[str, Any]:
+def _analyze_uv(mesh, arrays: Optional[MeshArrays] = None) -> Dict[str, Any]:
     np = _imp_numpy()
     out: Dict[str, Any] = {}
-    uv = None
-    try:
-        if getattr(mesh, 'visual', None) is not None:
-            uv = np.asarray(mesh.visual.uv) if mesh.visual.uv is not None else None
-    except Exception:
-        uv = None
-    if uv is None or uv.size == 0:
+    uv = (arrays or MeshArrays(mesh)).uv
+    if uv is None:
         out['has_uv'] = False
         out['reason'] = 'no uv'
         return out
     out['has_uv'] = True
-    uv = uv[:, :2].astype(np.float64, copy=False)
     # OOB fraction
     try:
         oob_mask = (uv[:, 0] < 0) | (uv[:, 0] > 1) | (uv[:, 1] < 0) | (uv[:, 1] > 1)
@@ -125,16 +256,66 @@ def _analyze_uv(mesh) -> Dict[str, Any]:
     return out
 
 
-def _symmetry_probe(mesh) -> Dict[str, Any]:
+def _uv_quality_options(uv_options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """``uv_options`` over :data:`refiner_core.uv_metrics.UV_QUALITY_DEFAULTS`."""
+    from .uv_metrics import UV_QUALITY_DEFAULTS
+    unknown = sorted(set(uv_options or {}) - set(UV_QUALITY_DEFAULTS))
+    if unknown:
+        raise ValueError(f"Unknown UV quality option(s): {', '.join(unknown)}")
+    return {**UV_QUALITY_DEFAULTS, **(uv_options or {})}
+
+
+def _analyze_uv_quality(mesh, arrays: Optional[MeshArrays] = None, **options) -> Dict[str, Any]:
+    """Stretch, inversion, coverage/overlap and island metrics (as ``uv_analyzer``).
+
+    Reuses the shared face areas and edge adjacency; empty for meshes
+    without geometry or UVs (the ``quick`` and ``uv`` tiers say why).
+    """
+    v = getattr(mesh, 'vertices', None)
+    f = getattr(mesh, 'faces', None)
+    if v is None or f is None or len(v) == 0 or len(f) == 0:
+        return {}
+    arrays = arrays or MeshArrays(mesh)
+    if arrays.uv is None:
+        return {}
+    from .uv_metrics import uv_quality
+    return uv_quality(arrays.vertices, arrays.faces, arrays.uv, face_area_3d=arrays.face_areas,
+                      face_pairs=arrays.face_pairs, **_uv_quality_options(options))
+
+
+def _imp_ckdtree():
+    """Lazy import scipy's cKDTree (None if SciPy is unavailable)."""
+    try:
+        from scipy.spatial import cKDTree
+        return cKDTree
+    except Exception:
+        return None
+
+
+def _chamfer_sampled(V, mirrored, max_points: int = 2048) -> float:
+    # Dense fallback without SciPy: pairwise distances on a vertex subsample.
+    np = _imp_numpy()
+    step = max(1, len(V) // max_points)
+    A = V[::step]
+    B = mirrored[::step]
+    d_ab = np.min(np.linalg.norm(A[:, None, :] - B[None, :, :], axis=2), axis=1)
+    d_ba = np.min(np.linalg.norm(B[:, None, :] - A[None, :, :], axis=2), axis=1)
+    return float((d_ab.mean() + d_ba.mean()) / 2.0)
+
+
+def _symmetry_probe(mesh, arrays: Optional[MeshArrays] = None) -> Dict[str, Any]:
     # Replace the older symmetry median-distance probe with a Chamfer-distance based
     # symmetry score. For each axis (x,y,z) we mirror vertices across the axis and
     # compute a symmetric Chamfer distance (mean nearest-neighbor both directions).
+    # One KD-tree over all vertices answers every axis exactly: mirroring is an
+    # isometry, so the mirrored->original distances equal original->mirrored
+    # ones and a single multi-threaded query per axis gives the symmetric score.
     np = _imp_numpy()
     out: Dict[str, Any] = {}
     v = getattr(mesh, 'vertices', None)
     if v is None:
         return out
-    V = np.asarray(v, dtype=np.float64)
+    V = arrays.vertices if arrays is not None else np.asarray(v, dtype=np.float64)
     if V.size == 0:
         return out
     try:
@@ -142,21 +323,26 @@ def _symmetry_probe(mesh) -> Dict[str, Any]:
         center = b.mean(axis=0)
     except Exception:
         center = V.mean(axis=0)
+    cKDTree = _imp_ckdtree()
+    tree = None
+    if cKDTree is not None:
+        try:
+            tree = cKDTree(V)
+        except Exception:
+            tree = None
     scores = {}
     for axis, idx in {'x': 0, 'y': 1, 'z': 2}.items():
         mirrored = V.copy()
         mirrored[:, idx] = 2 * center[idx] - mirrored[:, idx]
         try:
-            # Sample for performance on large meshes
-            step = max(1, len(V) // 2048)
-            A = V[::step]
-            B = mirrored[::step]
-            # pairwise distances (A->B)
-            d_ab = np.min(np.linalg.norm(A[:, None, :] - B[None, :, :], axis=2), axis=1)
-            d_ba = np.min(np.linalg.norm(B[:, None, :] - A[None, :, :], axis=2), axis=1)
-            # symmetric Chamfer distance (mean of both directions)
-            chamfer = float((d_ab.mean() + d_ba.mean()) / 2.0)
-            scores[axis] = chamfer
+            if tree is not None:
+                try:
+                    dist, _ = tree.query(mirrored, k=1, workers=-1)
+                except TypeError:  # SciPy < 1.6
+                    dist, _ = tree.query(mirrored, k=1, n_jobs=-1)
+                scores[axis] = float(np.mean(dist))
+            else:
+                scores[axis] = _chamfer_sampled(V, mirrored)
         except Exception:
             scores[axis] = None
     out['symmetry_median_distance'] = scores
@@ -173,32 +359,164 @@ def _symmetry_probe(mesh) -> Dict[str, Any]:
     out['symmetry_best_median_distance'] = best_val
     # Also expose explicit chamfer value for clarity
     out['symmetry_best_chamfer'] = best_val
+    # Arbitrary-orientation mirror plane, reusing the KD-tree built above
+    if tree is not None:
+        try:
+            from .symmetry import detect_symmetry_plane
+            plane = detect_symmetry_plane(V, tree=tree)
+        except Exception:
+            plane = None
+        if plane is not None:
+            out['symmetry_plane_normal'] = [float(x) for x in plane.normal]
+            out['symmetry_plane_offset'] = plane.offset
+            out['symmetry_plane_chamfer'] = plane.chamfer
     return out
 
 
-def analyze_loaded(obj, is_scene: bool) -> Dict[str, Any]:
+# Metric tiers in report order; ``quick`` is cheap, the others build
+# adjacency (topology), read UVs (uv), rasterize and segment the UV layout
+# (uv_quality) or query KD-trees (symmetry).
+METRIC_TIERS: Tuple[str, ...] = ('quick', 'topology', 'uv', 'uv_quality', 'symmetry')
+
+# Tiers selected by default and by ``'all'``; ``uv_quality`` rasterizes the
+# layout and is only computed when named explicitly
+DEFAULT_METRIC_TIERS: Tuple[str, ...] = tuple(t for t in METRIC_TIERS if t != 'uv_quality')
+
+_TIER_FUNCS = {
+    'quick': _analyze_quick,
+    'topology': _analyze_topology,
+    'uv': _analyze_uv,
+    'uv_quality': _analyze_uv_quality,
+    'symmetry': _symmetry_probe,
+}
+
+_TIER_KEYS = {
+    'quick': ('has_geometry', 'num_vertices', 'num_faces', 'nonfinite_vertex_values',
+              'bbox_min', 'bbox_max', 'bbox_extents', 'centroid'),
+    'topology': ('is_watertight', 'is_winding_consistent', 'euler_number', 'num_open_edges',
+                 'num_nonmanifold_edges', 'num_degenerate_faces', 'num_components'),
+    'uv': ('has_uv', 'uv_oob_vertex_pct'),
+    'uv_quality': ('stretch_ratio_mean', 'stretch_ratio_median', 'inverted_tri_pct', 'coverage_pct',
+                   'overlap_px', 'overlap_pct_of_covered', 'island_count', 'texel_density_median',
+                   'texel_outlier_islands', 'islands', 'overlap_pairs', 'overlap_faces', 'overlap_area',
+                   'overlap_area_pct'),
+    'symmetry': ('symmetry_median_distance', 'symmetry_best_axis', 'symmetry_best_median_distance',
+                 'symmetry_best_chamfer', 'symmetry_plane_normal', 'symmetry_plane_offset',
+                 'symmetry_plane_chamfer'),
+}
+
+_KEY_TIER = {key: tier for tier, keys in _TIER_KEYS.items() for key in keys}
+
+
+def parse_metrics(metrics=None) -> Tuple[str, ...]:
+    """Resolve a metric selector to tier names in report order.
+
+    ``metrics`` is ``None`` or ``'all'`` for :data:`DEFAULT_METRIC_TIERS`
+    (every tier but the opt-in ``uv_quality``), a comma-separated string
+    such as ``'quick,uv'`` or ``'all,uv_quality'``, or an iterable of tier
+    names. Raises ``ValueError`` on unknown tiers.
+    """
+    if metrics is None:
+        return DEFAULT_METRIC_TIERS
+    if isinstance(metrics, str):
+        metrics = [m for m in metrics.replace(' ', '').split(',') if m]
+    names = set(metrics)
+    if 'all' in names:
+        names = (names - {'all'}) | set(DEFAULT_METRIC_TIERS)
+    unknown = sorted(names - set(METRIC_TIERS))
+    if unknown:
+        raise ValueError(f"Unknown metric tier(s): {', '.join(unknown)} (choose from {', '.join(METRIC_TIERS)})")
+    return tuple(t for t in METRIC_TIERS if t in names)
+
+
+class MeshAnalysis:
+    """Analysis of one mesh, computed lazily one tier at a time.
+
+    Reading a metric (``analysis['has_uv']`` or ``analysis.get(...)``)
+    computes only the tier that owns it, and each tier is memoized, so
+    callers pay just for what they read. Tiers share one
+    :class:`MeshArrays`, so edges, face areas and UVs are derived once.
+    ``uv_options`` configure the ``uv_quality`` tier (see
+    :data:`refiner_core.uv_metrics.UV_QUALITY_DEFAULTS`).
+    """
+
+    def __init__(self, mesh, name: str = 'mesh', uv_options: Optional[Dict[str, Any]] = None):
+        self.mesh = mesh
+        self.name = name
+        self.arrays = MeshArrays(mesh)
+        self._options = {'uv_quality': _uv_quality_options(uv_options)}
+        self._tiers: Dict[str, Dict[str, Any]] = {}
+
+    def tier(self, name: str) -> Dict[str, Any]:
+        """Metrics of tier ``name``, computed on first access."""
+        if name not in _TIER_FUNCS:
+            raise ValueError(f"Unknown metric tier: {name}")
+        if name not in self._tiers:
+            self._tiers[name] = _TIER_FUNCS[name](self.mesh, self.arrays, **self._options.get(name, {}))
+        return self._tiers[name]
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _KEY_TIER:
+            raise KeyError(key)
+        return self.tier(_KEY_TIER[key])[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        tier = _KEY_TIER.get(key)
+        if tier is None:
+            return default
+        return self.tier(tier).get(key, default)
+
+    @property
+    def computed_tiers(self) -> Tuple[str, ...]:
+        return tuple(t for t in METRIC_TIERS if t in self._tiers)
+
+    def report(self, metrics=None) -> Dict[str, Any]:
+        """Flat report of the selected tiers (see :func:`parse_metrics`)."""
+        rep: Dict[str, Any] = {'name': self.name}
+        for name in parse_metrics(metrics):
+            rep.update(self.tier(name))
+        return rep
+
+
+def analyze_loaded(obj, is_scene: bool, metrics=None, uv_options=None) -> Dict[str, Any]:
     tm = _imp_trimesh()
     rep: Dict[str, Any] = {'is_scene': bool(is_scene), 'meshes': []}
     if is_scene and isinstance(obj, tm.Scene):
         geoms = getattr(obj, 'geometry', {}) or {}
         for name, g in geoms.items():
-            mrep: Dict[str, Any] = {'name': name or 'mesh'}
-            mrep.update(_analyze_geometry(g))
-            mrep.update(_analyze_uv(g))
-            mrep.update(_symmetry_probe(g))
-            rep['meshes'].append(mrep)
+            rep['meshes'].append(MeshAnalysis(g, name or 'mesh', uv_options).report(metrics))
     else:
-        mrep: Dict[str, Any] = {'name': 'mesh'}
-        mrep.update(_analyze_geometry(obj))
-        mrep.update(_analyze_uv(obj))
-        mrep.update(_symmetry_probe(obj))
-        rep['meshes'].append(mrep)
+        rep['meshes'].append(MeshAnalysis(obj, uv_options=uv_options).report(metrics))
     return rep
 
 
-def analyze_path(path: Path) -> Dict[str, Any]:
-    from .loaders import load_scene_or_mesh
+# Bump when a metric's definition or report layout changes; cached
+# reports from other versions are ignored.
+ANALYZER_VERSION = '4'
+
+
+def _cache_params(metrics, uv_options) -> Dict[str, Any]:
+    # UV options only key reports that include the tier they configure
+    tiers = parse_metrics(metrics)
+    params: Dict[str, Any] = {'metrics': list(tiers)}
+    if 'uv_quality' in tiers:
+        params['uv_options'] = _uv_quality_options(uv_options)
+    return params
+
+
+def analyze_path(path: Path, metrics=None, cache=None, uv_options=None) -> Dict[str, Any]:
+    """Analyse one model file, reusing ``cache`` (an ``AnalysisCache``) if given.
+
+    The file is loaded once and every selected metric family, including
+    the ``uv_analyzer`` UV quality metrics, reads the same mesh arrays.
+    """
     path = Path(path)
+    if cache is not None:
+        rep = cache.get_or_compute(path, 'analyzer', ANALYZER_VERSION, _cache_params(metrics, uv_options),
+                                   lambda: analyze_path(path, metrics, uv_options=uv_options))
+        rep['file'] = str(path)
+        return rep
+    from .loaders import load_scene_or_mesh
     load_path = path
     
     # Convert CXPRJ to mesh if needed
@@ -217,6 +535,138 @@ def analyze_path(path: Path) -> Dict[str, Any]:
             raise
     
     obj, is_scene = load_scene_or_mesh(load_path)
-    rep = analyze_loaded(obj, is_scene)
+    rep = analyze_loaded(obj, is_scene, metrics, uv_options)
     rep['file'] = str(path)
     return rep
+
+
+# Extensions picked up when analysing a directory
+ANALYZE_EXTENSIONS = ('.obj', '.glb', '.gltf')
+
+
+def iter_analysis_inputs(root: Path) -> Iterator[Path]:
+    """Yield analysable files under ``root`` in one sorted directory walk."""
+    import os
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for fname in sorted(filenames):
+            if os.path.splitext(fname)[1].lower() in ANALYZE_EXTENSIONS:
+                yield Path(dirpath) / fname
+
+
+def _resume_key(path) -> str:
+    # Resolved so './lib/a.obj', 'lib/../lib/a.obj' and symlinked roots match
+    try:
+        return str(Path(path).resolve())
+    except (OSError, RuntimeError):
+        return str(path)
+
+
+def read_analyzed_files(jsonl_path: Path) -> Set[str]:
+    """Resolved paths of files whose latest record in an analysis JSONL succeeded.
+
+    Files whose latest record is an ``error`` are left out so a resumed run
+    retries them; a torn last line is ignored.
+    """
+    import json
+    latest: Dict[str, bool] = {}
+    try:
+        with open(jsonl_path, 'r', encoding='utf-8') as fh:
+            for line in fh:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(rec, dict) and rec.get('file'):
+                    latest[_resume_key(rec['file'])] = 'error' not in rec
+    except FileNotFoundError:
+        pass
+    return {path for path, ok in latest.items() if ok}
+
+
+def _analyze_file_task(task) -> Dict[str, Any]:
+    # Pool worker: never raises, so one bad asset cannot stop the run
+    path, metrics, uv_options = task
+    try:
+        return analyze_path(Path(path), metrics, uv_options=uv_options)
+    except Exception as ex:
+        return {'file': str(path), 'error': f"{type(ex).__name__}: {ex}"}
+
+
+def analyze_directory(root: Path, jsonl_path: Optional[Path] = None, workers: int = 1,
+                      metrics=None, resume: bool = True, cache=None,
+                      uv_options=None) -> Iterator[Dict[str, Any]]:
+    """Analyse every model under ``root``, yielding reports as they finish.
+
+    With ``jsonl_path`` each report is appended as one JSON line and flushed
+    as soon as its file is done, so a crash loses at most the files in
+    flight; with ``resume`` files already recorded there successfully are
+    skipped (matched on resolved paths) and files that last failed with an
+    ``error`` are retried. ``workers > 1`` analyses files in a
+    process pool that holds at most ``2 * workers`` files in flight, so
+    memory stays flat however large the library is. With ``cache`` (an
+    ``AnalysisCache``) unchanged files are answered in this process without
+    being loaded, and fresh reports are stored as they arrive. ``uv_options``
+    configure the ``uv_quality`` tier. Reports arrive in completion order.
+    """
+    import json
+    root = Path(root)
+    done = read_analyzed_files(jsonl_path) if (jsonl_path is not None and resume) else set()
+    tasks = ((str(p), metrics, uv_options) for p in iter_analysis_inputs(root) if _resume_key(p) not in done)
+    out = None
+    if jsonl_path is not None:
+        jsonl_path = Path(jsonl_path)
+        jsonl_path.parent.mkdir(parents=True, exist_ok=True)
+        torn = False
+        if resume and jsonl_path.exists() and jsonl_path.stat().st_size > 0:
+            with open(jsonl_path, 'rb') as fh:
+                fh.seek(-1, 2)
+                torn = fh.read(1) != b'\n'
+        out = open(jsonl_path, 'a' if resume else 'w', encoding='utf-8')
+        if torn:
+            out.write('\n')
+
+    params = _cache_params(metrics, uv_options)
+
+    def _cached(task) -> Optional[Dict[str, Any]]:
+        if cache is None:
+            return None
+        rep = cache.get(Path(task[0]), 'analyzer', ANALYZER_VERSION, params)
+        if rep is not None:
+            rep['file'] = task[0]
+        return rep
+
+    def _emit(rep: Dict[str, Any], fresh: bool = True) -> Dict[str, Any]:
+        if fresh and cache is not None and 'error' not in rep:
+            cache.put(Path(rep['file']), 'analyzer', ANALYZER_VERSION, params, rep)
+        if out is not None:
+            out.write(json.dumps(rep) + '\n')
+            out.flush()
+        return rep
+
+    try:
+        if workers <= 1:
+            for task in tasks:
+                rep = _cached(task)
+                yield _emit(rep, fresh=False) if rep is not None else _emit(_analyze_file_task(task))
+            return
+        from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = set()
+            for task in tasks:
+                rep = _cached(task)
+                if rep is not None:
+                    yield _emit(rep, fresh=False)
+                    continue
+                pending.add(pool.submit(_analyze_file_task, task))
+                if len(pending) >= 2 * workers:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for fut in finished:
+                        yield _emit(fut.result())
+            while pending:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    yield _emit(fut.result())
+    finally:
+        if out is not None:
+            out.close()
@@ -8,13 +8,30 @@ from .exporters import api_export
 from .unreal_bridge import stage_to_unreal, stage_to_deferred
 
 
+def _print_analysis_summary(rep: dict) -> None:
+    print(rep.get('file'))
+    if rep.get('error'):
+        print(f"  error: {rep['error']}")
+        return
+    for m in rep.get('meshes', []):
+        name = m.get('name', 'mesh')
+        if not m.get('has_geometry', True):
+            print(f"  {name}: no geometry ({m.get('reason','')})")
+            continue
+        uv_txt = '' if 'has_uv' not in m else 'no UVs' if not m['has_uv'] else f"UV oob={m.get('uv_oob_vertex_pct', 0):.2f}%"
+        if 'coverage_pct' in m:
+            uv_txt += (f" cov={m['coverage_pct']:.2f}% ovl={m['overlap_pct_of_covered']:.2f}%"
+                       f" islands={m['island_count']} texel_outliers={m['texel_outlier_islands']}")
+        print(f"  {name}: V={m.get('num_vertices')} F={m.get('num_faces')} watertight={m.get('is_watertight')} comps={m.get('num_components')} {uv_txt} sym_best={m.get('symmetry_best_axis')} ({m.get('symmetry_best_median_distance')})")
+
+
 def main(argv=None):
     parser = argparse.ArgumentParser(description='Refine 3D assets: smooth vertices and optionally smooth textures (OBJ).')
     parser.add_argument('input', help='Path to a file (.obj/.glb/.gltf/.fbx) or a directory to process recursively')
     parser.add_argument('-o', '--outdir', default='output', help='Output directory (default: output)')
 
     # Mesh smoothing parameters
-    parser.add_argument('--method', choices=['taubin', 'laplacian'], default='taubin', help='Mesh smoothing method')
+    parser.add_argument('--method', choices=['taubin', 'laplacian', 'implicit'], default='taubin', help='Mesh smoothing method (implicit: one backward-Euler solve with time step lambda*iterations)')
     parser.add_argument('--iterations', type=int, default=10, help='Smoothing iterations')
     parser.add_argument('--lambda', dest='lamb', type=float, default=0.5, help='Lambda parameter for smoothing')
     parser.add_argument('--nu', type=float, default=-0.53, help='Nu parameter for Taubin smoothing')
@@ -45,8 +62,8 @@ def main(argv=None):
     parser.add_argument('--unwrap-attempts', type=int, default=2, help='Max unwrap attempts if UVs missing or fail thresholds')
     parser.add_argument('--cxprj-thickness', type=float, default=1.0, help='Extrusion thickness when converting CXPRJ projects to meshes')
     parser.add_argument('--cxprj-scale', type=float, default=1.0, help='Uniform scale factor applied after CXPRJ conversion')
-    parser.add_argument('--uv-min-coverage', type=float, default=50.0, help='Minimum UV coverage percent (future use)')
-    parser.add_argument('--uv-max-overlap-pct', type=float, default=10.0, help='Maximum UV overlap percent (future use)')
+    parser.add_argument('--uv-min-coverage', type=float, default=50.0, help='Minimum UV coverage percent for accepting an unwrap')
+    parser.add_argument('--uv-max-overlap-pct', type=float, default=10.0, help='Maximum percent of covered UV pixels that overlap for accepting an unwrap')
     parser.add_argument('--uv-max-oob-pct', type=float, default=5.0, help='Maximum percent of UV vertices out of [0,1]')
     parser.add_argument('--unwrap-angle-limit', type=float, default=66.0, help='Blender smart project angle limit')
     parser.add_argument('--unwrap-island-margin', type=float, default=0.02, help='Blender smart project island margin')
@@ -60,6 +77,28 @@ def main(argv=None):
     
     # Analysis-only
     parser.add_argument('--analyze-only', action='store_true', help='Analyze model(s) and print a summary without refining')
+    parser.add_argument('--metrics', type=str, default='all',
+                        help='Comma-separated metric tiers for --analyze-only: quick, topology, uv, uv_quality, symmetry. '
+                             '"all" (the default) is every tier except uv_quality, which rasterizes the UV '
+                             'layout and must be named, e.g. all,uv_quality')
+    parser.add_argument('--analysis-uv-resolution', type=int, default=1024,
+                        help='Raster resolution for uv_quality coverage/overlap (default: 1024)')
+    parser.add_argument('--analysis-texture-size', type=int, default=1024,
+                        help='Texture size in pixels used to express uv_quality texel density (default: 1024)')
+    parser.add_argument('--analysis-exact-overlap', action='store_true',
+                        help='Also compute exact UV overlap from triangle intersections in uv_quality')
+    parser.add_argument('--analysis-islands', action='store_true',
+                        help='Include per-island UV statistics in uv_quality reports')
+    parser.add_argument('--analysis-jsonl', type=str, default=None,
+                        help='Append one JSON line per analysed file to this path as soon as it finishes')
+    parser.add_argument('--analysis-workers', type=int, default=1,
+                        help='Worker processes for --analyze-only on a directory (default: 1)')
+    parser.add_argument('--no-resume', action='store_true',
+                        help='Re-analyse files already recorded in --analysis-jsonl (overwrites it)')
+    parser.add_argument('--analysis-cache', type=str, default=None,
+                        help='SQLite file caching analysis reports; unchanged files are not re-analysed')
+    parser.add_argument('--analysis-cache-verify-hash', action='store_true',
+                        help='Also check a content hash on every cache hit (slower, catches edits that keep size/mtime)')
     parser.add_argument('--analysis-json', type=str, default=None, help='Write detailed analysis JSON to this path')
     parser.add_argument('--debug', action='store_true', help='Print exception tracebacks on errors')
     parser.add_argument('--unreal-project', type=str, default=None, help='Path to an Unreal .uproject to stage resulting GLBs into')
@@ -90,38 +129,47 @@ def main(argv=None):
 
     if args.analyze_only:
         try:
-            from .analyzer import analyze_path
+            from .analyzer import analyze_directory, analyze_path, parse_metrics
             import json
             from pathlib import Path as P
-            reports = []
+            metrics = parse_metrics(args.metrics)
+            uv_options = {
+                'resolution': args.analysis_uv_resolution,
+                'texture_size': args.analysis_texture_size,
+                'exact_overlap': args.analysis_exact_overlap,
+                'islands': args.analysis_islands,
+            }
+            jsonl_path = P(args.analysis_jsonl).expanduser().resolve() if args.analysis_jsonl else None
+            cache = None
+            if args.analysis_cache:
+                from .analysis_cache import AnalysisCache
+                cache = AnalysisCache(P(args.analysis_cache).expanduser().resolve(),
+                                      verify_hash=args.analysis_cache_verify_hash)
             if input_path.is_dir():
-                for ext in ('*.obj', '*.glb', '*.gltf'):
-                    for p in input_path.rglob(ext):
-                        rep = analyze_path(p)
+                # Reports stream in as files finish; only --analysis-json keeps them all
+                reports = []
+                count = 0
+                for rep in analyze_directory(input_path, jsonl_path, workers=args.analysis_workers,
+                                             metrics=metrics, resume=not args.no_resume, cache=cache,
+                                             uv_options=uv_options):
+                    count += 1
+                    _print_analysis_summary(rep)
+                    if args.analysis_json:
                         reports.append(rep)
-                        # Print per-file summary
-                        print(rep.get('file'))
-                        for m in rep.get('meshes', []):
-                            name = m.get('name', 'mesh')
-                            if not m.get('has_geometry', True):
-                                print(f"  {name}: no geometry ({m.get('reason','')})")
-                                continue
-                            uv_txt = 'no UVs' if not m.get('has_uv', False) else f"UV oob={m.get('uv_oob_vertex_pct', 0):.2f}%"
-                            print(f"  {name}: V={m.get('num_vertices')} F={m.get('num_faces')} watertight={m.get('is_watertight')} comps={m.get('num_components')} {uv_txt} sym_best={m.get('symmetry_best_axis')} ({m.get('symmetry_best_median_distance')})")
                 payload = {"count": len(reports), "files": reports}
+                if jsonl_path is not None:
+                    print(f"Analysis JSONL updated: {jsonl_path} ({count} new)")
             else:
-                rep = analyze_path(input_path)
-                reports = [rep]
-                # Print summary
-                print(rep.get('file'))
-                for m in rep.get('meshes', []):
-                    name = m.get('name', 'mesh')
-                    if not m.get('has_geometry', True):
-                        print(f"  {name}: no geometry ({m.get('reason','')})")
-                        continue
-                    uv_txt = 'no UVs' if not m.get('has_uv', False) else f"UV oob={m.get('uv_oob_vertex_pct', 0):.2f}%"
-                    print(f"  {name}: V={m.get('num_vertices')} F={m.get('num_faces')} watertight={m.get('is_watertight')} comps={m.get('num_components')} {uv_txt} sym_best={m.get('symmetry_best_axis')} ({m.get('symmetry_best_median_distance')})")
+                rep = analyze_path(input_path, metrics, cache=cache, uv_options=uv_options)
+                _print_analysis_summary(rep)
                 payload = rep
+                if jsonl_path is not None:
+                    jsonl_path.parent.mkdir(parents=True, exist_ok=True)
+                    with open(jsonl_path, 'a', encoding='utf-8') as fh:
+                        fh.write(json.dumps(rep) + '\n')
+            if cache is not None:
+                print(f"Analysis cache: {cache.hits} hit(s), {cache.misses} miss(es)")
+                cache.close()
             if args.analysis_json:
                 p = P(args.analysis_json).expanduser().resolve()
                 p.parent.mkdir(parents=True, exist_ok=True)
@@ -186,7 +234,6 @@ def main(argv=None):
             print(f" - {p}")
         # Optionally stage GLB outputs into an Unreal project
         if args.unreal_project:
-            from pathlib import Path
             uproject = Path(args.unreal_project).expanduser().resolve()
             staged = []
             for p in results:
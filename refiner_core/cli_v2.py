@@ -15,14 +15,27 @@ from .pipeline import process_path
 
 def _add_smoothing_args(parser: argparse.ArgumentParser) -> None:
     """Add mesh smoothing arguments to parser."""
-    parser.add_argument('--method', choices=['taubin', 'laplacian'], default='taubin',
-                        help='Mesh smoothing method (default: taubin)')
+    parser.add_argument('--method', choices=['taubin', 'laplacian', 'implicit'], default='taubin',
+                        help='Mesh smoothing method; implicit runs one backward-Euler solve '
+                             'with time step lambda*iterations (default: taubin)')
     parser.add_argument('--iterations', type=int, default=10,
                         help='Smoothing iterations (default: 10)')
     parser.add_argument('--lambda', dest='lamb', type=float, default=0.5,
                         help='Lambda parameter for smoothing (default: 0.5)')
     parser.add_argument('--nu', type=float, default=-0.53,
                         help='Nu parameter for Taubin smoothing (default: -0.53)')
+    parser.add_argument('--tolerance', type=float, default=None,
+                        help='Stop explicit smoothing early once RMS vertex displacement per '
+                             'iteration drops below this fraction of the bbox diagonal (e.g. 1e-4)')
+    parser.add_argument('--time-budget-per-file', type=float, default=None,
+                        help='Seconds allowed per file; smoothing iterations/lambda are sized by a '
+                             'calibrated cost model to fit what remains after load and repair')
+    parser.add_argument('--operator-cache-mb', type=float, default=1024.0,
+                        help='Memory cap for cached smoothing operators/factorizations '
+                             'shared by meshes with identical faces (default: 1024)')
+    parser.add_argument('--precision', choices=['double', 'single'], default='double',
+                        help='Working precision of the smoothing engine; single uses float32 '
+                             'vertices/operators and int32 indices, halving memory (default: double)')
 
 
 def _add_texture_args(parser: argparse.ArgumentParser) -> None:
@@ -71,6 +84,27 @@ def _add_repair_args(parser: argparse.ArgumentParser) -> None:
                         help='Run mesh pre-repair (deduplicate, remove degenerate) [default: enabled]')
     parser.add_argument('--no-pre-repair', action='store_true',
                         help='Disable pre-repair')
+    parser.add_argument('--weld-tolerance', type=float, default=1e-5,
+                        help='Pre-repair merges vertices closer than this distance (default: 1e-5)')
+
+
+def _add_execution_args(parser: argparse.ArgumentParser) -> None:
+    """Add parallelism/resource arguments to parser."""
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Worker processes for repairing and smoothing in parallel: scene '
+                             'geometries, --split-components parts and --shards of a single '
+                             'mesh (default: 1, serial)')
+    parser.add_argument('--out-of-core', action='store_true',
+                        help='Stream OBJ/STL inputs into on-disk memmaps and smooth them in chunks '
+                             '(for meshes larger than RAM; skips UV unwrap and pre-repair)')
+    parser.add_argument('--memory-budget-mb', type=float, default=2048.0,
+                        help='Approximate working-set budget for --out-of-core chunks (default: 2048)')
+    parser.add_argument('--shards', type=int, default=1,
+                        help='Split a single large mesh into this many spatial shards and smooth '
+                             'them in parallel across --workers (taubin/laplacian only; default: 1)')
+    parser.add_argument('--split-components', action='store_true',
+                        help='Repair and smooth the disconnected parts of a single mesh '
+                             'independently across --workers')
 
 
 def cmd_process(args) -> int:
@@ -91,6 +125,10 @@ def cmd_process(args) -> int:
             iterations=config.smoothing.iterations,
             lamb=config.smoothing.lamb,
             nu=config.smoothing.nu,
+            operator_cache_mb=config.smoothing.operator_cache_mb,
+            smoothing_tolerance=config.smoothing.tolerance,
+            time_budget_per_file=config.smoothing.time_budget_per_file,
+            precision=config.smoothing.precision,
             smooth_textures=config.texture.smooth_textures,
             texture_method=config.texture.method,
             bilateral_d=config.texture.bilateral_d,
@@ -99,6 +137,7 @@ def cmd_process(args) -> int:
             gaussian_ksize=config.texture.gaussian_ksize,
             gaussian_sigma=config.texture.gaussian_sigma,
             pre_repair=config.repair.pre_repair,
+            weld_tolerance=config.repair.weld_tolerance,
             unwrap_uv_with_blender=config.uv.unwrap_uv_with_blender,
             unwrap_attempts=config.uv.unwrap_attempts,
             uv_min_coverage=config.uv.min_coverage,
@@ -108,6 +147,11 @@ def cmd_process(args) -> int:
             unwrap_island_margin=config.uv.island_margin,
             unwrap_pack_margin=config.uv.pack_margin,
             blender_exe=getattr(args, 'blender_exe', None),
+            workers=config.execution.workers,
+            out_of_core=config.execution.out_of_core,
+            memory_budget_mb=config.execution.memory_budget_mb,
+            shards=config.execution.shards,
+            split_components=config.execution.split_components,
         )
     except Exception as ex:
         eprint(f"Processing failed: {ex}")
@@ -153,6 +197,7 @@ Examples:
     _add_texture_args(p_process)
     _add_uv_args(p_process)
     _add_repair_args(p_process)
+    _add_execution_args(p_process)
     p_process.set_defaults(func=cmd_process)
 
     args = parser.parse_args(argv)
@@ -15,10 +15,16 @@ class SmoothingConfig:
     iterations: int = 10
     lamb: float = 0.5
     nu: float = -0.53
+    operator_cache_mb: float = 1024.0
+    tolerance: Optional[float] = None
+    time_budget_per_file: Optional[float] = None
+    precision: str = 'double'
 
     def __post_init__(self):
-        if self.method not in ('taubin', 'laplacian'):
+        if self.method not in ('taubin', 'laplacian', 'implicit'):
             raise ValueError(f"Unknown smoothing method: {self.method}")
+        if self.precision not in ('double', 'single'):
+            raise ValueError(f"Unknown precision: {self.precision}")
 
 
 @dataclass
@@ -57,6 +63,22 @@ class RepairConfig:
     weld_tolerance: float = 1e-5
 
 
+@dataclass
+class ExecutionConfig:
+    """Parallelism and resource parameters."""
+    workers: int = 1
+    out_of_core: bool = False
+    memory_budget_mb: float = 2048.0
+    shards: int = 1
+    split_components: bool = False
+
+    def __post_init__(self):
+        if self.workers < 1:
+            raise ValueError(f"workers must be >= 1, got {self.workers}")
+        if self.shards < 1:
+            raise ValueError(f"shards must be >= 1, got {self.shards}")
+
+
 @dataclass
 class PipelineConfig:
     """Complete pipeline configuration combining all sub-configs."""
@@ -64,6 +86,7 @@ class PipelineConfig:
     texture: TextureConfig = field(default_factory=TextureConfig)
     uv: UVConfig = field(default_factory=UVConfig)
     repair: RepairConfig = field(default_factory=RepairConfig)
+    execution: ExecutionConfig = field(default_factory=ExecutionConfig)
 
     @classmethod
     def from_args(cls, args) -> 'PipelineConfig':
@@ -74,6 +97,10 @@ class PipelineConfig:
                 iterations=getattr(args, 'iterations', 10),
                 lamb=getattr(args, 'lamb', 0.5),
                 nu=getattr(args, 'nu', -0.53),
+                operator_cache_mb=getattr(args, 'operator_cache_mb', 1024.0),
+                tolerance=getattr(args, 'tolerance', None),
+                time_budget_per_file=getattr(args, 'time_budget_per_file', None),
+                precision=getattr(args, 'precision', 'double'),
             ),
             texture=TextureConfig(
                 smooth_textures=getattr(args, 'smooth_textures', False),
@@ -96,5 +123,13 @@ class PipelineConfig:
             ),
             repair=RepairConfig(
                 pre_repair=(False if getattr(args, 'no_pre_repair', False) else True),
+                weld_tolerance=getattr(args, 'weld_tolerance', 1e-5),
+            ),
+            execution=ExecutionConfig(
+                workers=getattr(args, 'workers', 1),
+                out_of_core=getattr(args, 'out_of_core', False),
+                memory_budget_mb=getattr(args, 'memory_budget_mb', 2048.0),
+                shards=getattr(args, 'shards', 1),
+                split_components=getattr(args, 'split_components', False),
             ),
         )
@@ -0,0 +1,133 @@
+"""Memory-capped LRU cache for smoothing operators and factorizations.
+
+Meshes that share a face array (LOD variants, re-exports, parameter sweeps)
+produce the same Laplacian, so repeat runs can skip operator construction and,
+for implicit smoothing, the sparse factorization as well. Entries are keyed by
+a hash of the face array plus the method parameters and evicted least recently
+used first once the configured byte budget is exceeded.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+
+def topology_key(faces, num_vertices: int) -> str:
+    """Return a stable digest of a face array and vertex count."""
+    from importlib import import_module
+    np = import_module('numpy')
+    f = np.asarray(faces)
+    if f.dtype.kind not in 'iu':
+        f = f.astype(np.int64)
+    # Hash in the array's own index dtype rather than widening a copy
+    f = np.ascontiguousarray(f)
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{int(num_vertices)}:{f.shape}:{f.dtype.str}".encode('ascii'))
+    h.update(memoryview(f).cast('B'))
+    return h.hexdigest()
+
+
+def estimate_nbytes(value: Any) -> int:
+    """Best-effort memory footprint of a cached operator or solver."""
+    if value is None:
+        return 0
+    nbytes = 0
+    for attr in ('data', 'indices', 'indptr'):
+        arr = getattr(value, attr, None)
+        if arr is not None and hasattr(arr, 'nbytes'):
+            nbytes += int(arr.nbytes)
+    if nbytes:
+        return nbytes
+    # SuperLU exposes nnz for its L and U factors (value + row index each)
+    lu = getattr(value, 'lu', None)
+    if lu is not None and hasattr(lu, 'nnz'):
+        nbytes += int(lu.nnz) * 12 + int(lu.shape[0]) * 16
+    matrix = getattr(value, 'matrix', None)
+    if matrix is not None:
+        nbytes += estimate_nbytes(matrix)
+    deg = getattr(value, 'deg', None)
+    if deg is not None and hasattr(deg, 'nbytes'):
+        nbytes += int(deg.nbytes)
+    return nbytes
+
+
+class OperatorCache:
+    """Thread-safe LRU cache bounded by total estimated bytes."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = int(max_bytes)
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def get(self, key: Hashable):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, nbytes: int = None) -> None:
+        size = estimate_nbytes(value) if nbytes is None else int(nbytes)
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                # Never cache a single entry larger than the whole budget
+                return
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._entries:
+                _, (_, old_size) = self._entries.popitem(last=False)
+                self._bytes -= old_size
+
+    def get_or_build(self, key: Hashable, builder: Callable[[], Any]):
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+        self.misses += 1
+        value = builder()
+        self.put(key, value)
+        return value
+
+    def set_max_bytes(self, max_bytes: int) -> None:
+        with self._lock:
+            self.max_bytes = int(max_bytes)
+            while self._bytes > self.max_bytes and self._entries:
+                _, (_, old_size) = self._entries.popitem(last=False)
+                self._bytes -= old_size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'entries': len(self._entries),
+            'bytes': self._bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+
+default_cache = OperatorCache()
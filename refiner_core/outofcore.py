@@ -0,0 +1,573 @@
+"""Out-of-core smoothing for meshes larger than RAM.
+
+The input is streamed into on-disk memory-mapped vertex and face arrays
+(OBJ and STL are parsed in blocks without ever materialising the whole mesh),
+then smoothed in spatially coherent chunks:
+
+1. vertices are bucketed into a Morton-ordered grid with a counting sort, so
+   consecutive runs of the resulting permutation are spatially compact;
+2. a vertex->face incidence table (CSR, on disk) is built in one pass;
+3. each chunk of core vertices is grown by ``iterations`` face rings (the
+   halo), smoothed locally with the sparse engine, and only the core rows are
+   written back to the output memmap.
+
+An explicit iteration only reads a vertex's one-ring, so after ``k``
+iterations a core vertex depends solely on its ``k``-ring and the chunked
+result is identical to an in-memory run. Only array blocks, one chunk's halo
+mesh and O(1) bookkeeping are held in RAM; everything proportional to the mesh
+size lives in memmaps under a scratch directory that is removed afterwards.
+
+Limitations: only ``taubin`` and ``laplacian`` are supported, the Laplacian
+volume constraint is global and therefore skipped, early stopping does not
+apply, UVs/normals are not carried through, and pre-repair is limited to
+welding the exact duplicate vertices of STL triangle soups.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+from .utils import eprint, ensure_dir
+
+OUT_OF_CORE_FORMATS = {'.obj', '.stl'}
+# Rough working-set cost of one vertex in a chunk's halo mesh: positions and
+# two smoothing buffers, the CSR operator and its step copies, and index maps.
+BYTES_PER_HALO_VERTEX = 480
+MIN_CORE_VERTICES = 20_000
+# Rows per streaming block when converting, sorting and writing.
+BLOCK_ROWS = 1 << 20
+
+
+def _imp_numpy():
+    from importlib import import_module
+    return import_module('numpy')
+
+
+class MemmapMesh:
+    """Vertex/face arrays stored as raw files in ``root`` and opened as memmaps."""
+
+    def __init__(self, root: Path, num_vertices: int, num_faces: int,
+                 vertex_dtype: str = '<f8', face_dtype: str = '<i8'):
+        self.root = Path(root)
+        self.num_vertices = int(num_vertices)
+        self.num_faces = int(num_faces)
+        self.vertex_dtype = vertex_dtype
+        self.face_dtype = face_dtype
+
+    @property
+    def vertices_path(self) -> Path:
+        return self.root / 'vertices.bin'
+
+    @property
+    def faces_path(self) -> Path:
+        return self.root / 'faces.bin'
+
+    def vertices(self, mode: str = 'r'):
+        np = _imp_numpy()
+        return np.memmap(self.vertices_path, dtype=self.vertex_dtype, mode=mode, shape=(self.num_vertices, 3))
+
+    def faces(self, mode: str = 'r'):
+        np = _imp_numpy()
+        return np.memmap(self.faces_path, dtype=self.face_dtype, mode=mode, shape=(self.num_faces, 3))
+
+    def save_meta(self) -> None:
+        meta = {
+            'num_vertices': self.num_vertices, 'num_faces': self.num_faces,
+            'vertex_dtype': self.vertex_dtype, 'face_dtype': self.face_dtype,
+        }
+        (self.root / 'mesh.json').write_text(json.dumps(meta), encoding='utf-8')
+
+
+# --------------------------------------------------------------------------
+# Streaming conversion
+# --------------------------------------------------------------------------
+
+_OBJ_REF_SUFFIX = re.compile(rb'/[^\s]*')
+
+
+def _obj_face_block(lines, vcount: int):
+    """Parse OBJ ``f`` line bodies into triangles (fan-triangulating polygons)."""
+    np = _imp_numpy()
+    joined = _OBJ_REF_SUFFIX.sub(b'', b'\n'.join(lines))
+    rows = joined.split(b'\n')
+    counts = [len(r.split()) for r in rows]
+    if all(c == 3 for c in counts):
+        idx = np.array(joined.split(), dtype=np.int64).reshape(-1, 3)
+        return np.where(idx < 0, idx + vcount, idx - 1)
+    tris = []
+    for r in rows:
+        ids = [int(t) for t in r.split()]
+        ids = [i + vcount if i < 0 else i - 1 for i in ids]
+        for k in range(1, len(ids) - 1):
+            tris.append((ids[0], ids[k], ids[k + 1]))
+    return np.array(tris, dtype=np.int64).reshape(-1, 3)
+
+
+def _obj_vertex_block(lines):
+    np = _imp_numpy()
+    toks = [ln.split() for ln in lines]
+    if all(len(t) == 3 for t in toks):
+        return np.array(b' '.join(lines).split(), dtype=np.float64).reshape(-1, 3)
+    return np.array([t[:3] for t in toks], dtype=np.float64).reshape(-1, 3)
+
+
+def convert_obj(path: Path, root: Path, block_bytes: int = 64 << 20) -> MemmapMesh:
+    """Stream an OBJ file's ``v``/``f`` records into raw vertex/face files."""
+    ensure_dir(root)
+    mesh = MemmapMesh(root, 0, 0)
+    nv = nf = 0
+    with open(path, 'rb') as fh, open(mesh.vertices_path, 'wb') as vout, open(mesh.faces_path, 'wb') as fout:
+        while True:
+            lines = fh.readlines(block_bytes)
+            if not lines:
+                break
+            vlines, flines = [], []
+            for ln in lines:
+                if ln.startswith(b'v '):
+                    # Faces in this block may use negative indices relative to
+                    # vertices declared before them; flush faces first.
+                    if flines:
+                        tri = _obj_face_block(flines, nv)
+                        fout.write(tri.tobytes())
+                        nf += len(tri)
+                        flines = []
+                    vlines.append(ln[2:].strip())
+                elif ln.startswith(b'f '):
+                    if vlines:
+                        v = _obj_vertex_block(vlines)
+                        vout.write(v.tobytes())
+                        nv += len(v)
+                        vlines = []
+                    flines.append(ln[2:].strip())
+            if vlines:
+                v = _obj_vertex_block(vlines)
+                vout.write(v.tobytes())
+                nv += len(v)
+            if flines:
+                tri = _obj_face_block(flines, nv)
+                fout.write(tri.tobytes())
+                nf += len(tri)
+    mesh.num_vertices, mesh.num_faces = nv, nf
+    mesh.save_meta()
+    return mesh
+
+
+def _stl_is_binary(path: Path) -> bool:
+    size = path.stat().st_size
+    if size < 84:
+        return False
+    with open(path, 'rb') as fh:
+        fh.seek(80)
+        count = int.from_bytes(fh.read(4), 'little')
+    return size == 84 + 50 * count
+
+
+def _write_stl_soup(path: Path, soup_path: Path) -> int:
+    """Write an STL's triangle corners (3 per face) to ``soup_path``; return face count."""
+    np = _imp_numpy()
+    nf = 0
+    with open(soup_path, 'wb') as out:
+        if _stl_is_binary(path):
+            record = np.dtype([('normal', '<f4', (3,)), ('corners', '<f4', (3, 3)), ('attr', '<u2')])
+            with open(path, 'rb') as fh:
+                fh.seek(80)
+                count = int.from_bytes(fh.read(4), 'little')
+            data = np.memmap(path, dtype=record, mode='r', offset=84, shape=(count,))
+            for s in range(0, count, BLOCK_ROWS):
+                block = np.asarray(data['corners'][s:s + BLOCK_ROWS], dtype=np.float64)
+                out.write(block.reshape(-1, 3).tobytes())
+            nf = count
+            del data
+        else:
+            with open(path, 'rb') as fh:
+                pending = []
+                for ln in fh:
+                    ln = ln.strip()
+                    if ln.startswith(b'vertex'):
+                        pending.append(ln[6:])
+                        if len(pending) >= 3 * BLOCK_ROWS:
+                            out.write(np.array(b' '.join(pending).split(), dtype=np.float64).tobytes())
+                            nf += len(pending) // 3
+                            pending = []
+                if pending:
+                    out.write(np.array(b' '.join(pending).split(), dtype=np.float64).tobytes())
+                    nf += len(pending) // 3
+    return nf
+
+
+def _row_hash(rows):
+    np = _imp_numpy()
+    bits = np.ascontiguousarray(rows + 0.0).view(np.uint64)  # +0.0 folds -0.0 into 0.0
+    h = bits[:, 0] * np.uint64(0x9E3779B97F4A7C15)
+    h ^= bits[:, 1] * np.uint64(0xC2B2AE3D27D4EB4F)
+    h ^= bits[:, 2] * np.uint64(0x165667B19E3779F9)
+    return h
+
+
+def _weld_soup(soup_path: Path, num_corners: int, root: Path, budget_rows: int) -> MemmapMesh:
+    """Merge bit-identical corners of a triangle soup without loading it whole.
+
+    Corners are hash-partitioned into buckets small enough for an in-memory
+    ``np.unique``; each bucket assigns global vertex ids and writes the
+    corner->vertex remap, which becomes the face array.
+    """
+    np = _imp_numpy()
+    mesh = MemmapMesh(root, 0, num_corners // 3)
+    soup = np.memmap(soup_path, dtype='<f8', mode='r', shape=(num_corners, 3))
+    nbuckets = max(1, -(-num_corners // max(1, budget_rows)))
+    bucket_dir = root / 'buckets'
+    ensure_dir(bucket_dir)
+    files = [open(bucket_dir / f'{b}.bin', 'wb') for b in range(nbuckets)]
+    try:
+        for s in range(0, num_corners, BLOCK_ROWS):
+            rows = np.asarray(soup[s:s + BLOCK_ROWS])
+            bucket = (_row_hash(rows) % np.uint64(nbuckets)).astype(np.int64)
+            idx = np.arange(s, s + len(rows), dtype=np.float64)
+            packed = np.column_stack([rows + 0.0, idx])
+            order = np.argsort(bucket, kind='stable')
+            bounds = np.searchsorted(bucket[order], np.arange(nbuckets + 1))
+            for b in range(nbuckets):
+                if bounds[b + 1] > bounds[b]:
+                    files[b].write(packed[order[bounds[b]:bounds[b + 1]]].tobytes())
+    finally:
+        for f in files:
+            f.close()
+    del soup
+    remap = np.memmap(mesh.faces_path, dtype='<i8', mode='w+', shape=(num_corners,))
+    nv = 0
+    with open(mesh.vertices_path, 'wb') as vout:
+        for b in range(nbuckets):
+            data = np.fromfile(bucket_dir / f'{b}.bin', dtype='<f8').reshape(-1, 4)
+            if len(data) == 0:
+                continue
+            uniq, inverse = np.unique(data[:, :3], axis=0, return_inverse=True)
+            vout.write(np.ascontiguousarray(uniq).tobytes())
+            remap[data[:, 3].astype(np.int64)] = inverse.ravel() + nv
+            nv += len(uniq)
+    remap.flush()
+    del remap
+    shutil.rmtree(bucket_dir, ignore_errors=True)
+    mesh.num_vertices = nv
+    mesh.save_meta()
+    return mesh
+
+
+def convert_stl(path: Path, root: Path, budget_rows: int = 8 * BLOCK_ROWS) -> MemmapMesh:
+    """Stream an STL (binary or ASCII) into welded vertex/face files."""
+    ensure_dir(root)
+    soup_path = root / 'soup.bin'
+    nf = _write_stl_soup(path, soup_path)
+    mesh = _weld_soup(soup_path, 3 * nf, root, budget_rows)
+    soup_path.unlink()
+    return mesh
+
+
+def convert_to_memmap(path: Path, root: Path, budget_rows: int = 8 * BLOCK_ROWS) -> MemmapMesh:
+    ext = path.suffix.lower()
+    if ext == '.obj':
+        return convert_obj(path, root)
+    if ext == '.stl':
+        return convert_stl(path, root, budget_rows=budget_rows)
+    raise ValueError(f"Out-of-core conversion supports {sorted(OUT_OF_CORE_FORMATS)}, got {ext}")
+
+
+# --------------------------------------------------------------------------
+# Spatial ordering and incidence
+# --------------------------------------------------------------------------
+
+def _part1by2(x):
+    np = _imp_numpy()
+    x = x.astype(np.uint64) & np.uint64(0x3FF)
+    x = (x | (x << np.uint64(16))) & np.uint64(0x030000FF)
+    x = (x | (x << np.uint64(8))) & np.uint64(0x0300F00F)
+    x = (x | (x << np.uint64(4))) & np.uint64(0x030C30C3)
+    x = (x | (x << np.uint64(2))) & np.uint64(0x09249249)
+    return x
+
+
+def morton_codes(points, lo, hi, grid_bits: int = 6):
+    """Morton (Z-order) code of the grid cell containing each point.
+
+    The grid has ``2**grid_bits`` cells per axis spanning ``[lo, hi]``; sorting by
+    the code walks an octree depth-first, so equal-size runs are spatially compact.
+    """
+    np = _imp_numpy()
+    g = 1 << grid_bits
+    scale = (g - 1) / np.maximum(np.asarray(hi) - np.asarray(lo), 1e-30)
+    q = np.clip(((points - lo) * scale).astype(np.int64), 0, g - 1)
+    return (_part1by2(q[:, 0]) | (_part1by2(q[:, 1]) << np.uint64(1))
+            | (_part1by2(q[:, 2]) << np.uint64(2))).astype(np.int64)
+
+
+def _bounds(vertices):
+    np = _imp_numpy()
+    lo = np.full(3, np.inf)
+    hi = np.full(3, -np.inf)
+    for s in range(0, len(vertices), BLOCK_ROWS):
+        block = np.asarray(vertices[s:s + BLOCK_ROWS])
+        lo = np.minimum(lo, block.min(axis=0))
+        hi = np.maximum(hi, block.max(axis=0))
+    return lo, hi
+
+
+def spatial_order(mesh: MemmapMesh, grid_bits: int = 6):
+    """Counting-sort vertices into Morton-ordered grid cells; return a permutation memmap."""
+    np = _imp_numpy()
+    vertices = mesh.vertices()
+    n = mesh.num_vertices
+    lo, hi = _bounds(vertices)
+
+    def _cells(block):
+        return morton_codes(block, lo, hi, grid_bits)
+
+    ncells = (1 << grid_bits) ** 3
+    counts = np.zeros(ncells, dtype=np.int64)
+    for s in range(0, n, BLOCK_ROWS):
+        counts += np.bincount(_cells(np.asarray(vertices[s:s + BLOCK_ROWS])), minlength=ncells)
+    cursor = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    perm = np.memmap(mesh.root / 'order.bin', dtype='<i8', mode='w+', shape=(max(n, 1),))
+    for s in range(0, n, BLOCK_ROWS):
+        cells = _cells(np.asarray(vertices[s:s + BLOCK_ROWS]))
+        order = np.argsort(cells, kind='stable')
+        sorted_cells = cells[order]
+        uniq, first, cnt = np.unique(sorted_cells, return_index=True, return_counts=True)
+        rank = np.arange(len(cells)) - np.repeat(first, cnt)
+        perm[cursor[sorted_cells] + rank] = order + s
+        cursor[uniq] += cnt
+    perm.flush()
+    return perm
+
+
+def vertex_face_incidence(mesh: MemmapMesh):
+    """Build the vertex->face CSR incidence as ``(indptr, indices)`` memmaps."""
+    np = _imp_numpy()
+    faces = mesh.faces()
+    n, m = mesh.num_vertices, mesh.num_faces
+    indptr = np.memmap(mesh.root / 'vf_indptr.bin', dtype='<i8', mode='w+', shape=(n + 1,))
+    indptr[:] = 0
+    for s in range(0, m, BLOCK_ROWS):
+        # Only the vertices this block touches are updated, so memory stays O(block)
+        uniq, cnt = np.unique(np.asarray(faces[s:s + BLOCK_ROWS]).ravel(), return_counts=True)
+        indptr[uniq + 1] += cnt
+    np.cumsum(indptr, out=indptr)
+    cursor = np.memmap(mesh.root / 'vf_cursor.bin', dtype='<i8', mode='w+', shape=(max(n, 1),))
+    cursor[:n] = indptr[:-1]
+    indices = np.memmap(mesh.root / 'vf_indices.bin', dtype='<i8', mode='w+', shape=(max(3 * m, 1),))
+    for s in range(0, m, BLOCK_ROWS):
+        block = np.asarray(faces[s:s + BLOCK_ROWS])
+        vids = block.ravel()
+        fids = np.repeat(np.arange(s, s + len(block), dtype=np.int64), 3)
+        order = np.argsort(vids, kind='stable')
+        vids, fids = vids[order], fids[order]
+        uniq, first, cnt = np.unique(vids, return_index=True, return_counts=True)
+        rank = np.arange(len(vids)) - np.repeat(first, cnt)
+        indices[cursor[vids] + rank] = fids
+        cursor[uniq] += cnt
+    indices.flush()
+    indptr.flush()
+    del cursor
+    (mesh.root / 'vf_cursor.bin').unlink()
+    return indptr, indices
+
+
+def incident_faces(vids, indptr, indices):
+    """Sorted unique ids of faces touching any vertex in ``vids`` (CSR lookup)."""
+    np = _imp_numpy()
+    starts = np.asarray(indptr[vids])
+    ends = np.asarray(indptr[vids + 1])
+    lengths = ends - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.int64)
+    offsets = np.repeat(starts - np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths)
+    pos = np.arange(total, dtype=np.int64) + offsets
+    pos.sort()  # sequential access into the memmap
+    return np.unique(np.asarray(indices[pos]))
+
+
+def halo_submesh(core, faces, indptr, indices, rings: int):
+    """Grow ``core`` vertices by ``rings`` face rings and return the local mesh.
+
+    Returns ``(vertex_ids, local_faces, core_local)``: the sorted global ids of
+    the halo mesh, its faces re-indexed into those ids (every face touching a
+    vertex within ``rings - 1`` rings of the core) and the positions of the core
+    vertices inside ``vertex_ids``. After ``rings`` explicit smoothing
+    iterations on this submesh the core rows equal a whole-mesh run.
+    """
+    np = _imp_numpy()
+    core = np.sort(np.asarray(core, dtype=np.int64))
+    vset = core
+    frontier = core
+    fids = np.zeros(0, dtype=np.int64)
+    for _ in range(max(0, int(rings))):
+        # Only the newest ring can touch faces not collected yet
+        new_faces = np.setdiff1d(incident_faces(frontier, indptr, indices), fids, assume_unique=True)
+        if len(new_faces) == 0:
+            break
+        fids = np.union1d(fids, new_faces)
+        frontier = np.setdiff1d(np.unique(np.asarray(faces[new_faces]).ravel()), vset, assume_unique=True)
+        vset = np.union1d(vset, frontier)
+    local_faces = np.searchsorted(vset, np.asarray(faces[fids]).reshape(-1, 3))
+    return vset, local_faces, np.searchsorted(vset, core)
+
+
+# --------------------------------------------------------------------------
+# Chunked smoothing and streaming export
+# --------------------------------------------------------------------------
+
+def core_size_for_budget(memory_budget_mb: float, halo_rings: int) -> int:
+    """Number of core vertices per chunk that keeps the halo mesh within budget.
+
+    A chunk of ``c`` spatially compact vertices on a surface grows roughly by
+    ``4 * rings * sqrt(c)`` vertices per ring of halo; the core size is chosen so
+    that core plus halo fits the budget.
+    """
+    budget_vertices = max(MIN_CORE_VERTICES, int(memory_budget_mb * 1024 * 1024 / BYTES_PER_HALO_VERTEX))
+    core = budget_vertices
+    for _ in range(32):
+        halo = 4.0 * max(0, halo_rings) * core ** 0.5 + 4.0 * max(0, halo_rings) ** 2
+        if core + halo <= budget_vertices or core <= MIN_CORE_VERTICES:
+            break
+        core = int(core * 0.8)
+    return max(MIN_CORE_VERTICES // 2, core)
+
+
+def _volume_moments(vertices, faces):
+    """Signed volume and volumetric centre of mass, summed over face blocks."""
+    np = _imp_numpy()
+    volume = 0.0
+    moment = np.zeros(3)
+    for s in range(0, len(faces), BLOCK_ROWS):
+        tri = np.asarray(vertices[np.asarray(faces[s:s + BLOCK_ROWS])], dtype=np.float64)
+        vol = np.einsum('ij,ij->i', tri[:, 0], np.cross(tri[:, 1], tri[:, 2])) / 6.0
+        volume += float(vol.sum())
+        moment += (vol[:, None] * tri.sum(axis=1)).sum(axis=0) / 4.0
+    if volume == 0.0:
+        return 0.0, None
+    return volume, moment / volume
+
+
+def _rescale_to_volume(vertices, faces, volume: float, center_mass) -> None:
+    # Chunked counterpart of smoothing.rescale_to_volume for memmap vertices.
+    if center_mass is None or volume == 0.0:
+        return
+    vol_new, _ = _volume_moments(vertices, faces)
+    if vol_new == 0.0 or (volume / vol_new) <= 0.0:
+        return
+    scale = (volume / vol_new) ** (1.0 / 3.0)
+    for s in range(0, len(vertices), BLOCK_ROWS):
+        vertices[s:s + BLOCK_ROWS] = (vertices[s:s + BLOCK_ROWS] - center_mass) * scale + center_mass
+
+
+def smooth_memmap(mesh: MemmapMesh, method: str, iterations: int, lamb: float, nu: float,
+                  memory_budget_mb: float = 2048.0) -> MemmapMesh:
+    """Smooth ``mesh`` chunk by chunk; returns a mesh sharing faces with new vertices.
+
+    Chunks run without the Laplacian volume constraint; for ``laplacian`` the
+    result is rescaled once about the centre of mass to the initial volume,
+    which matches the in-memory engine's per-step restore.
+    """
+    from .smoothing import smooth_vertices
+    np = _imp_numpy()
+    if method not in ('taubin', 'laplacian'):
+        raise ValueError(f"Out-of-core smoothing supports taubin/laplacian, got {method}")
+    nit = max(0, int(iterations))
+    out = MemmapMesh(mesh.root / 'smoothed', mesh.num_vertices, mesh.num_faces,
+                     mesh.vertex_dtype, mesh.face_dtype)
+    ensure_dir(out.root)
+    src = mesh.vertices()
+    dst = np.memmap(out.vertices_path, dtype=out.vertex_dtype, mode='w+', shape=(max(mesh.num_vertices, 1), 3))
+    for s in range(0, mesh.num_vertices, BLOCK_ROWS):
+        dst[s:s + BLOCK_ROWS] = src[s:s + BLOCK_ROWS]
+    if nit == 0 or mesh.num_faces == 0:
+        dst.flush()
+        del dst
+        shutil.copyfile(mesh.faces_path, out.faces_path)
+        return out
+    perm = spatial_order(mesh)
+    indptr, indices = vertex_face_incidence(mesh)
+    faces = mesh.faces()
+    vol_ini, center_mass = _volume_moments(src, faces) if method == 'laplacian' else (0.0, None)
+    core_size = core_size_for_budget(memory_budget_mb, nit)
+    n = mesh.num_vertices
+    for a in range(0, n, core_size):
+        core = np.sort(np.asarray(perm[a:a + core_size]))
+        vset, local_faces, core_local = halo_submesh(core, faces, indptr, indices, nit)
+        if len(local_faces) == 0:
+            continue
+        smoothed, _ = smooth_vertices(np.asarray(src[vset]), local_faces, method, nit, lamb, nu,
+                                      volume_constraint=False)
+        dst[core] = smoothed[core_local]
+    if method == 'laplacian':
+        _rescale_to_volume(dst, faces, vol_ini, center_mass)
+    dst.flush()
+    del dst
+    shutil.copyfile(mesh.faces_path, out.faces_path)
+    out.save_meta()
+    return out
+
+
+def write_obj(mesh: MemmapMesh, out_path: Path) -> None:
+    np = _imp_numpy()
+    vertices, faces = mesh.vertices(), mesh.faces()
+    with open(out_path, 'w', encoding='utf-8') as fh:
+        for s in range(0, mesh.num_vertices, BLOCK_ROWS):
+            np.savetxt(fh, np.asarray(vertices[s:s + BLOCK_ROWS]), fmt='v %.8f %.8f %.8f')
+        for s in range(0, mesh.num_faces, BLOCK_ROWS):
+            np.savetxt(fh, np.asarray(faces[s:s + BLOCK_ROWS]) + 1, fmt='f %d %d %d')
+
+
+def write_stl(mesh: MemmapMesh, out_path: Path) -> None:
+    np = _imp_numpy()
+    vertices, faces = mesh.vertices(), mesh.faces()
+    record = np.dtype([('normal', '<f4', (3,)), ('corners', '<f4', (3, 3)), ('attr', '<u2')])
+    with open(out_path, 'wb') as fh:
+        fh.write(b'refiner out-of-core'.ljust(80, b' '))
+        fh.write(int(mesh.num_faces).to_bytes(4, 'little'))
+        for s in range(0, mesh.num_faces, BLOCK_ROWS):
+            tri = np.asarray(vertices[np.asarray(faces[s:s + BLOCK_ROWS])])
+            normal = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+            length = np.linalg.norm(normal, axis=1, keepdims=True)
+            normal = np.divide(normal, length, out=np.zeros_like(normal), where=length > 0)
+            rec = np.zeros(len(tri), dtype=record)
+            rec['normal'] = normal
+            rec['corners'] = tri
+            fh.write(rec.tobytes())
+
+
+def smooth_file_out_of_core(path: Path, outdir: Path, method: str, iterations: int, lamb: float, nu: float,
+                            memory_budget_mb: float = 2048.0,
+                            scratch_dir: Optional[Path] = None) -> Optional[Path]:
+    """Convert, smooth and export ``path`` without loading it into memory.
+
+    Output goes to ``outdir/<stem>_refined<ext>`` like the in-memory pipeline.
+    """
+    ext = path.suffix.lower()
+    if ext not in OUT_OF_CORE_FORMATS:
+        raise ValueError(f"Out-of-core mode supports {sorted(OUT_OF_CORE_FORMATS)}, got {ext}")
+    ensure_dir(outdir)
+    root = Path(tempfile.mkdtemp(prefix='_ooc_', dir=str(scratch_dir or outdir)))
+    try:
+        t0 = time.perf_counter()
+        budget_rows = max(BLOCK_ROWS, int(memory_budget_mb * 1024 * 1024 / 64))
+        mesh = convert_to_memmap(path, root, budget_rows=budget_rows)
+        print(f"Out-of-core: {path.name} -> {mesh.num_vertices} vertices, {mesh.num_faces} faces "
+              f"({time.perf_counter() - t0:.1f}s)")
+        smoothed = smooth_memmap(mesh, method, iterations, lamb, nu, memory_budget_mb=memory_budget_mb)
+        out_path = outdir / (path.stem + '_refined' + path.suffix)
+        if ext == '.obj':
+            write_obj(smoothed, out_path)
+        else:
+            write_stl(smoothed, out_path)
+        return out_path
+    except Exception as ex:
+        eprint(f"Out-of-core smoothing failed for {path.name}: {ex}")
+        raise
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
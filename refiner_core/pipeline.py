@@ -1,4 +1,5 @@
 from pathlib import Path
+import time
 from typing import List, Optional
 
 try:  # pragma: no cover - optional dependency during linting
@@ -27,10 +28,137 @@ def export_same_format(obj, output_path: Path):
     scene.export(output_path.as_posix())
 
 
+def _geometry_arrays(geom, precision: str = 'double') -> dict:
+    """Extract the arrays a worker needs to repair and smooth one geometry.
+
+    Per-vertex visual attributes (UVs, vertex colours) travel with the
+    geometry so repair can keep them aligned with the welded vertices, and
+    authored vertex normals travel so the weld keeps hard edges split.
+    Vertices and faces are converted to the ``precision`` dtypes here, once,
+    so single precision also halves what is copied into shared memory.
+    """
+    np_mod = _require_numpy()
+    from .smoothing import precision_dtypes
+    float_dtype, index_dtype = precision_dtypes(precision)
+    arrays = {
+        'vertices': np_mod.ascontiguousarray(np_mod.asarray(geom.vertices, dtype=float_dtype)),
+        'faces': np_mod.ascontiguousarray(np_mod.asarray(geom.faces, dtype=index_dtype)),
+    }
+    visual = getattr(geom, 'visual', None)
+    try:
+        uv = getattr(visual, 'uv', None)
+        if uv is not None and len(uv) == len(arrays['vertices']):
+            arrays['uv'] = np_mod.asarray(uv)
+    except Exception:
+        pass
+    try:
+        if getattr(visual, 'kind', None) == 'vertex':
+            arrays['vertex_colors'] = np_mod.asarray(visual.vertex_colors)
+    except Exception:
+        pass
+    from .repair import authored_vertex_normals
+    normals = authored_vertex_normals(geom)
+    if normals is not None:
+        arrays['vertex_normals'] = np_mod.asarray(normals)
+    return arrays
+
+
+def _has_face_data(geom) -> bool:
+    """True when ``geom`` carries per-face colours or attributes.
+
+    Repair drops and reorders faces, and only per-vertex data is carried back
+    from a worker, so such geometries are repaired in-process instead.
+    """
+    if getattr(getattr(geom, 'visual', None), 'kind', None) == 'face':
+        return True
+    try:
+        return bool(getattr(geom, 'face_attributes', None))
+    except Exception:
+        return False
+
+
+def _refine_geometry_arrays(arrays: dict, options: tuple) -> dict:
+    """Rebuild a bare Trimesh from ``arrays``, pre-repair and smooth it."""
+    from importlib import import_module
+    trimesh = import_module('trimesh')
+    from .repair import pre_repair_trimesh
+    from .smoothing import precision_dtypes, smooth_trimesh_inplace
+    pre_repair, weld_tolerance, method, iterations, lamb, nu, tolerance, precision = options
+    visual = None
+    if 'uv' in arrays:
+        visual = trimesh.visual.TextureVisuals(uv=arrays['uv'])
+    elif 'vertex_colors' in arrays:
+        visual = trimesh.visual.ColorVisuals(vertex_colors=arrays['vertex_colors'])
+    mesh = trimesh.Trimesh(vertices=arrays['vertices'], faces=arrays['faces'], visual=visual,
+                           vertex_normals=arrays.get('vertex_normals'), process=False)
+    if pre_repair:
+        pre_repair_trimesh(mesh, weld_tolerance=weld_tolerance)
+    ran = smooth_trimesh_inplace(mesh, method, iterations, lamb, nu, tolerance=tolerance,
+                                 precision=precision)
+    np_mod = _require_numpy()
+    float_dtype, index_dtype = precision_dtypes(precision)
+    out = {
+        'vertices': np_mod.asarray(mesh.vertices, dtype=float_dtype),
+        'faces': np_mod.asarray(mesh.faces, dtype=index_dtype),
+        'iterations': int(ran),
+        'planned': int(iterations),
+    }
+    if 'uv' in arrays:
+        out['uv'] = np_mod.asarray(mesh.visual.uv)
+    elif 'vertex_colors' in arrays:
+        out['vertex_colors'] = np_mod.asarray(mesh.visual.vertex_colors)
+    return out
+
+
+def _geometry_task(task: tuple) -> tuple:
+    # Worker entry point: never raise, so one bad geometry cannot take down the batch.
+    # Large arrays arrive as shared-memory handles and results leave the same way.
+    from .shared_arrays import attached_arrays, export_arrays
+    name, packed, options = task
+    try:
+        with attached_arrays(packed) as arrays:
+            return name, export_arrays(_refine_geometry_arrays(arrays, options)), None
+    except Exception as ex:
+        return name, None, f"{type(ex).__name__}: {ex}"
+
+
+def _run_geometry_tasks(tasks: list, workers: int):
+    """Run geometry tasks in a process pool, yielding results in submission order.
+
+    Input arrays are moved into shared memory once and only handles are
+    pickled; the blocks are unlinked when the pool is done.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from .shared_arrays import SharedArrayStore, release_packed, unpack_arrays
+    chunksize = max(1, len(tasks) // (workers * 4))
+    with SharedArrayStore() as store:
+        shared_tasks = [(name, store.pack(arrays), options) for name, arrays, options in tasks]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for name, result, error in pool.map(_geometry_task, shared_tasks, chunksize=chunksize):
+                if result is not None:
+                    try:
+                        result = unpack_arrays(result)
+                    except Exception as ex:
+                        release_packed(result)
+                        result, error = None, f"{type(ex).__name__}: {ex}"
+                yield name, result, error
+
+
+def _apply_geometry_arrays(geom, result: dict) -> None:
+    """Write a worker's repaired/smoothed arrays back into the scene geometry."""
+    geom.vertices = result['vertices']
+    geom.faces = result['faces']
+    if 'uv' in result:
+        geom.visual.uv = result['uv']
+    elif 'vertex_colors' in result:
+        geom.visual.vertex_colors = result['vertex_colors']
+
+
 def process_file(path: Path, outdir: Path, method: str, iterations: int, lamb: float, nu: float,
                  smooth_textures: bool, texture_method: str, bilateral_d: int, bilateral_sigma_color: float,
                  bilateral_sigma_space: float, gaussian_ksize: int, gaussian_sigma: float,
                  pre_repair: bool = True,
+                 weld_tolerance: float = 1e-5,
                  unwrap_uv_with_blender: bool = False,
                  unwrap_attempts: int = 2,
                  uv_min_coverage: float = 50.0,
@@ -39,10 +167,24 @@ def process_file(path: Path, outdir: Path, method: str, iterations: int, lamb: f
                  unwrap_angle_limit: float = 66.0,
                  unwrap_island_margin: float = 0.02,
                  unwrap_pack_margin: float = 0.003,
-                 blender_exe: Optional[str] = None) -> Optional[Path]:
+                 blender_exe: Optional[str] = None,
+                 operator_cache_mb: Optional[float] = None,
+                 smoothing_tolerance: Optional[float] = None,
+                 time_budget_per_file: Optional[float] = None,
+                 workers: int = 1,
+                 out_of_core: bool = False,
+                 memory_budget_mb: float = 2048.0,
+                 shards: int = 1,
+                 precision: str = 'double',
+                 split_components: bool = False) -> Optional[Path]:
+    t_start = time.perf_counter()
     # Lazy imports to avoid heavy deps during CLI --help
     from .loaders import load_scene_or_mesh, try_blender_unwrap_uv
-    from .smoothing import smooth_trimesh_inplace
+    from .smoothing import normalize_mesh_arrays, smooth_trimesh_inplace
+    from .scheduler import mesh_size, plan_smoothing
+    if operator_cache_mb is not None:
+        from .operator_cache import default_cache
+        default_cache.set_max_bytes(int(float(operator_cache_mb) * 1024 * 1024))
     from .textures import find_exported_mtl, smooth_textures_in_mtl
     ext = path.suffix.lower()
     supported_mesh = {'.obj', '.glb', '.gltf', '.stl'}
@@ -55,6 +197,16 @@ def process_file(path: Path, outdir: Path, method: str, iterations: int, lamb: f
         eprint(f"Skipping unsupported file: {path.name}")
         return None
 
+    if out_of_core:
+        from .outofcore import OUT_OF_CORE_FORMATS, smooth_file_out_of_core
+        if ext in OUT_OF_CORE_FORMATS and method in ('taubin', 'laplacian'):
+            skipped = " and pre-repair is skipped" if pre_repair else ""
+            eprint(f"Out-of-core: {path.name} is written as geometry only (UVs, normals and materials "
+                   f"are dropped){skipped}.")
+            return smooth_file_out_of_core(path, outdir, method, iterations, lamb, nu,
+                                           memory_budget_mb=memory_budget_mb)
+        eprint(f"Out-of-core mode supports taubin/laplacian on OBJ/STL; processing {path.name} in memory.")
+
 
     # Optional Blender UV unwrap step (works best before smoothing). If enabled,
     # or if no UVs detected after load, iterate up to unwrap_attempts until thresholds pass.
@@ -65,16 +217,36 @@ def process_file(path: Path, outdir: Path, method: str, iterations: int, lamb: f
         except Exception:
             return False
 
+    uv_rasterizer = None
+
     def _uv_metrics(m) -> dict:
-        from .analyzer import analyze_loaded
-        rep = analyze_loaded(m, is_scene=False)
-        mrep = rep['meshes'][0] if rep.get('meshes') else {}
-        # Compute coverage/overlap with the rasterizer by reusing uv_analyzer raster if needed
-        # For now, rely on presence and OOB, and symmetry metrics for gating; extend later.
-        return {
+        # Only the UV tier is computed; geometry and symmetry are never touched.
+        # Coverage/overlap come from one rasterizer reused across attempts;
+        # no wrapping, since OOB is gated on its own and packed layouts touch 1.0.
+        nonlocal uv_rasterizer
+        from .analyzer import MeshAnalysis
+        mrep = MeshAnalysis(m).tier('uv')
+        met = {
             'has_uv': bool(mrep.get('has_uv', False)),
             'uv_oob_vertex_pct': float(mrep.get('uv_oob_vertex_pct', 0.0) or 0.0),
         }
+        if met['has_uv']:
+            from .uv_raster import UVRasterizer
+            if uv_rasterizer is None:
+                uv_rasterizer = UVRasterizer()
+            met.update(uv_rasterizer.measure(m.faces, m.visual.uv, wrap=False))
+        return met
+
+    def _uv_gate_failure(met: dict) -> Optional[str]:
+        if not met['has_uv']:
+            return 'no UVs'
+        if met['uv_oob_vertex_pct'] > uv_max_oob_pct:
+            return f"out-of-bounds {met['uv_oob_vertex_pct']:.2f}% > {uv_max_oob_pct}%"
+        if met['uv_coverage_pct'] < uv_min_coverage:
+            return f"coverage {met['uv_coverage_pct']:.2f}% < {uv_min_coverage}%"
+        if met['uv_overlap_pct'] > uv_max_overlap_pct:
+            return f"overlap {met['uv_overlap_pct']:.2f}% > {uv_max_overlap_pct}%"
+        return None
 
     unwrap_needed = unwrap_uv_with_blender
     # We'll revisit after load below to auto-enable unwrap if missing UVs
@@ -96,10 +268,11 @@ def process_file(path: Path, outdir: Path, method: str, iterations: int, lamb: f
                 source_path = uv_path
                 obj, is_scene = load_scene_or_mesh(source_path)
                 if not is_scene:
-                    met = _uv_metrics(obj)
-                    # Basic acceptance gate; expand to include coverage/overlap when available
-                    if met['has_uv'] and met['uv_oob_vertex_pct'] <= uv_max_oob_pct:
+                    # Accept the unwrap only if OOB, coverage and overlap all pass
+                    failure = _uv_gate_failure(_uv_metrics(obj))
+                    if failure is None:
                         break
+                    eprint(f"UV unwrap attempt {attempt + 1} for {path.name} rejected: {failure}")
             else:
                 break
 
@@ -117,48 +290,123 @@ def process_file(path: Path, outdir: Path, method: str, iterations: int, lamb: f
     # Pre-repair, then smoothing + symmetry (pre-repair enforced by default)
     from .repair import pre_repair_trimesh
     
-    def _num_vertices(m) -> int:
-        v = getattr(m, 'vertices', None)
-        try:
-            return int(len(v)) if v is not None else 0
-        except Exception:
-            try:
-                np_mod = _require_numpy()
-                return int(np_mod.asarray(v).shape[0])
-            except Exception:
-                return 0
+    def _mesh_weight(m) -> int:
+        nv, ne = mesh_size(m)
+        return nv + 2 * ne
+
+    def _plan(m, label: str, share: float = 1.0):
+        # One cost model sizes iterations/lambda against what is left of the
+        # per-file time budget; without a budget the request is used as-is.
+        budget = None
+        if time_budget_per_file is not None:
+            budget = max(0.0, float(time_budget_per_file) - (time.perf_counter() - t_start)) * share
+        nv, ne = mesh_size(m)
+        plan = plan_smoothing(nv, ne, method, iterations, lamb, budget_seconds=budget)
+        if plan.iterations < int(iterations):
+            print(f"Time budget: {label} smoothed with {plan.iterations} iteration(s), lambda={plan.lamb:.3f}")
+        return plan
+
+    def _report_convergence(label: str, ran: int, planned: int) -> None:
+        if smoothing_tolerance is not None and method != 'implicit' and ran < planned:
+            print(f"Smoothing converged for {label} after {ran}/{planned} iterations")
+
+    def _smooth(m, label: str, share: float = 1.0) -> None:
+        plan = _plan(m, label, share)
+        ran = smooth_trimesh_inplace(m, method, plan.iterations, plan.lamb, nu, tolerance=smoothing_tolerance,
+                                     precision=precision)
+        _report_convergence(label, ran, plan.iterations)
+
+    def _smooth_components(m, label: str) -> bool:
+        # Repair and smooth each connected part of a single mesh in the worker
+        # pool. Parts never share vertices, so there are no seams to blend.
+        # Returns False (mesh untouched) when there is nothing to split.
+        from .components import component_tasks, merge_arrays
+        if _has_face_data(m):
+            # Batches reorder faces, which would scramble per-face colours
+            return False
+        nworkers = max(1, int(workers or 1))
+        groups = None
+        if pre_repair and weld_tolerance > 0:
+            from .repair import authored_vertex_normals, weld_vertices
+            _, groups = weld_vertices(m.vertices, weld_tolerance, normals=authored_vertex_normals(m))
+        plan = _plan(m, label, float(nworkers))
+        options = (pre_repair, weld_tolerance, method, plan.iterations, plan.lamb, nu,
+                   smoothing_tolerance, precision)
+        tasks = component_tasks(_geometry_arrays(m, precision), options, vertex_groups=groups)
+        if tasks is None:
+            return False
+        parts, errors = [], []
+        for name, result, error in _run_geometry_tasks(tasks, min(nworkers, len(tasks))):
+            if error is not None:
+                errors.append(f"{name}: {error}")
+            else:
+                parts.append(result)
+        if errors:
+            eprint(f"Component smoothing failed for {label} ({errors[0]}); smoothing the whole mesh.")
+            return False
+        _apply_geometry_arrays(m, merge_arrays(parts))
+        _report_convergence(label, min(p['iterations'] for p in parts), plan.iterations)
+        return True
+    def _refine_in_process(geom, name, share):
+        # Defensive normalization to avoid 'len() of unsized object'
+        normalize_mesh_arrays(geom, precision)
+        if pre_repair:
+            pre_repair_trimesh(geom, weld_tolerance=weld_tolerance)
+        _smooth(geom, name, share)
+
     if is_scene:
         try:
             geoms = getattr(obj, 'geometry', {})
             count = 0
-            for name, geom in geoms.items():
-                try:
-                    # Defensive normalization to avoid 'len() of unsized object'
-                    np_mod = _require_numpy()
+            weights = {name: _mesh_weight(geom) for name, geom in geoms.items()}
+            remaining_weight = float(sum(weights.values()))
+            nworkers = min(max(1, int(workers or 1)), len(geoms))
+            if nworkers > 1:
+                # Budget shares are per geometry; with N workers running side by
+                # side each geometry may use N times its serial share.
+                tasks, local = [], []
+                for name, geom in geoms.items():
                     try:
-                        if getattr(geom, 'vertices', None) is not None:
-                            geom.vertices = np_mod.ascontiguousarray(np_mod.asarray(geom.vertices, dtype=np.float64))
-                        if getattr(geom, 'faces', None) is not None:
-                            geom.faces = np_mod.ascontiguousarray(np_mod.asarray(geom.faces, dtype=np.int64))
-                    except Exception:
-                        pass
-                    if pre_repair:
-                        pre_repair_trimesh(geom)
-                    # Adaptive smoothing parameters based on size
-                    nit = max(1, int(iterations))
-                    lam = float(lamb)
-                    nv = _num_vertices(geom)
-                    if nv > 500_000:
-                        nit = max(1, iterations // 2)
-                        lam = min(lam, 0.4)
-                    elif nv < 50_000:
-                        nit = iterations
-                    smooth_trimesh_inplace(geom, method, nit, lam, nu)
-                    # Symmetry repair removed: we now rely on Chamfer-based symmetry
-                    # scoring in the analyzer and do not perform automatic symmetry repair here.
-                    count += 1
+                        share = weights[name] / remaining_weight if remaining_weight > 0 else 1.0
+                        if _has_face_data(geom):
+                            local.append((name, geom, share))
+                            continue
+                        plan = _plan(geom, name, min(1.0, share * nworkers))
+                        tasks.append((name, _geometry_arrays(geom, precision),
+                                      (pre_repair, weld_tolerance, method, plan.iterations, plan.lamb, nu,
+                                       smoothing_tolerance, precision)))
+                    except Exception as ex:
+                        eprint(f"Failed smoothing geometry {name}: {ex}")
+                try:
+                    for name, result, error in _run_geometry_tasks(tasks, nworkers):
+                        if error is not None:
+                            eprint(f"Failed smoothing geometry {name}: {error}")
+                            continue
+                        try:
+                            _apply_geometry_arrays(geoms[name], result)
+                            _report_convergence(name, result['iterations'], result['planned'])
+                            count += 1
+                        except Exception as ex:
+                            eprint(f"Failed smoothing geometry {name}: {ex}")
                 except Exception as ex:
-                    eprint(f"Failed smoothing geometry {name}: {ex}")
+                    eprint(f"Parallel geometry smoothing failed: {ex}")
+                for name, geom, share in local:
+                    try:
+                        _refine_in_process(geom, name, share)
+                        count += 1
+                    except Exception as ex:
+                        eprint(f"Failed smoothing geometry {name}: {ex}")
+            else:
+                for name, geom in geoms.items():
+                    try:
+                        share = weights[name] / remaining_weight if remaining_weight > 0 else 1.0
+                        remaining_weight -= weights[name]
+                        _refine_in_process(geom, name, share)
+                        # Symmetry repair removed: we now rely on Chamfer-based symmetry
+                        # scoring in the analyzer and do not perform automatic symmetry repair here.
+                        count += 1
+                    except Exception as ex:
+                        eprint(f"Failed smoothing geometry {name}: {ex}")
             if count == 0:
                 eprint("No geometries smoothed in scene; attempting merge-and-smooth fallback.")
                 try:
@@ -175,26 +423,10 @@ def process_file(path: Path, outdir: Path, method: str, iterations: int, lamb: f
                     if len(meshes) > 0:
                         merged = trimesh.util.concatenate(meshes)
                         # Normalize arrays before smoothing
-                        np_mod = _require_numpy()
-                        try:
-                            if getattr(merged, 'vertices', None) is not None:
-                                merged.vertices = np_mod.ascontiguousarray(np_mod.asarray(merged.vertices, dtype=np.float64))
-                            if getattr(merged, 'faces', None) is not None:
-                                merged.faces = np_mod.ascontiguousarray(np_mod.asarray(merged.faces, dtype=np.int64))
-                        except Exception:
-                            pass
+                        normalize_mesh_arrays(merged, precision)
                         if pre_repair:
-                            pre_repair_trimesh(merged)
-                        # Adaptive params for merged mesh
-                        nit = max(1, int(iterations))
-                        lam = float(lamb)
-                        nv = _num_vertices(merged)
-                        if nv > 500_000:
-                            nit = max(1, iterations // 2)
-                            lam = min(lam, 0.4)
-                        elif nv < 50_000:
-                            nit = iterations
-                        smooth_trimesh_inplace(merged, method, nit, lam, nu)
+                            pre_repair_trimesh(merged, weld_tolerance=weld_tolerance)
+                        _smooth(merged, 'merged')
                         # Symmetry repair removed for merged meshes; analyzer will report
                         # Chamfer-based symmetry metrics for human review.
                         obj = merged
@@ -206,18 +438,32 @@ def process_file(path: Path, outdir: Path, method: str, iterations: int, lamb: f
         except Exception:
             pass
     else:
-        if pre_repair:
-            pre_repair_trimesh(obj)
-        # Adaptive params for single mesh
-        nit = max(1, int(iterations))
-        lam = float(lamb)
-        nv = _num_vertices(obj)
-        if nv > 500_000:
-            nit = max(1, iterations // 2)
-            lam = min(lam, 0.4)
-        elif nv < 50_000:
-            nit = iterations
-        smooth_trimesh_inplace(obj, method, nit, lam, nu)
+        split_done = False
+        if split_components and int(workers or 1) > 1:
+            try:
+                split_done = _smooth_components(obj, path.name)
+            except Exception as ex:
+                eprint(f"Component smoothing failed for {path.name} ({ex}); smoothing the whole mesh.")
+        if not split_done:
+            if pre_repair:
+                pre_repair_trimesh(obj, weld_tolerance=weld_tolerance)
+            if int(shards or 1) > 1 and method in ('taubin', 'laplacian') and smoothing_tolerance is None:
+                # Repair welds across the whole mesh, so it ran above; only the
+                # smoothing itself is split into spatial shards. Shards cannot
+                # check global convergence, so tolerance runs stay serial.
+                from .sharding import smooth_sharded
+                nworkers = max(1, int(workers or 1))
+                plan = _plan(obj, path.name, float(nworkers))
+                try:
+                    smooth_sharded(obj, method, plan.iterations, plan.lamb, nu, int(shards),
+                                   workers=nworkers if nworkers > 1 else None, precision=precision)
+                except Exception as ex:
+                    eprint(f"Sharded smoothing failed for {path.name} ({ex}); smoothing serially.")
+                    _smooth(obj, path.name)
+            else:
+                if int(shards or 1) > 1 and smoothing_tolerance is not None:
+                    eprint(f"--shards is ignored with a smoothing tolerance; smoothing {path.name} serially.")
+                _smooth(obj, path.name)
         # Symmetry repair removed for single meshes; analyzer will report
         # Chamfer-based symmetry metrics for human review.
 
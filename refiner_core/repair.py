@@ -1,10 +1,391 @@
 from __future__ import annotations
 
+from dataclasses import dataclass, field
+from typing import Any, Dict
+
+
+# Points queried against the weld KD-tree per batch, and the initial number
+# of neighbours requested per point (doubled for points that fill it).
+WELD_CHUNK_VERTICES = 1 << 20
+WELD_NEIGHBOURS = 8
+# Vertices with authored normals only weld when their unit normals are
+# this close (about 0.06 degrees), so hard-edge splits stay split.
+WELD_NORMAL_TOLERANCE = 1e-3
+
+
 def _imp_numpy():
     from importlib import import_module
     return import_module('numpy')
 
 
+def try_import_scipy():
+    try:
+        from scipy import sparse
+        from scipy.sparse import csgraph
+        from scipy.spatial import cKDTree
+        return sparse, csgraph, cKDTree
+    except Exception:
+        return None
+
+
+@dataclass
+class RepairResult:
+    """Output of :func:`repair_arrays`.
+
+    ``vertex_map[i]`` is the new index of input vertex ``i`` (``-1`` if it was
+    dropped), ``vertex_source[j]`` the input vertex that output vertex ``j``
+    was taken from, and ``face_index`` the input faces that were kept.
+    ``report`` counts what each step removed.
+    """
+    vertices: Any
+    faces: Any
+    vertex_map: Any
+    vertex_source: Any
+    face_index: Any
+    report: Dict[str, int] = field(default_factory=dict)
+
+
+def _group_rows(keys):
+    # Group equal rows, numbering groups by first occurrence so the output
+    # keeps the input order. Returns (first row of each group, group of each row).
+    np = _imp_numpy()
+    keys = np.asarray(keys)
+    n = len(keys)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    # lexsort is stable, so each run of equal rows starts at its first occurrence
+    order = np.lexsort(keys.T[::-1])
+    ordered = keys[order]
+    starts = np.empty(n, dtype=bool)
+    starts[0] = True
+    np.any(ordered[1:] != ordered[:-1], axis=1, out=starts[1:])
+    first = order[starts]
+    by_first = np.argsort(first, kind='stable')
+    rank = np.empty_like(by_first)
+    rank[by_first] = np.arange(len(by_first))
+    inverse = np.empty(n, dtype=np.int64)
+    inverse[order] = rank[np.cumsum(starts) - 1]
+    return first[by_first], inverse
+
+
+def _exact_keys(arr):
+    # Bit patterns of the coordinates (+0.0 folds -0.0 into 0.0)
+    np = _imp_numpy()
+    arr = np.ascontiguousarray(np.asarray(arr) + 0.0)
+    return arr.view(f'<i{arr.dtype.itemsize}').astype(np.int64)
+
+
+def _neighbour_pairs(tree, points, radius: float, chunk_size: int):
+    # All (i, j), i < j, with |points[i] - points[j]| <= radius, from k-nearest
+    # queries in fixed-size batches so memory stays bounded.
+    np = _imp_numpy()
+    n = len(points)
+    bound = float(np.nextafter(radius, np.inf))
+    rows, cols = [], []
+    for start in range(0, n, max(1, int(chunk_size))):
+        idx = np.arange(start, min(n, start + int(chunk_size)))
+        k = min(WELD_NEIGHBOURS, n)
+        while len(idx):
+            _, nb = tree.query(points[idx], k=k, distance_upper_bound=bound)
+            nb = np.asarray(nb).reshape(len(idx), k)
+            mask = (nb < n) & (nb > idx[:, None])
+            rows.append(np.repeat(idx, mask.sum(axis=1)))
+            cols.append(nb[mask])
+            # Points whose k slots are all within range may have more neighbours
+            full = nb[:, -1] < n
+            if k >= n or not np.any(full):
+                break
+            idx = idx[full]
+            k = min(2 * k, n)
+    if not rows:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    return np.concatenate(rows), np.concatenate(cols)
+
+
+def weld_vertices(vertices, tolerance: float, uv=None,
+                  chunk_size: int = WELD_CHUNK_VERTICES, normals=None):
+    """Group vertices that lie within ``tolerance`` of each other.
+
+    Returns ``(source, inverse)``: ``source[g]`` is the first input vertex of
+    group ``g`` and ``inverse[i]`` the group of vertex ``i``; groups are
+    numbered by first occurrence, so the result is deterministic. Merging is
+    transitive (a chain of vertices each within ``tolerance`` of the next is
+    one group), and with ``uv`` a pair is only merged when the UVs are also
+    within ``tolerance``. With ``normals`` a pair must also have unit normals
+    within :data:`WELD_NORMAL_TOLERANCE`, so vertices split for hard edges
+    are kept apart.
+
+    Exact duplicates are collapsed with a sort first; the remaining unique
+    positions go into a KD-tree queried in ``chunk_size`` batches, and the
+    groups are the connected components of the neighbour graph. Without
+    SciPy the weld falls back to rounding onto a ``tolerance`` grid.
+    """
+    np = _imp_numpy()
+    V = np.asarray(vertices)
+    tol = float(tolerance or 0.0)
+    if uv is not None and len(uv) != len(V):
+        uv = None
+    if normals is not None:
+        if len(normals) != len(V):
+            normals = None
+        else:
+            normals = np.asarray(normals, dtype=np.float64)
+            length = np.linalg.norm(normals, axis=1, keepdims=True)
+            normals = np.divide(normals, length, out=np.zeros_like(normals), where=length > 0)
+    scipy_mods = try_import_scipy()
+    if scipy_mods is None:
+        keys = np.round(V / tol).astype(np.int64)
+        if uv is not None:
+            keys = np.hstack([keys, np.round(np.asarray(uv) / tol).astype(np.int64)])
+        if normals is not None:
+            keys = np.hstack([keys, np.round(normals / WELD_NORMAL_TOLERANCE).astype(np.int64)])
+        return _group_rows(keys)
+    sparse, csgraph, cKDTree = scipy_mods
+
+    keys = _exact_keys(V)
+    if uv is not None:
+        keys = np.hstack([keys, _exact_keys(uv)])
+    if normals is not None:
+        keys = np.hstack([keys, _exact_keys(normals)])
+    exact_source, exact_inverse = _group_rows(keys)
+    points = np.asarray(V[exact_source], dtype=np.float64)
+    m = len(points)
+    if m < 2:
+        return exact_source, exact_inverse
+    rows, cols = _neighbour_pairs(cKDTree(points), points, tol, chunk_size)
+    if uv is not None and len(rows):
+        U = np.asarray(uv, dtype=np.float64)[exact_source]
+        close = np.einsum('ij,ij->i', U[rows] - U[cols], U[rows] - U[cols]) <= tol * tol
+        rows, cols = rows[close], cols[close]
+    if normals is not None and len(rows):
+        N = normals[exact_source]
+        close = np.einsum('ij,ij->i', N[rows] - N[cols], N[rows] - N[cols]) <= WELD_NORMAL_TOLERANCE ** 2
+        rows, cols = rows[close], cols[close]
+    if len(rows) == 0:
+        return exact_source, exact_inverse
+    graph = sparse.csr_matrix((np.ones(len(rows), dtype=np.int8), (rows, cols)), shape=(m, m))
+    _, labels = csgraph.connected_components(graph, directed=False)
+    group_first, group_of = _group_rows(labels[:, None])
+    return exact_source[group_first], group_of[exact_inverse]
+
+
+def _edge_pairs(faces):
+    # Faces sharing an edge used by exactly two faces, whether the two faces
+    # traverse that edge in opposite directions (consistent winding), and a
+    # mask of faces with an edge not shared by exactly two faces.
+    np = _imp_numpy()
+    F = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+    directed = F[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2)
+    key = np.sort(directed, axis=1)
+    n = len(key)
+    open_faces = np.zeros(len(F), dtype=bool)
+    if n == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, np.zeros(0, dtype=bool), open_faces
+    order = np.lexsort(key.T[::-1])
+    ordered = key[order]
+    starts = np.empty(n + 1, dtype=bool)
+    starts[0] = starts[n] = True
+    np.any(ordered[1:] != ordered[:-1], axis=1, out=starts[1:n])
+    run_start = np.flatnonzero(starts)
+    run_length = np.diff(run_start)
+    open_faces[order[np.repeat(run_length, run_length) != 2] // 3] = True
+    pairs = run_start[:-1][run_length == 2]
+    e1, e2 = order[pairs], order[pairs + 1]
+    consistent = directed[e1, 0] == directed[e2, 1]
+    keep = e1 // 3 != e2 // 3
+    return e1[keep] // 3, e2[keep] // 3, consistent[keep], open_faces
+
+
+def orient_faces(vertices, faces):
+    """Make face winding consistent and point closed surfaces outwards.
+
+    Array equivalent of trimesh's ``Trimesh.fix_normals``. Across every pair
+    of faces sharing a manifold edge, windings are propagated along a
+    breadth-first spanning tree of the face adjacency graph, starting from
+    the lowest face index of each connected component; each face's flip is
+    the XOR of the edge parities on its tree path, resolved for all faces
+    at once by pointer jumping. Then, as in trimesh, a watertight mesh with
+    negative volume is inverted, or, when the mesh has several vertex-
+    connected bodies, each closed and consistently wound face component of
+    at least four faces with negative volume is. Closed bodies therefore
+    come out exactly as trimesh orients them; open patches are wound
+    consistently but may face either way, since trimesh's starting face
+    there depends on set iteration order. Returns ``(faces, flipped)``,
+    where ``flipped`` marks faces whose winding changed.
+    """
+    np = _imp_numpy()
+    V = np.asarray(vertices)
+    F = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+    m = len(F)
+    flipped = np.zeros(m, dtype=bool)
+    if m == 0:
+        return F, flipped
+    scipy_mods = try_import_scipy()
+    if scipy_mods is None:
+        raise RuntimeError("SciPy is required for array-based winding repair")
+    sparse, csgraph, _ = scipy_mods
+    f1, f2, consistent, open_faces = _edge_pairs(F)
+    adjacency = sparse.csr_matrix((np.ones(len(f1), dtype=np.int8), (f1, f2)), shape=(m, m))
+    _, labels = csgraph.connected_components(adjacency, directed=False)
+
+    if not np.all(consistent):
+        # One entry per face pair; parity 1 = same orientation, 2 = flip
+        first, _ = _group_rows(np.sort(np.stack([f1, f2], axis=1), axis=1))
+        parity = np.where(consistent[first], 1, 2).astype(np.int8)
+        _, roots = np.unique(labels, return_index=True)
+        # A virtual node m joins every component root so one BFS covers all
+        rows = np.concatenate([f1[first], f2[first], np.full(len(roots), m), roots])
+        cols = np.concatenate([f2[first], f1[first], roots, np.full(len(roots), m)])
+        data = np.concatenate([parity, parity, np.ones(2 * len(roots), dtype=np.int8)])
+        graph = sparse.csr_matrix((data, (rows, cols)), shape=(m + 1, m + 1))
+        _, pred = csgraph.breadth_first_order(graph, m, directed=True, return_predecessors=True)
+        anc = pred.astype(np.int64)
+        anc[m] = m
+        acc = np.zeros(m + 1, dtype=bool)
+        acc[:m] = np.asarray(graph[anc[:m], np.arange(m)]).ravel() == 2
+        while np.any(anc != m):
+            acc ^= acc[anc]
+            anc = anc[anc]
+        flipped = acc[:m]
+        F = F.copy()
+        F[flipped] = F[flipped][:, ::-1]
+        consistent = np.where(flipped[f1] == flipped[f2], consistent, ~consistent)
+
+    a, b, c = V[F[:, 0]], V[F[:, 1]], V[F[:, 2]]
+    volume = np.einsum('ij,ij->i', a, np.cross(b, c))
+    edges = F[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2)
+    vertex_graph = sparse.csr_matrix((np.ones(len(edges), dtype=np.int8), (edges[:, 0], edges[:, 1])),
+                                     shape=(len(V), len(V)))
+    bodies, _ = csgraph.connected_components(vertex_graph, directed=False)
+    if bodies <= 1:
+        invert = np.full(m, not open_faces.any() and volume.sum() < 0.0)
+    else:
+        count = labels.max() + 1
+        size = np.bincount(labels, minlength=count)
+        untight = np.bincount(labels, weights=open_faces, minlength=count) > 0
+        unwound = np.bincount(labels[f1], weights=~consistent, minlength=count) > 0
+        negative = np.bincount(labels, weights=volume, minlength=count) < 0.0
+        invert = ((size >= 4) & ~untight & ~unwound & negative)[labels]
+    if invert.any():
+        F = F.copy() if not flipped.any() else F
+        F[invert] = F[invert][:, ::-1]
+        flipped = flipped ^ invert
+    return F, flipped
+
+
+def vertex_normals(vertices, faces):
+    """Area-weighted unit vertex normals (zero for unreferenced vertices)."""
+    np = _imp_numpy()
+    V = np.asarray(vertices, dtype=np.float64)
+    F = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+    cross = np.cross(V[F[:, 1]] - V[F[:, 0]], V[F[:, 2]] - V[F[:, 0]])
+    normals = np.zeros((len(V), 3), dtype=np.float64)
+    corners = F.ravel()
+    for k in range(3):
+        normals[:, k] = np.bincount(corners, weights=np.repeat(cross[:, k], 3), minlength=len(V))
+    length = np.linalg.norm(normals, axis=1)
+    nonzero = length > 0
+    normals[nonzero] /= length[nonzero, None]
+    return normals
+
+
+def degenerate_faces(vertices, faces, tolerance: float = 0.0):
+    """Mask of faces with a repeated vertex index or a height of at most ``tolerance``.
+
+    The height is twice the area over the longest edge, so slivers count as
+    degenerate as well as zero-area faces.
+    """
+    np = _imp_numpy()
+    V = np.asarray(vertices, dtype=np.float64)
+    F = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+    degenerate = (F[:, 0] == F[:, 1]) | (F[:, 1] == F[:, 2]) | (F[:, 2] == F[:, 0])
+    if len(F):
+        a, b, c = V[F[:, 0]], V[F[:, 1]], V[F[:, 2]]
+        double_area = np.linalg.norm(np.cross(b - a, c - a), axis=1)
+        longest = np.sqrt(np.max(np.stack([
+            np.einsum('ij,ij->i', b - a, b - a),
+            np.einsum('ij,ij->i', c - b, c - b),
+            np.einsum('ij,ij->i', a - c, a - c),
+        ]), axis=0))
+        degenerate |= double_area <= float(tolerance) * longest
+    return degenerate
+
+
+def repair_arrays(vertices, faces, weld_tolerance: float = 1e-5, uv=None, normals=None) -> RepairResult:
+    """Weld, drop degenerate and duplicate faces and compact vertices in one pass.
+
+    Vertices within ``weld_tolerance`` of each other are welded (see
+    :func:`weld_vertices`; with ``uv`` or ``normals`` only when those match
+    too, so texture seams and hard edges stay split). Faces that reference a welded vertex twice or are thinner than
+    ``weld_tolerance`` are degenerate; faces over the same three vertices
+    are duplicates and only the first is kept. Vertices no face references
+    afterwards are removed. All steps work on flat arrays with sort/unique.
+    """
+    np = _imp_numpy()
+    V = np.asarray(vertices)
+    F = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+    nv = len(V)
+    tol = float(weld_tolerance or 0.0)
+
+    # Weld
+    if tol > 0.0 and nv > 0:
+        weld_source, weld_map = weld_vertices(V, tol, uv=uv, normals=normals)
+    else:
+        weld_source = np.arange(nv)
+        weld_map = np.arange(nv)
+    Fw = weld_map[F]
+
+    # Degenerate: repeated corner after welding or height below tolerance
+    degenerate = degenerate_faces(V[weld_source], Fw, tol)
+    kept = np.flatnonzero(~degenerate)
+
+    # Duplicates: same vertex set regardless of winding
+    if len(kept):
+        first, _ = _group_rows(np.sort(Fw[kept], axis=1))
+        face_index = kept[first]
+    else:
+        face_index = kept
+
+    # Compact unreferenced vertices
+    used = np.zeros(len(weld_source), dtype=bool)
+    used[Fw[face_index].ravel()] = True
+    new_id = np.cumsum(used) - 1
+    new_id[~used] = -1
+    vertex_source = weld_source[used]
+
+    report = {
+        'welded': int(nv - len(weld_source)),
+        'degenerate': int(degenerate.sum()),
+        'duplicate': int(len(kept) - len(face_index)),
+        'unreferenced': int((~used).sum()),
+    }
+    return RepairResult(
+        vertices=V[vertex_source],
+        faces=new_id[Fw[face_index]],
+        vertex_map=new_id[weld_map],
+        vertex_source=vertex_source,
+        face_index=face_index,
+        report=report,
+    )
+
+
+def authored_vertex_normals(mesh):
+    """Vertex normals ``mesh`` was built with, or ``None`` if it has none.
+
+    trimesh keeps normals passed in (e.g. OBJ ``vn``) in its cache; once
+    read, computed normals land there too, so this is only reliable before
+    anything has asked the mesh for ``vertex_normals``.
+    """
+    try:
+        cache = getattr(mesh, '_cache', None)
+        if cache is not None and 'vertex_normals' in cache:
+            return mesh.vertex_normals
+    except Exception:
+        pass
+    return None
+
+
 def pre_repair_trimesh(mesh, weld_tolerance: float = 1e-5):
     np = _imp_numpy()
     # Ensure arrays are contiguous and proper dtypes
@@ -15,32 +396,40 @@ def pre_repair_trimesh(mesh, weld_tolerance: float = 1e-5):
             mesh.faces = np.ascontiguousarray(np.asarray(mesh.faces, dtype=np.int64))
     except Exception:
         pass
-    # Remove degenerate/duplicate and unreferenced
+    # Weld, remove degenerate/duplicate faces and unreferenced vertices in one
+    # pass; trimesh's update_* keep UVs, colours and face attributes aligned.
     try:
-        if hasattr(mesh, 'remove_degenerate_faces'):
-            mesh.remove_degenerate_faces()
+        uv = None
+        visual = getattr(mesh, 'visual', None)
+        if getattr(visual, 'kind', None) == 'texture' and getattr(visual, 'uv', None) is not None:
+            uv = visual.uv
+        result = repair_arrays(mesh.vertices, mesh.faces, weld_tolerance=weld_tolerance, uv=uv,
+                               normals=authored_vertex_normals(mesh))
+        if result.report['degenerate'] or result.report['duplicate']:
+            mesh.update_faces(result.face_index)
+        if result.report['welded'] or result.report['unreferenced']:
+            mesh.update_vertices(result.vertex_source, inverse=result.vertex_map)
     except Exception:
         pass
+    # Fix winding/inversion
     try:
-        if hasattr(mesh, 'remove_duplicate_faces'):
-            mesh.remove_duplicate_faces()
+        fix_normals_trimesh(mesh)
     except Exception:
         pass
+    return mesh
+
+
+def fix_normals_trimesh(mesh) -> None:
+    """Array-based replacement for ``mesh.fix_normals()``; falls back to trimesh on failure.
+
+    Only face winding is changed. Vertex normals are left to trimesh, so
+    authored normals survive when nothing is flipped and are otherwise
+    recomputed lazily on first use.
+    """
     try:
-        if hasattr(mesh, 'remove_unreferenced_vertices'):
-            mesh.remove_unreferenced_vertices()
-    except Exception:
-        pass
-    # Weld close vertices
-    try:
-        if hasattr(mesh, 'merge_vertices'):
-            mesh.merge_vertices(epsilon=weld_tolerance)
+        faces, flipped = orient_faces(mesh.vertices, mesh.faces)
+        if flipped.any():
+            mesh.faces = faces
     except Exception:
-        pass
-    # Recompute normals if available
-    try:
         if hasattr(mesh, 'fix_normals'):
             mesh.fix_normals()
-    except Exception:
-        pass
-    return mesh
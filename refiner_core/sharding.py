@@ -0,0 +1,122 @@
+"""Spatially sharded parallel smoothing of a single large mesh.
+
+The vertices are ordered along a Morton curve (a depth-first octree walk)
+and cut into ``K`` equal-size shards. Each shard is grown by one face ring per
+smoothing iteration, smoothed independently in a worker process, and only its
+core vertices are written back. Because an explicit iteration reads nothing
+beyond a vertex's one-ring, the stitched result is identical to a serial run:
+there are no seams to blend.
+
+The whole mesh, the vertex->face incidence table and the output buffer are
+placed in shared memory once (see :mod:`refiner_core.shared_arrays`); workers
+receive only handles plus their shard range and write disjoint rows of the
+shared output directly.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Optional
+
+
+def _imp_numpy():
+    from importlib import import_module
+    return import_module('numpy')
+
+
+def vertex_face_csr(faces, num_vertices: int):
+    """In-memory vertex->face incidence as ``(indptr, indices)`` arrays."""
+    np = _imp_numpy()
+    flat = np.asarray(faces, dtype=np.int64).ravel()
+    order = np.argsort(flat, kind='stable')
+    indices = order // 3
+    counts = np.bincount(flat, minlength=int(num_vertices))
+    indptr = np.zeros(int(num_vertices) + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+    return indptr, indices
+
+
+def shard_ranges(num_vertices: int, shards: int):
+    """Split ``range(num_vertices)`` into ``shards`` near-equal ``(start, stop)`` pairs."""
+    edges = [round(i * num_vertices / shards) for i in range(shards + 1)]
+    return [(edges[i], edges[i + 1]) for i in range(shards) if edges[i + 1] > edges[i]]
+
+
+def _smooth_shard(task: tuple) -> Optional[str]:
+    # Worker entry point: attach the shared mesh, smooth one shard's halo
+    # submesh and write the core rows into the shared output.
+    from .outofcore import halo_submesh
+    from .shared_arrays import attached_arrays
+    from .smoothing import smooth_vertices
+    packed, start, stop, method, iterations, lamb, nu, precision = task
+    try:
+        with attached_arrays(packed) as arrays:
+            core = arrays['order'][start:stop]
+            vset, local_faces, core_local = halo_submesh(core, arrays['faces'], arrays['indptr'],
+                                                         arrays['indices'], iterations)
+            if len(local_faces) == 0:
+                return None
+            smoothed, _ = smooth_vertices(arrays['vertices'][vset], local_faces, method, iterations,
+                                          lamb, nu, volume_constraint=False, precision=precision)
+            arrays['out'][vset[core_local]] = smoothed[core_local]
+            del smoothed, vset, local_faces, core_local, core
+        return None
+    except Exception as ex:
+        return f"{type(ex).__name__}: {ex}"
+
+
+def smooth_sharded(mesh, method: str, iterations: int, lamb: float, nu: float,
+                   shards: int, workers: Optional[int] = None, precision: str = 'double') -> int:
+    """Smooth ``mesh`` in place using ``shards`` spatial shards in a process pool.
+
+    Only explicit ``taubin``/``laplacian`` smoothing can be sharded. Shards
+    run without the Laplacian volume constraint; it is global, so the
+    stitched result gets one rescale about the centre of mass instead,
+    matching the serial engine. Returns the
+    number of iterations run. Raises ``RuntimeError`` if any shard fails, so
+    the caller can fall back to serial smoothing with the mesh untouched.
+    With ``precision='single'`` the shared vertex and face buffers are
+    float32/int32.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from .outofcore import morton_codes
+    from .shared_arrays import SharedArrayStore, attached_arrays
+    from .smoothing import _signed_volume, precision_dtypes, rescale_to_volume
+    np = _imp_numpy()
+    if method not in ('taubin', 'laplacian'):
+        raise ValueError(f"Sharded smoothing supports taubin/laplacian, got {method}")
+    float_dtype, index_dtype = precision_dtypes(precision)
+    vertices = np.ascontiguousarray(np.asarray(mesh.vertices, dtype=float_dtype))
+    faces = np.ascontiguousarray(np.asarray(mesh.faces, dtype=index_dtype))
+    nit = max(0, int(iterations))
+    if nit == 0 or len(vertices) == 0 or len(faces) == 0:
+        return 0
+    vol_ini, center_mass = 0.0, None
+    if method == 'laplacian':
+        vol_ini = _signed_volume(vertices, faces)
+        try:
+            center_mass = np.asarray(mesh.center_mass, dtype=np.float64)
+        except Exception:
+            center_mass = vertices.mean(axis=0, dtype=np.float64)
+    codes = morton_codes(vertices, vertices.min(axis=0), vertices.max(axis=0), grid_bits=10)
+    order = np.argsort(codes, kind='stable')
+    indptr, indices = vertex_face_csr(faces, len(vertices))
+    ranges = shard_ranges(len(vertices), max(1, int(shards)))
+    nworkers = max(1, min(len(ranges), int(workers or os.cpu_count() or 1)))
+    with SharedArrayStore(min_bytes=0) as store:
+        packed = store.pack({
+            'vertices': vertices, 'faces': faces, 'order': order,
+            'indptr': indptr, 'indices': indices, 'out': vertices,
+        })
+        del codes, order, indptr, indices
+        tasks = [(packed, a, b, method, nit, float(lamb), float(nu), precision) for a, b in ranges]
+        with ProcessPoolExecutor(max_workers=nworkers) as pool:
+            errors = [e for e in pool.map(_smooth_shard, tasks) if e is not None]
+        if errors:
+            raise RuntimeError(f"{len(errors)} shard(s) failed: {errors[0]}")
+        with attached_arrays({'out': packed['out']}) as arrays:
+            result = np.array(arrays['out'], copy=True)
+    if method == 'laplacian':
+        rescale_to_volume(result, faces, vol_ini, center_mass.astype(result.dtype))
+    mesh.vertices = result
+    return nit
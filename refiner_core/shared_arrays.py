@@ -0,0 +1,197 @@
+"""Pickle-free transport of mesh arrays between processes.
+
+Large NumPy arrays (vertices, faces, UVs) are copied once into
+``multiprocessing.shared_memory`` blocks and only small :class:`SharedArray`
+handles are pickled to worker processes, which map the same memory and read
+their inputs in place. Results travel the same way: one copy into a block by
+the worker and one copy out by the receiver, instead of pickling through a
+pipe. Arrays below ``SHARE_MIN_BYTES`` are cheaper to pickle than to map and
+are passed through unchanged.
+
+Ownership rules:
+
+- the process that packs arrays with a :class:`SharedArrayStore` owns those
+  blocks and unlinks them when the store is closed;
+- a worker returning results calls :func:`export_arrays`, and the receiving
+  process takes ownership with :func:`unpack_arrays`, which copies the data
+  out and unlinks the blocks.
+
+On Windows a block disappears as soon as its creator closes it, so workers
+there return results by pickling instead.
+"""
+
+from __future__ import annotations
+
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Tuple
+
+SHARE_MIN_BYTES = 1 << 20
+
+
+def _imp_numpy():
+    from importlib import import_module
+    return import_module('numpy')
+
+
+def _imp_shared_memory():
+    from multiprocessing import shared_memory
+    return shared_memory
+
+
+@dataclass(frozen=True)
+class SharedArray:
+    """Picklable handle to an array stored in a shared memory block."""
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+
+    @property
+    def nbytes(self) -> int:
+        np = _imp_numpy()
+        return int(np.prod(self.shape, dtype=np.int64)) * np.dtype(self.dtype).itemsize
+
+
+def _create_block(arr) -> Tuple[Any, SharedArray]:
+    np = _imp_numpy()
+    shared_memory = _imp_shared_memory()
+    arr = np.ascontiguousarray(arr)
+    shm = shared_memory.SharedMemory(create=True, size=max(1, int(arr.nbytes)))
+    view = np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)
+    view[...] = arr
+    del view
+    return shm, SharedArray(name=shm.name, shape=tuple(arr.shape), dtype=arr.dtype.str)
+
+
+def _view(shm, handle: SharedArray):
+    np = _imp_numpy()
+    return np.ndarray(handle.shape, dtype=np.dtype(handle.dtype), buffer=shm.buf)
+
+
+def _close_quietly(shm) -> None:
+    try:
+        shm.close()
+    except BufferError:
+        # A view is still referenced; the mapping is released when it is collected
+        pass
+
+
+class SharedArrayStore:
+    """Owner of shared blocks created in this process.
+
+    :meth:`share` and :meth:`pack` copy each array into a new block once.
+    """
+
+    def __init__(self, min_bytes: int = SHARE_MIN_BYTES):
+        self.min_bytes = int(min_bytes)
+        self._blocks: Dict[str, Any] = {}
+
+    def share(self, arr) -> SharedArray:
+        shm, handle = _create_block(arr)
+        self._blocks[handle.name] = shm
+        return handle
+
+    def pack(self, arrays: Dict[str, Any]) -> Dict[str, Any]:
+        """Replace every array of at least ``min_bytes`` with a shared handle."""
+        np = _imp_numpy()
+        packed: Dict[str, Any] = {}
+        for key, value in arrays.items():
+            if isinstance(value, np.ndarray) and value.nbytes >= self.min_bytes:
+                packed[key] = self.share(value)
+            else:
+                packed[key] = value
+        return packed
+
+    def close(self) -> None:
+        for shm in self._blocks.values():
+            _close_quietly(shm)
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+        self._blocks.clear()
+
+    def __enter__(self) -> 'SharedArrayStore':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+@contextmanager
+def attached_arrays(packed: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Map the shared handles in ``packed`` and yield a dict of array views.
+
+    Views are only valid inside the ``with`` block; callers must not keep
+    references to them (copy anything that has to outlive the block).
+    """
+    shared_memory = _imp_shared_memory()
+    opened = []
+    views: Dict[str, Any] = {}
+    try:
+        for key, value in packed.items():
+            if isinstance(value, SharedArray):
+                shm = shared_memory.SharedMemory(name=value.name)
+                opened.append(shm)
+                views[key] = _view(shm, value)
+            else:
+                views[key] = value
+        yield views
+    finally:
+        views.clear()
+        for shm in opened:
+            _close_quietly(shm)
+
+
+def export_arrays(arrays: Dict[str, Any], min_bytes: int = SHARE_MIN_BYTES) -> Dict[str, Any]:
+    """Move large result arrays into new shared blocks owned by the receiver."""
+    np = _imp_numpy()
+    if os.name == 'nt':
+        return dict(arrays)
+    out: Dict[str, Any] = {}
+    for key, value in arrays.items():
+        if isinstance(value, np.ndarray) and value.nbytes >= min_bytes:
+            shm, handle = _create_block(value)
+            _close_quietly(shm)
+            out[key] = handle
+        else:
+            out[key] = value
+    return out
+
+
+def unpack_arrays(packed: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy shared handles in ``packed`` into private arrays and unlink the blocks."""
+    np = _imp_numpy()
+    shared_memory = _imp_shared_memory()
+    out: Dict[str, Any] = {}
+    for key, value in packed.items():
+        if isinstance(value, SharedArray):
+            shm = shared_memory.SharedMemory(name=value.name)
+            try:
+                out[key] = np.array(_view(shm, value), copy=True)
+            finally:
+                _close_quietly(shm)
+                try:
+                    shm.unlink()
+                except FileNotFoundError:
+                    pass
+        else:
+            out[key] = value
+    return out
+
+
+def release_packed(packed: Dict[str, Any]) -> None:
+    """Unlink any shared blocks referenced by ``packed`` without reading them."""
+    shared_memory = _imp_shared_memory()
+    for value in packed.values():
+        if isinstance(value, SharedArray):
+            try:
+                shm = shared_memory.SharedMemory(name=value.name)
+            except FileNotFoundError:
+                continue
+            _close_quietly(shm)
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                pass
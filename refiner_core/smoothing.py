@@ -1,4 +1,7 @@
+from typing import Optional, Tuple
+
 import numpy as np
+from .operator_cache import default_cache, topology_key
 from .utils import eprint
 
 
@@ -16,18 +19,248 @@ def try_import_open3d():
         return None
 
 
-def smooth_trimesh_inplace(mesh, method: str, iterations: int, lamb: float, nu: float):
-    trimesh, tmsmooth = try_import_trimesh()
+def try_import_scipy_sparse():
+    try:
+        from scipy import sparse
+        return sparse
+    except Exception:
+        return None
 
-    def _safe_len(a) -> int:
-        try:
-            return int(a.shape[0]) if hasattr(a, 'shape') else len(a)
-        except Exception:
+
+# Above this vertex count implicit smoothing switches from a sparse LU
+# factorization to conjugate gradients to bound memory.
+IMPLICIT_DIRECT_MAX_VERTICES = 500_000
+
+SMOOTHING_METHODS = ('taubin', 'laplacian', 'implicit')
+
+# Working precision of the sparse engine: ``single`` halves the memory and
+# bandwidth of vertex buffers, operators and cached factorizations.
+PRECISIONS = {
+    'double': (np.float64, np.int64),
+    'single': (np.float32, np.int32),
+}
+
+
+def precision_dtypes(precision: str):
+    """Return the ``(float dtype, index dtype)`` pair for a precision name."""
+    try:
+        return PRECISIONS[precision]
+    except KeyError:
+        raise ValueError(f"Unknown precision: {precision}") from None
+
+
+def build_laplacian_operator(faces, num_vertices: int, dtype=np.float64):
+    """Build the uniform-weight neighbour-averaging operator ``W`` as CSR.
+
+    ``W[i, j] = 1 / deg(i)`` for every undirected edge ``(i, j)``, so ``W @ V``
+    replaces each vertex by the mean of its one-ring. Vertices that are not
+    referenced by any face get an identity row and therefore never move.
+    The operator values are stored as ``dtype``.
+    """
+    sparse = try_import_scipy_sparse()
+    if sparse is None:
+        raise RuntimeError("SciPy is required for the sparse smoothing engine")
+    n = int(num_vertices)
+    faces = np.asarray(faces)
+    if faces.dtype.kind not in 'iu':
+        faces = faces.astype(np.int64)
+    faces = faces.reshape(-1, 3)
+    edges = faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2)
+    edges = edges[edges[:, 0] != edges[:, 1]]
+    rows = np.concatenate([edges[:, 0], edges[:, 1]])
+    cols = np.concatenate([edges[:, 1], edges[:, 0]])
+    adj = sparse.csr_matrix((np.ones(len(rows), dtype=dtype), (rows, cols)), shape=(n, n))
+    # Duplicate (shared) edges were summed during conversion; collapse to 0/1
+    adj.data[:] = 1.0
+    deg = np.diff(adj.indptr)
+    isolated = deg == 0
+    if np.any(isolated):
+        adj = (adj + sparse.diags(isolated.astype(dtype), format='csr')).tocsr()
+        deg = np.diff(adj.indptr)
+    adj.data /= np.repeat(deg, deg).astype(dtype)
+    return adj
+
+
+def _step_operator(W, factor: float):
+    """Return ``(1 - factor) * I + factor * W`` so one smoothing step is a single mat-vec."""
+    sparse = try_import_scipy_sparse()
+    n = W.shape[0]
+    return (W * float(factor) + sparse.identity(n, dtype=W.dtype, format='csr') * (1.0 - float(factor))).tocsr()
+
+
+class ImplicitSolver:
+    """Solver for one backward-Euler smoothing step ``(I + t L) x = x0``.
+
+    With ``L = I - W`` and ``W = D^-1 A`` the system is scaled by ``D`` into the
+    symmetric positive-definite form ``((1 + t) D - t A) x = D x0``. Small and
+    mid-size systems are factorized once with SuperLU; larger ones use
+    Jacobi-preconditioned conjugate gradients so memory stays linear. The
+    system is assembled in the dtype of ``W``; single-precision CG uses a
+    looser relative tolerance that float32 can actually reach.
+    """
+
+    def __init__(self, W, t: float, solver: str = 'auto'):
+        sparse = try_import_scipy_sparse()
+        from scipy.sparse import linalg as splinalg
+        self._splinalg = splinalg
+        n = W.shape[0]
+        self.deg = np.diff(W.indptr).astype(W.dtype)
+        self.rtol = 1e-8 if W.dtype == np.float64 else 1e-5
+        A = sparse.diags(self.deg, format='csr') @ W
+        self.matrix = (sparse.diags(self.deg * (1.0 + float(t)), format='csr') - A * float(t)).tocsc()
+        if solver == 'auto':
+            solver = 'direct' if n <= IMPLICIT_DIRECT_MAX_VERTICES else 'cg'
+        if solver not in ('direct', 'cg'):
+            raise ValueError(f"Unknown implicit solver: {solver}")
+        self.solver = solver
+        self.lu = splinalg.splu(self.matrix) if solver == 'direct' else None
+
+    def solve(self, x0: np.ndarray) -> np.ndarray:
+        rhs = x0 * self.deg[:, None]
+        if self.lu is not None:
+            return np.ascontiguousarray(self.lu.solve(rhs))
+        precond = self._splinalg.LinearOperator(self.matrix.shape, matvec=lambda b: b / self.deg,
+                                                dtype=self.deg.dtype)
+        out = np.empty_like(x0)
+        for k in range(x0.shape[1]):
             try:
-                return int(np.asarray(a).shape[0])
-            except Exception:
-                return 0
+                x, info = self._splinalg.cg(self.matrix, rhs[:, k], x0=x0[:, k], rtol=self.rtol, M=precond)
+            except TypeError:  # SciPy < 1.12
+                x, info = self._splinalg.cg(self.matrix, rhs[:, k], x0=x0[:, k], tol=self.rtol, M=precond)
+            if info != 0:
+                eprint(f"Implicit smoothing CG did not converge (info={info})")
+            out[:, k] = x
+        return out
+
+
+def _signed_volume(vertices: np.ndarray, faces: np.ndarray) -> float:
+    a = vertices[faces[:, 0]]
+    b = vertices[faces[:, 1]]
+    c = vertices[faces[:, 2]]
+    return float(np.einsum('ij,ij->', a, np.cross(b, c), dtype=np.float64) / 6.0)
+
+
+def rescale_to_volume(vertices: np.ndarray, faces: np.ndarray, volume: float, center_mass) -> np.ndarray:
+    """Scale ``vertices`` in place about ``center_mass`` so their signed volume is ``volume``.
+
+    A uniform scale about a fixed point commutes with a row-stochastic
+    smoothing step, so one rescale after ``n`` unconstrained Laplacian steps
+    matches restoring the volume after every step.
+    """
+    if abs(volume) > 0.0:
+        vol_new = _signed_volume(vertices, faces)
+        if vol_new != 0.0 and (volume / vol_new) > 0.0:
+            scale = (volume / vol_new) ** (1.0 / 3.0)
+            vertices -= center_mass
+            vertices *= scale
+            vertices += center_mass
+    return vertices
+
+
+def smooth_vertices(vertices, faces, method: str, iterations: int, lamb: float, nu: float,
+                    operator=None, volume_constraint: bool = True,
+                    center_mass=None, cache=None,
+                    tolerance: Optional[float] = None,
+                    precision: str = 'double') -> Tuple[np.ndarray, int]:
+    """Smooth a vertex array with the sparse operator engine.
+
+    Returns the smoothed ``(N, 3)`` array and the number of iterations that
+    actually ran (``1`` for a single implicit solve).
 
+    Each explicit iteration is one sparse mat-vec on a contiguous ``(N, 3)``
+    buffer. ``taubin`` alternates a ``lamb`` shrink step with an inflate step of
+    magnitude ``|nu|`` (Taubin's negative-mu and trimesh's positive-nu sign
+    conventions are both accepted). ``laplacian`` repeats the ``lamb`` step and,
+    like trimesh, restores the initial volume after every pass when
+    ``volume_constraint`` is set. ``implicit`` replaces the explicit loop with
+    a single backward-Euler solve of time step ``lamb * iterations``, which is
+    unconditionally stable, and applies the same volume constraint.
+
+    When ``cache`` (an :class:`~refiner_core.operator_cache.OperatorCache`) is
+    given, the Laplacian, the per-step operators and the implicit factorization
+    are looked up by face-array hash and parameters before being built.
+
+    When ``tolerance`` is set, explicit methods stop early once the RMS vertex
+    displacement of an iteration (a full shrink/inflate pair for ``taubin``)
+    falls below ``tolerance`` times the bounding-box diagonal.
+
+    ``precision`` (``'double'`` or ``'single'``) selects the dtype of the
+    vertex buffer, index array and operators; the inputs are converted once
+    on entry and the result is returned in that dtype.
+    """
+    float_dtype, index_dtype = precision_dtypes(precision)
+    V = np.ascontiguousarray(np.asarray(vertices, dtype=float_dtype))
+    F = np.asarray(faces, dtype=index_dtype).reshape(-1, 3)
+    n = len(V)
+    topo = topology_key(F, n) if cache is not None else None
+
+    def _get(name, builder):
+        if cache is None:
+            return builder()
+        return cache.get_or_build((topo, precision) + name, builder)
+
+    if operator is None:
+        operator = _get(('laplacian',), lambda: build_laplacian_operator(F, n, dtype=float_dtype))
+    nit = max(0, int(iterations))
+    ran = nit
+    threshold = None
+    if tolerance is not None and tolerance > 0 and n > 0:
+        diag = float(np.linalg.norm(V.max(axis=0) - V.min(axis=0)))
+        threshold = float(tolerance) * diag if diag > 0 else None
+
+    def _converged(new, old) -> bool:
+        rms = float(np.sqrt(np.einsum('ij,ij->', new - old, new - old) / max(n, 1)))
+        return rms < threshold
+
+    if method == 'taubin':
+        lam, mu = float(lamb), -abs(float(nu))
+        steps = (_get(('step', lam), lambda: _step_operator(operator, lam)),
+                 _get(('step', mu), lambda: _step_operator(operator, mu)))
+        pair_start = V
+        for i in range(nit):
+            V = steps[i % 2] @ V
+            if threshold is not None and i % 2 == 1:
+                if _converged(V, pair_start):
+                    ran = i + 1
+                    break
+                pair_start = V
+    elif method in ('laplacian', 'implicit'):
+        vol_ini = _signed_volume(V, F) if volume_constraint else 0.0
+        if volume_constraint and abs(vol_ini) > 0.0 and center_mass is None:
+            center_mass = V.mean(axis=0)
+
+        def _restore_volume(X):
+            if volume_constraint:
+                rescale_to_volume(X, F, vol_ini, center_mass)
+            return X
+
+        if method == 'laplacian':
+            lam = float(lamb)
+            step = _get(('step', lam), lambda: _step_operator(operator, lam))
+            for i in range(nit):
+                prev = V
+                V = _restore_volume(step @ V)
+                if threshold is not None and _converged(V, prev):
+                    ran = i + 1
+                    break
+        elif nit > 0:
+            t = float(lamb) * nit
+            solver = _get(('implicit', t), lambda: ImplicitSolver(operator, t))
+            V = _restore_volume(solver.solve(V))
+            ran = 1
+    else:
+        raise ValueError(f"Unknown method: {method}")
+    return V, ran
+
+
+def normalize_mesh_arrays(mesh, precision: str = 'double') -> None:
+    """Make ``mesh.vertices``/``mesh.faces`` contiguous float64/int64 arrays.
+
+    Skipped for ``precision='single'``: the engine converts straight to
+    float32/int32 once, so a float64 pass first would only add a copy.
+    """
+    if precision == 'single':
+        return
     try:
         if getattr(mesh, 'vertices', None) is not None:
             mesh.vertices = np.ascontiguousarray(np.asarray(mesh.vertices, dtype=np.float64))
@@ -36,21 +269,76 @@ def smooth_trimesh_inplace(mesh, method: str, iterations: int, lamb: float, nu:
     except Exception:
         pass
 
+
+def _smooth_with_sparse_engine(mesh, method: str, iterations: int, lamb: float, nu: float,
+                               tolerance: Optional[float] = None,
+                               precision: str = 'double') -> Optional[int]:
+    if method not in SMOOTHING_METHODS or try_import_scipy_sparse() is None:
+        return None
+    center_mass = None
+    if method in ('laplacian', 'implicit'):
+        try:
+            center_mass = np.asarray(mesh.center_mass, dtype=np.float64)
+        except Exception:
+            center_mass = None
+    new_vertices, ran = smooth_vertices(mesh.vertices, mesh.faces, method, iterations, lamb, nu,
+                                        center_mass=center_mass, cache=default_cache,
+                                        tolerance=tolerance, precision=precision)
+    if not np.all(np.isfinite(new_vertices)):
+        raise FloatingPointError("non-finite vertices after sparse smoothing")
+    mesh.vertices = new_vertices
+    return ran
+
+
+def smooth_trimesh_inplace(mesh, method: str, iterations: int, lamb: float, nu: float,
+                           tolerance: Optional[float] = None, precision: str = 'double') -> int:
+    """Smooth ``mesh`` in place and return the number of iterations that ran.
+
+    ``tolerance`` enables convergence-based early stopping and ``precision``
+    selects the sparse engine's working dtype (see :func:`smooth_vertices`);
+    the trimesh/Open3D fallbacks always run the full ``iterations`` count in
+    double precision. A ``Trimesh`` always stores float64/int64 arrays, so
+    in process single precision only shrinks the engine's working buffer and
+    operators; the worker and shared-memory paths also halve what is copied.
+    """
+    def _safe_len(a) -> int:
+        try:
+            return int(a.shape[0]) if hasattr(a, 'shape') else len(a)
+        except Exception:
+            try:
+                return int(np.asarray(a).shape[0])
+            except Exception:
+                return 0
+
+    normalize_mesh_arrays(mesh, precision)
+
     if mesh.vertices is None or _safe_len(mesh.vertices) == 0 or mesh.faces is None or _safe_len(mesh.faces) == 0:
-        return
+        return 0
 
+    try:
+        ran = _smooth_with_sparse_engine(mesh, method, iterations, lamb, nu, tolerance=tolerance,
+                                         precision=precision)
+        if ran is not None:
+            return ran
+    except Exception as ex:
+        eprint(f"Sparse smoothing engine failed, falling back to trimesh: {ex}")
+
+    trimesh, tmsmooth = try_import_trimesh()
     try:
         if method == 'taubin':
             tmsmooth.filter_taubin(mesh, lamb=lamb, nu=nu, iterations=iterations)
         elif method == 'laplacian':
             tmsmooth.filter_laplacian(mesh, lamb=lamb, iterations=iterations)
+        elif method == 'implicit':
+            tmsmooth.filter_laplacian(mesh, lamb=float(lamb) * max(1, int(iterations)), iterations=1,
+                                      implicit_time_integration=True)
         else:
             raise ValueError(f"Unknown method: {method}")
     except Exception as ex:
         o3d = try_import_open3d()
         if o3d is None:
             eprint(f"Trimesh smoothing failed and Open3D not available: {ex}")
-            return
+            return 0
         try:
             o3d_mesh = o3d.geometry.TriangleMesh(
                 o3d.utility.Vector3dVector(np.asarray(mesh.vertices, dtype=np.float64)),
@@ -70,3 +358,5 @@ def smooth_trimesh_inplace(mesh, method: str, iterations: int, lamb: float, nu:
                 mesh.update_vertices(mask=None)
         except Exception as ex2:
             eprint(f"Open3D smoothing fallback failed: {ex2}")
+            return 0
+    return 1 if method == 'implicit' else int(iterations)
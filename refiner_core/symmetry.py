@@ -1,7 +1,21 @@
+from dataclasses import dataclass
 from typing import Optional, Tuple
 import numpy as np
 from .utils import eprint
 
+# Arbitrary-plane detection: vertices scored per candidate plane, random
+# point pairs voting for bisector planes, candidates kept from the vote, and
+# ICP refinement passes for the best plane.
+SYMMETRY_SAMPLE_POINTS = 2048
+SYMMETRY_TREE_POINTS = 65_536
+SYMMETRY_VOTE_PAIRS = 20_000
+SYMMETRY_VOTE_CANDIDATES = 8
+SYMMETRY_ICP_ITERATIONS = 10
+SYMMETRY_REFINED_CANDIDATES = 3
+# Nearest-neighbour distances are capped at this fraction of the bbox
+# diagonal; it bounds KD-tree search for badly mirrored points.
+SYMMETRY_DISTANCE_CAP = 0.1
+
 
 def try_import_trimesh():
     import trimesh
@@ -96,7 +110,8 @@ def symmetry_repair_trimesh_inplace(mesh, axis: Optional[str] = None, prefer: st
         pass
     try:
         if hasattr(mesh, 'fix_normals'):
-            mesh.fix_normals()
+            from .repair import fix_normals_trimesh
+            fix_normals_trimesh(mesh)
         else:
             import numpy as np
             mask = np.ones(len(mesh.vertices), dtype=bool)
@@ -105,3 +120,160 @@ def symmetry_repair_trimesh_inplace(mesh, axis: Optional[str] = None, prefer: st
     except Exception:
         pass
     return True
+
+
+@dataclass
+class SymmetryPlane:
+    """Mirror plane ``{x : normal . x = offset}`` and its Chamfer score."""
+    normal: np.ndarray
+    offset: float
+    chamfer: float
+
+
+def try_import_ckdtree():
+    try:
+        from scipy.spatial import cKDTree
+        return cKDTree
+    except Exception:
+        return None
+
+
+def reflect_points(points: np.ndarray, normal: np.ndarray, offset: float) -> np.ndarray:
+    """Mirror ``points`` across the plane ``normal . x = offset``."""
+    return points - 2.0 * (points @ normal - offset)[:, None] * normal
+
+
+def _canonical_planes(normals: np.ndarray, offsets: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # (n, d) and (-n, -d) are the same plane; make the largest component positive
+    sign = np.sign(normals[np.arange(len(normals)), np.argmax(np.abs(normals), axis=1)])
+    sign[sign == 0] = 1.0
+    return normals * sign[:, None], offsets * sign
+
+
+def _vote_planes(points: np.ndarray, center: np.ndarray, scale: float, rng,
+                 pairs: int, keep: int) -> Tuple[np.ndarray, np.ndarray]:
+    # Bisector planes of random point pairs that are about equally far from
+    # the centroid (mirror images are); the most popular bins are candidates.
+    n = len(points)
+    if n < 2 or keep <= 0:
+        return np.zeros((0, 3)), np.zeros(0)
+    i = rng.integers(0, n, size=pairs)
+    j = rng.integers(0, n, size=pairs)
+    p, q = points[i], points[j]
+    diff = p - q
+    length = np.linalg.norm(diff, axis=1)
+    radial = np.abs(np.linalg.norm(p - center, axis=1) - np.linalg.norm(q - center, axis=1))
+    ok = (length > 0.05 * scale) & (radial < 0.02 * scale)
+    if not np.any(ok):
+        return np.zeros((0, 3)), np.zeros(0)
+    normals = diff[ok] / length[ok, None]
+    offsets = np.einsum('ij,ij->i', normals, (p[ok] + q[ok]) / 2.0)
+    normals, offsets = _canonical_planes(normals, offsets)
+    bins = np.hstack([np.round(normals * 8.0), np.round(offsets / (0.05 * scale))[:, None]]).astype(np.int64)
+    _, label, counts = np.unique(bins, axis=0, return_inverse=True, return_counts=True)
+    label = label.ravel()
+    top = np.argsort(-counts, kind='stable')[:keep]
+    cand_n = np.zeros((len(top), 3))
+    cand_d = np.zeros(len(top))
+    for k, b in enumerate(top):
+        members = label == b
+        mean = normals[members].mean(axis=0)
+        cand_n[k] = mean / max(np.linalg.norm(mean), 1e-12)
+        cand_d[k] = offsets[members].mean()
+    return cand_n, cand_d
+
+
+def _capped_query(tree, points: np.ndarray, cap: float):
+    # Multi-threaded nearest-neighbour query with distances clipped at ``cap``
+    try:
+        dist, idx = tree.query(points, k=1, distance_upper_bound=cap, workers=-1)
+    except TypeError:  # SciPy < 1.6
+        dist, idx = tree.query(points, k=1, distance_upper_bound=cap, n_jobs=-1)
+    return np.minimum(dist, cap), idx
+
+
+def _score_planes(tree, sample: np.ndarray, normals: np.ndarray, offsets: np.ndarray,
+                  cap: float) -> np.ndarray:
+    # Mean nearest-neighbour distance of the mirrored sample for every plane,
+    # answered by one batched KD-tree query.
+    signed = sample @ normals.T - offsets[None, :]
+    mirrored = sample[None, :, :] - 2.0 * signed.T[:, :, None] * normals[:, None, :]
+    dist, _ = _capped_query(tree, mirrored.reshape(-1, 3), cap)
+    return dist.reshape(len(normals), len(sample)).mean(axis=1)
+
+
+def _refine_plane(tree, points: np.ndarray, sample: np.ndarray, normal: np.ndarray, offset: float,
+                  iterations: int, cap: float) -> Tuple[np.ndarray, float]:
+    # ICP for a reflection: match mirrored samples to their nearest vertices,
+    # then refit the plane as the bisector of the matched pairs (normal along
+    # the dominant pair direction, offset through the pair midpoints).
+    for _ in range(max(0, int(iterations))):
+        dist, idx = _capped_query(tree, reflect_points(sample, normal, offset), cap)
+        inlier = (dist <= np.quantile(dist, 0.8)) & (idx < len(points))
+        p, q = sample[inlier], points[idx[inlier]]
+        diff = p - q
+        if len(diff) < 3:
+            break
+        _, vecs = np.linalg.eigh(diff.T @ diff)
+        new_normal = vecs[:, -1]
+        if new_normal @ normal < 0.0:
+            new_normal = -new_normal
+        new_offset = float(np.mean((p + q) @ new_normal) / 2.0)
+        moved = 1.0 - abs(float(new_normal @ normal)) + abs(new_offset - offset)
+        normal, offset = new_normal, new_offset
+        if moved < 1e-9:
+            break
+    return normal, offset
+
+
+def detect_symmetry_plane(vertices, tree=None, sample_points: int = SYMMETRY_SAMPLE_POINTS,
+                          seed: int = 0) -> Optional[SymmetryPlane]:
+    """Find the best mirror plane of a point set, in any orientation.
+
+    Candidates are the three PCA planes and the three world-axis planes
+    through the centre, plus the most voted bisector planes of random point
+    pairs. All candidates are scored together with one batched query
+    against a KD-tree over at most ``SYMMETRY_TREE_POINTS`` vertices; the
+    best few are refined with ICP-style iterations against a KD-tree over
+    all vertices (pass ``tree`` to reuse one) and the lowest-scoring plane,
+    refined or not, wins. The returned Chamfer value is the mean mirrored
+    nearest-neighbour distance of a ``sample_points`` subsample, with each
+    distance capped at ``SYMMETRY_DISTANCE_CAP`` of the bbox diagonal.
+    Returns ``None`` without SciPy or with fewer than four vertices.
+    """
+    V = np.asarray(vertices, dtype=np.float64)
+    cKDTree = try_import_ckdtree()
+    if cKDTree is None or len(V) < 4:
+        return None
+    rng = np.random.default_rng(seed)
+    sample = V if len(V) <= sample_points else V[rng.choice(len(V), size=sample_points, replace=False)]
+    coarse = V if len(V) <= SYMMETRY_TREE_POINTS else V[rng.choice(len(V), size=SYMMETRY_TREE_POINTS,
+                                                                   replace=False)]
+    coarse_tree = cKDTree(coarse)
+    if tree is None:
+        tree = coarse_tree if coarse is V else cKDTree(V)
+    centroid = V.mean(axis=0)
+    lo, hi = V.min(axis=0), V.max(axis=0)
+    scale = float(np.linalg.norm(hi - lo)) or 1.0
+    cap = SYMMETRY_DISTANCE_CAP * scale
+
+    _, axes = np.linalg.eigh(np.cov((sample - centroid).T))
+    normals = [axes.T, np.eye(3)]
+    offsets = [axes.T @ centroid, (lo + hi) / 2.0]
+    vote_n, vote_d = _vote_planes(sample, centroid, scale, rng, SYMMETRY_VOTE_PAIRS, SYMMETRY_VOTE_CANDIDATES)
+    normals.append(vote_n)
+    offsets.append(vote_d)
+    normals, offsets = _canonical_planes(np.vstack(normals), np.concatenate(offsets))
+
+    scores = _score_planes(coarse_tree, sample, normals, offsets, cap)
+    best = None
+    for k in np.argsort(scores, kind='stable')[:SYMMETRY_REFINED_CANDIDATES]:
+        refined = _refine_plane(tree, V, sample, normals[k], float(offsets[k]),
+                                SYMMETRY_ICP_ITERATIONS, cap)
+        for normal, offset in ((normals[k], float(offsets[k])), refined):
+            score = float(_score_planes(tree, sample, normal[None, :], np.array([offset]), cap)[0])
+            if best is None or score < best[2]:
+                best = (normal, offset, score)
+    normal, offset, score = best
+    normal, offset = _canonical_planes(normal[None, :], np.array([offset]))
+    return SymmetryPlane(normal=normal[0], offset=float(offset[0]), chamfer=score)
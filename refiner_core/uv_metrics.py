@@ -0,0 +1,431 @@
+"""UV layout quality metrics shared by the analyzer and ``uv_analyzer``.
+
+Stretch, inverted triangles, raster coverage/overlap, exact overlap and UV
+islands with per-island texel density, all vectorized over faces. Callers
+that already hold per-face 3D areas or face adjacency (the analyzer's
+shared mesh arrays) pass them in so nothing is recomputed.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+from .uv_raster import rasterize_uv
+
+
+def wrap01(uv: np.ndarray) -> np.ndarray:
+    return np.mod(uv, 1.0)
+
+
+def tri_areas_2d(uv: np.ndarray, faces: np.ndarray) -> np.ndarray:
+    # uv: (N,2), faces: (M,3)
+    a = uv[faces[:, 0]]
+    b = uv[faces[:, 1]]
+    c = uv[faces[:, 2]]
+    # area = 0.5 * |(b-a) x (c-a)| in 2D
+    v1 = b - a
+    v2 = c - a
+    cross = v1[:, 0] * v2[:, 1] - v1[:, 1] * v2[:, 0]
+    return 0.5 * np.abs(cross)
+
+
+def tri_areas_3d(verts: np.ndarray, faces: np.ndarray) -> np.ndarray:
+    a = verts[faces[:, 0]]
+    b = verts[faces[:, 1]]
+    c = verts[faces[:, 2]]
+    v1 = b - a
+    v2 = c - a
+    cross = np.cross(v1, v2)
+    return 0.5 * np.linalg.norm(cross, axis=1)
+
+
+def inverted_uv_tris(uv: np.ndarray, faces: np.ndarray) -> np.ndarray:
+    a = uv[faces[:, 0]]
+    b = uv[faces[:, 1]]
+    c = uv[faces[:, 2]]
+    v1 = b - a
+    v2 = c - a
+    cross = v1[:, 0] * v2[:, 1] - v1[:, 1] * v2[:, 0]
+    return cross < 0.0
+
+
+# Exact overlap: candidate pairs are built and narrowed in chunks of this many, and
+# intersections smaller than this area (UV units squared) count as touching
+OVERLAP_CHUNK_PAIRS = 1 << 20
+OVERLAP_MIN_AREA = 1e-12
+
+
+def _candidate_pairs(lo: np.ndarray, hi: np.ndarray,
+                     max_pairs: Optional[int] = None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Yield blocks of triangle pairs whose bounding boxes overlap, via a uniform grid.
+
+    Boxes are binned into square cells about the size of an average box; a
+    pair is reported only from the cell holding the lower-left corner of
+    the two boxes' intersection, so no pair is emitted twice. Same-cell
+    pairs are expanded and filtered about ``max_pairs`` (default
+    ``OVERLAP_CHUNK_PAIRS``) at a time, so stacked or mirrored layouts with
+    crowded cells never materialize them all at once.
+    """
+    n = len(lo)
+    if n < 2:
+        return
+    max_pairs = int(max_pairs or OVERLAP_CHUNK_PAIRS)
+    origin = lo.min(axis=0)
+    span = float(np.max(hi.max(axis=0) - origin))
+    cell = float(np.mean(np.max(hi - lo, axis=1)))
+    # Never more cells per side than triangles, so sparse layouts stay cheap
+    cell = max(cell, span / max(np.sqrt(n), 1.0), 1e-12)
+    c0 = np.floor((lo - origin) / cell).astype(np.int64)
+    c1 = np.floor((hi - origin) / cell).astype(np.int64)
+    width = int(c1[:, 0].max()) + 1
+    nx = c1[:, 0] - c0[:, 0] + 1
+    ny = c1[:, 1] - c0[:, 1] + 1
+    counts = nx * ny
+    tri = np.repeat(np.arange(n), counts)
+    k = np.arange(len(tri)) - np.repeat(np.cumsum(counts) - counts, counts)
+    cell_id = (c0[tri, 1] + k // nx[tri]) * width + c0[tri, 0] + k % nx[tri]
+    order = np.argsort(cell_id, kind='stable')
+    tri, cell_id = tri[order], cell_id[order]
+    # Every entry pairs with the entries after it in the same cell
+    start = np.flatnonzero(np.r_[True, cell_id[1:] != cell_id[:-1]])
+    size = np.diff(np.r_[start, len(cell_id)])
+    group_end = np.repeat(start + size, size)
+    partners = group_end - np.arange(len(cell_id)) - 1
+    total = np.cumsum(partners)
+    i0 = 0
+    while i0 < len(partners):
+        done = total[i0 - 1] if i0 > 0 else 0
+        i1 = max(int(np.searchsorted(total, done + max_pairs, side='right')), i0 + 1)
+        part = partners[i0:i1]
+        first = np.repeat(np.arange(i0, i1), part)
+        second = first + 1 + np.arange(len(first)) - np.repeat(np.cumsum(part) - part, part)
+        i0 = i1
+        if len(first) == 0:
+            continue
+        a, b, home = tri[first], tri[second], cell_id[first]
+        # Per-axis columns: much faster than reductions over a length-2 axis
+        cx = np.maximum(lo[a, 0], lo[b, 0])
+        cy = np.maximum(lo[a, 1], lo[b, 1])
+        keep = (cx <= np.minimum(hi[a, 0], hi[b, 0])) & (cy <= np.minimum(hi[a, 1], hi[b, 1]))
+        corner_cell = (np.floor((cy - origin[1]) / cell).astype(np.int64) * width
+                       + np.floor((cx - origin[0]) / cell).astype(np.int64))
+        keep &= corner_cell == home
+        yield a[keep], b[keep]
+
+
+def _separated(A: np.ndarray, B: np.ndarray) -> np.ndarray:
+    """Whether an edge normal of either triangle separates the pair.
+
+    Convex polygons with disjoint interiors always have such an axis, so
+    this rejects disjoint and merely touching pairs (shared edges or
+    vertices) before any clipping.
+    """
+    sep = np.zeros(len(A), dtype=bool)
+    for T in (A, B):
+        for e in range(3):
+            d = T[:, (e + 1) % 3] - T[:, e]
+            # Projections onto the edge normal (-dy, dx), one column per vertex
+            pa = [A[:, i, 1] * d[:, 0] - A[:, i, 0] * d[:, 1] for i in range(3)]
+            pb = [B[:, i, 1] * d[:, 0] - B[:, i, 0] * d[:, 1] for i in range(3)]
+            a_lo, a_hi = np.minimum(np.minimum(pa[0], pa[1]), pa[2]), np.maximum(np.maximum(pa[0], pa[1]), pa[2])
+            b_lo, b_hi = np.minimum(np.minimum(pb[0], pb[1]), pb[2]), np.maximum(np.maximum(pb[0], pb[1]), pb[2])
+            sep |= (a_hi <= b_lo) | (b_hi <= a_lo)
+    return sep
+
+
+def _intersection_areas(A: np.ndarray, B: np.ndarray) -> np.ndarray:
+    """Areas of triangle-triangle intersections, vectorized over pairs.
+
+    Each triangle of ``A`` is clipped against the three half-planes of the
+    matching triangle of ``B`` (Sutherland-Hodgman); the clipped polygon has
+    at most six vertices.
+    """
+    k = len(A)
+    cross = (B[:, 1, 0] - B[:, 0, 0]) * (B[:, 2, 1] - B[:, 0, 1]) - (B[:, 1, 1] - B[:, 0, 1]) * (B[:, 2, 0] - B[:, 0, 0])
+    B = np.where((cross < 0)[:, None, None], B[:, ::-1], B)
+    poly = np.zeros((k, 9, 2))
+    poly[:, :3] = A
+    count = np.full(k, 3)
+    rows = np.arange(k)
+    for e in range(3):
+        p = B[:, e]
+        d = B[:, (e + 1) % 3] - p
+        side = d[:, None, 0] * (poly[:, :, 1] - p[:, None, 1]) - d[:, None, 1] * (poly[:, :, 0] - p[:, None, 0])
+        out = np.zeros_like(poly)
+        n_out = np.zeros(k, dtype=np.int64)
+        for i in range(9):
+            live = i < count
+            if not live.any():
+                break
+            j = np.where(i == 0, count - 1, i - 1)
+            cur, prev = poly[:, i], poly[rows, j]
+            s_cur, s_prev = side[:, i], side[rows, j]
+            cur_in, prev_in = s_cur >= 0, s_prev >= 0
+            crosses = live & (cur_in != prev_in)
+            denom = np.where(crosses, s_prev - s_cur, 1.0)
+            hit = prev + (cur - prev) * (s_prev / denom)[:, None]
+            out[rows[crosses], n_out[crosses]] = hit[crosses]
+            n_out += crosses
+            emit = live & cur_in
+            out[rows[emit], n_out[emit]] = cur[emit]
+            n_out += emit
+        poly, count = out, n_out
+    # Shoelace over the first ``count`` vertices
+    nxt = np.where(np.arange(9)[None, :] + 1 < count[:, None], np.arange(1, 10)[None, :] % 9, 0)
+    q = poly[rows[:, None], nxt]
+    terms = poly[:, :, 0] * q[:, :, 1] - poly[:, :, 1] * q[:, :, 0]
+    terms[np.arange(9)[None, :] >= count[:, None]] = 0.0
+    return 0.5 * np.abs(terms.sum(axis=1))
+
+
+def exact_uv_overlap(faces: np.ndarray, uv: np.ndarray,
+                     min_area: float = OVERLAP_MIN_AREA) -> Tuple[np.ndarray, np.ndarray]:
+    """Face pairs whose UV triangles overlap, and each pair's overlap area.
+
+    Resolution independent: candidate pairs come from a bounding-box grid
+    and every candidate is intersected exactly. Triangles that only share
+    an edge or a vertex, and degenerate (zero-area) triangles, never count.
+    Returns ``(pairs, areas)`` with ``pairs`` of shape (k, 2), ``i < j``.
+    """
+    faces = np.asarray(faces, dtype=np.int64)
+    T = np.asarray(uv, dtype=np.float64)[faces][:, :, :2]
+    valid = tri_areas_2d(np.asarray(uv, dtype=np.float64)[:, :2], faces) > min_area
+    idx = np.flatnonzero(valid)
+    pairs, areas = [], []
+    for ca, cb in _candidate_pairs(T[idx].min(axis=1), T[idx].max(axis=1)):
+        ca, cb = idx[ca], idx[cb]
+        near = ~_separated(T[ca], T[cb])
+        ca, cb = ca[near], cb[near]
+        area = _intersection_areas(T[ca], T[cb])
+        hit = area > min_area
+        pairs.append(np.stack([np.minimum(ca[hit], cb[hit]), np.maximum(ca[hit], cb[hit])], axis=1))
+        areas.append(area[hit])
+    if not pairs:
+        return np.zeros((0, 2), dtype=np.int64), np.zeros(0)
+    pairs = np.concatenate(pairs)
+    areas = np.concatenate(areas)
+    order = np.lexsort((pairs[:, 1], pairs[:, 0]))
+    return pairs[order], areas[order]
+
+
+# Islands whose texel density differs from the area-weighted median by more
+# than this factor (either way) are reported as outliers
+TEXEL_OUTLIER_RATIO = 2.0
+
+
+def _union_find(n: int, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Root of every element after uniting each pair ``(a[i], b[i])``.
+
+    Vectorized union-find: each round hooks the larger root of every
+    still-split pair onto the smaller one, then compresses paths by pointer
+    jumping until every element points at its root.
+    """
+    parent = np.arange(n)
+    a = np.asarray(a, dtype=np.int64)
+    b = np.asarray(b, dtype=np.int64)
+    while True:
+        while True:
+            grand = parent[parent]
+            if np.array_equal(grand, parent):
+                break
+            parent = grand
+        ra, rb = parent[a], parent[b]
+        split = ra != rb
+        if not split.any():
+            return parent
+        a, b, ra, rb = a[split], b[split], ra[split], rb[split]
+        np.minimum.at(parent, np.maximum(ra, rb), np.minimum(ra, rb))
+
+
+def uv_islands(verts: np.ndarray, faces: np.ndarray, uv: np.ndarray,
+               face_pairs: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> Tuple[int, np.ndarray]:
+    """Label faces by UV island.
+
+    Two faces are in one island when they share an edge whose endpoints
+    match in both 3D position and UV; seam edges (same position, different
+    UV) and vertex-only contacts separate islands. Vertices split for other
+    reasons (e.g. hard normals) are matched by value, so they do not cut an
+    island. Returns ``(count, labels)`` with islands numbered by first face.
+
+    ``face_pairs`` are faces sharing an edge by vertex index (as found by a
+    topology pass); they are used as is when no two vertices share both
+    position and UV, since edges then match by value exactly when they
+    match by index.
+    """
+    faces = np.asarray(faces, dtype=np.int64)
+    m = len(faces)
+    if m == 0:
+        return 0, np.zeros(0, dtype=np.int64)
+    # Canonical vertex ids by exact (position, uv) value; + 0.0 folds -0.0
+    key = np.ascontiguousarray(np.concatenate([verts[:, :3], uv[:, :2]], axis=1), dtype=np.float64) + 0.0
+    _, canon = np.unique(key.view(np.dtype((np.void, key.dtype.itemsize * key.shape[1]))).ravel(),
+                         return_inverse=True)
+    canon = canon.ravel()
+    if face_pairs is not None and canon.max() + 1 == len(canon):
+        return _island_labels(m, *face_pairs)
+    F = canon[faces]
+    e0 = F.ravel()
+    e1 = F[:, [1, 2, 0]].ravel()
+    lo = np.minimum(e0, e1)
+    hi = np.maximum(e0, e1)
+    owner = np.repeat(np.arange(m), 3)
+    order = np.lexsort((hi, lo))
+    lo, hi, owner = lo[order], hi[order], owner[order]
+    # Consecutive half-edges on the same undirected edge join their faces
+    same = (lo[1:] == lo[:-1]) & (hi[1:] == hi[:-1])
+    return _island_labels(m, owner[:-1][same], owner[1:][same])
+
+
+def _island_labels(m: int, a: np.ndarray, b: np.ndarray) -> Tuple[int, np.ndarray]:
+    # Union the face pairs and number islands by their first face
+    roots = _union_find(m, a, b)
+    uniq, first, inverse = np.unique(roots, return_index=True, return_inverse=True)
+    rank = np.empty(len(uniq), dtype=np.int64)
+    rank[np.argsort(first, kind='stable')] = np.arange(len(uniq))
+    return len(uniq), rank[inverse.ravel()]
+
+
+def weighted_median(values: np.ndarray, weights: np.ndarray) -> float:
+    """Value at half the total weight (0.0 when empty)."""
+    if len(values) == 0:
+        return 0.0
+    order = np.argsort(values, kind='stable')
+    cum = np.cumsum(weights[order])
+    return float(values[order][min(np.searchsorted(cum, 0.5 * cum[-1]), len(cum) - 1)])
+
+
+def island_stats(verts: np.ndarray, faces: np.ndarray, uv: np.ndarray, labels: np.ndarray,
+                 count: int, texture_size: int, face_area_3d: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """Per-island face count, UV/3D area, texel density, UV bounds and inversions.
+
+    Texel density is texels per world unit at ``texture_size``:
+    ``texture_size * sqrt(uv_area / area_3d)`` (0 for islands without 3D
+    area). ``density_ratio`` compares it with the 3D-area-weighted median
+    density of the whole mesh. ``face_area_3d`` reuses per-face 3D areas
+    the caller already has.
+    """
+    faces = np.asarray(faces, dtype=np.int64)
+    labels = np.asarray(labels, dtype=np.int64)
+    uv_area = np.bincount(labels, tri_areas_2d(uv, faces), count)
+    if face_area_3d is None:
+        face_area_3d = tri_areas_3d(verts, faces)
+    area_3d = np.bincount(labels, face_area_3d, count)
+    inverted = np.bincount(labels, inverted_uv_tris(uv, faces), count).astype(np.int64)
+    density = np.zeros(count)
+    has_area = area_3d > 1e-12
+    density[has_area] = texture_size * np.sqrt(uv_area[has_area] / area_3d[has_area])
+    # Bounds: per-face min/max, reduced over faces sorted by island
+    face_counts = np.bincount(labels, minlength=count)
+    order = np.argsort(labels, kind='stable')
+    starts = np.cumsum(face_counts) - face_counts
+    bounds = []
+    for axis in (0, 1):
+        c = uv[:, axis][faces[order]]
+        fmin = np.minimum(np.minimum(c[:, 0], c[:, 1]), c[:, 2])
+        fmax = np.maximum(np.maximum(c[:, 0], c[:, 1]), c[:, 2])
+        bounds.append((np.minimum.reduceat(fmin, starts), np.maximum.reduceat(fmax, starts)))
+    (u_min, u_max), (v_min, v_max) = bounds
+    ratio = np.zeros(count)
+    median = weighted_median(density[has_area], area_3d[has_area])
+    if median > 0:
+        ratio[has_area] = density[has_area] / median
+    return {
+        'face_count': face_counts,
+        'uv_area': uv_area,
+        'area_3d': area_3d,
+        'texel_density': density,
+        'density_ratio': ratio,
+        'uv_bbox': np.stack([u_min, v_min, u_max, v_max], axis=1),
+        'inverted_count': inverted,
+    }
+
+
+# Defaults of :func:`uv_quality` options, matching ``uv_analyzer``'s CLI
+UV_QUALITY_DEFAULTS: Dict[str, Any] = {
+    'resolution': 1024,
+    'wrap_uv': True,
+    'exact_overlap': False,
+    'texture_size': 1024,
+    'islands': False,
+}
+
+
+def uv_quality(verts: np.ndarray, faces: np.ndarray, uv: np.ndarray, resolution: int = 1024,
+               wrap_uv: bool = True, exact_overlap: bool = False, texture_size: int = 1024,
+               islands: bool = False, face_area_3d: Optional[np.ndarray] = None,
+               face_pairs: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> Dict[str, Any]:
+    """UV quality metrics of one mesh with UVs.
+
+    Returns stretch, inverted-triangle, raster coverage/overlap and island
+    metrics; exact overlap only with ``exact_overlap`` and the per-island
+    table only with ``islands``. ``face_area_3d`` and ``face_pairs`` reuse
+    per-face 3D areas and edge adjacency the caller already computed.
+    """
+    result: Dict[str, Any] = {}
+    verts = np.asarray(verts, dtype=np.float64)
+    faces = np.asarray(faces, dtype=np.int64)
+    uv = np.asarray(uv)[:, :2].astype(np.float64, copy=False)
+    res = int(resolution)
+    uv_wrapped = wrap01(uv) if wrap_uv else uv.copy()
+
+    # Areas and stretching
+    uv_area = tri_areas_2d(uv_wrapped, faces)
+    geo_area = tri_areas_3d(verts, faces) if face_area_3d is None else face_area_3d
+    valid = geo_area > 1e-12
+    stretch = np.zeros_like(geo_area)
+    stretch[valid] = uv_area[valid] / geo_area[valid]
+    # Use robust stats
+    if np.any(valid):
+        result["stretch_ratio_mean"] = float(np.mean(stretch[valid]))
+        result["stretch_ratio_median"] = float(np.median(stretch[valid]))
+    else:
+        result["stretch_ratio_mean"] = 0.0
+        result["stretch_ratio_median"] = 0.0
+
+    # Inverted UV triangles
+    inv_mask = inverted_uv_tris(uv_wrapped, faces)
+    result["inverted_tri_pct"] = round(float(np.count_nonzero(inv_mask)) / float(len(faces)) * 100.0, 4)
+
+    # Rasterization into [0,1] to estimate coverage and overlap
+    _, coverage_px, overlap_px = rasterize_uv(faces, uv_wrapped, res)
+    total_px = float(res * res)
+    result["coverage_pct"] = round(coverage_px / total_px * 100.0, 4)
+    result["overlap_px"] = int(overlap_px)
+    result["overlap_pct_of_covered"] = round((overlap_px / max(coverage_px, 1.0)) * 100.0, 4)
+
+    # UV islands and texel density, on the unwrapped UVs so tiling islands stay whole
+    count, labels = uv_islands(verts, faces, uv, face_pairs)
+    stats = island_stats(verts, faces, uv, labels, count, texture_size, geo_area)
+    has_area = stats['area_3d'] > 1e-12
+    ratio = stats['density_ratio'][has_area]
+    result["island_count"] = int(count)
+    result["texel_density_median"] = round(weighted_median(stats['texel_density'][has_area],
+                                                           stats['area_3d'][has_area]), 4)
+    result["texel_outlier_islands"] = int(np.count_nonzero(
+        (ratio > TEXEL_OUTLIER_RATIO) | (ratio < 1.0 / TEXEL_OUTLIER_RATIO)))
+    if islands:
+        result["islands"] = [
+            {
+                "faces": int(stats['face_count'][i]),
+                "uv_area": float(stats['uv_area'][i]),
+                "area_3d": float(stats['area_3d'][i]),
+                "texel_density": round(float(stats['texel_density'][i]), 4),
+                "density_ratio": round(float(stats['density_ratio'][i]), 4),
+                "uv_bbox": [float(x) for x in stats['uv_bbox'][i]],
+                "inverted": int(stats['inverted_count'][i]),
+            }
+            for i in range(count)
+        ]
+
+    # Exact, resolution-independent overlap from triangle intersections
+    if exact_overlap:
+        pairs, areas = exact_uv_overlap(faces, uv_wrapped)
+        overlap_area = float(areas.sum())
+        result["overlap_pairs"] = int(len(pairs))
+        result["overlap_faces"] = int(len(np.unique(pairs))) if len(pairs) else 0
+        result["overlap_area"] = overlap_area
+        result["overlap_area_pct"] = round(overlap_area / max(float(uv_area.sum()), 1e-30) * 100.0, 4)
+
+    return result
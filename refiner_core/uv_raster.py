@@ -0,0 +1,208 @@
+"""Scanline rasterization of UV triangles for coverage and overlap.
+
+Coverage is the fraction of a ``res x res`` UV raster touched by any
+triangle and overlap the fraction of covered pixels touched by two or
+more. Triangles cover exactly the pixels ``cv2.fillConvexPoly`` fills for
+their vertices snapped to the grid, but all triangles are rasterized at
+once with NumPy: scanline spans go through a per-row difference array and
+edge outlines through a closed-form Bresenham walk.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+# Triangles are rasterized in chunks of about this many scanline rows
+RASTER_CHUNK_ROWS = 1 << 22
+
+_XY_SHIFT = 16
+
+
+def _trunc_div(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    # C-style integer division (rounds toward zero) for den > 0
+    return np.where(num >= 0, num // den, -((-num) // den))
+
+
+def _outline_pixels(p: np.ndarray, q: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """8-connected Bresenham pixels of segments p->q, drawn left to right.
+
+    Returns (segment index, x, y) for every pixel. The minor-axis offset of
+    pixel k is the closed form of the error-accumulator walk,
+    ``ceil((2*d*k - D) / (2*D))`` for major length D and minor length d.
+    """
+    swap = q[:, 0] < p[:, 0]
+    a = np.where(swap[:, None], q, p)
+    b = np.where(swap[:, None], p, q)
+    dx = b[:, 0] - a[:, 0]
+    dy = b[:, 1] - a[:, 1]
+    sy = np.where(dy < 0, -1, 1)
+    ady = np.abs(dy)
+    y_major = ady > dx
+    major = np.maximum(dx, ady)
+    minor = np.minimum(dx, ady)
+    counts = major + 1
+    seg = np.repeat(np.arange(len(p)), counts)
+    k = np.arange(len(seg)) - np.repeat(np.cumsum(counts) - counts, counts)
+    D = major[seg]
+    m = np.where(D > 0, -((D - 2 * minor[seg] * k) // np.maximum(2 * D, 1)), 0)
+    ym = y_major[seg]
+    x = a[seg, 0] + np.where(ym, m, k)
+    y = a[seg, 1] + np.where(ym, k, m) * sy[seg]
+    return seg, x, y
+
+
+def _raster_chunk(P: np.ndarray, res: int, acc: np.ndarray) -> None:
+    """Add the coverage of integer-vertex triangles ``P`` (n, 3, 2) to ``acc``."""
+    n = len(P)
+    X = P[:, :, 0]
+    Y = P[:, :, 1]
+    # Span walk: from the first top-most vertex A, chain 0 runs A->B->C and
+    # chain 1 runs A->C->B; rows [ytop, ybottom) are filled between them.
+    ia = np.argmin(Y, axis=1)
+    rows_n = np.arange(n)
+    ib = (ia + 1) % 3
+    ic = (ia + 2) % 3
+    xa, ya = X[rows_n, ia], Y[rows_n, ia]
+    xb, yb = X[rows_n, ib], Y[rows_n, ib]
+    xc, yc = X[rows_n, ic], Y[rows_n, ic]
+    ybot = np.max(Y, axis=1)
+
+    def slope(x0, y0, x1, y1):
+        # 16.16 fixed-point x step per row, rounded as in the span walker
+        h = np.maximum(y1 - y0, 1)
+        return _trunc_div((x1 - x0) * (2 << _XY_SHIFT) + h, 2 * h)
+
+    d_ab, d_bc = slope(xa, ya, xb, yb), slope(xb, yb, xc, yc)
+    d_ac, d_cb = slope(xa, ya, xc, yc), slope(xc, yc, xb, yb)
+
+    height = ybot - ya
+    total = int(height.sum())
+    first_row = np.cumsum(height) - height
+    lo_of = hi_of = None
+    if total:
+        t = np.repeat(rows_n, height)
+        y = ya[t] + np.arange(total) - first_row[t]
+        on_ab = y < yb[t]
+        x0 = np.where(on_ab, (xa[t] << _XY_SHIFT) + (y - ya[t]) * d_ab[t],
+                      (xb[t] << _XY_SHIFT) + (y - yb[t]) * d_bc[t])
+        on_ac = y < yc[t]
+        x1 = np.where(on_ac, (xa[t] << _XY_SHIFT) + (y - ya[t]) * d_ac[t],
+                      (xc[t] << _XY_SHIFT) + (y - yc[t]) * d_cb[t])
+        half = 1 << (_XY_SHIFT - 1)
+        lo_of = (np.minimum(x0, x1) + half) >> _XY_SHIFT
+        hi_of = (np.maximum(x0, x1) + half) >> _XY_SHIFT
+        keep = (hi_of >= 0) & (lo_of < res)
+        lo = np.clip(lo_of, 0, res - 1)
+        hi = np.clip(hi_of, 0, res - 1)
+        # Difference array: +1 at the span start, -1 just past its end
+        width = res + 1
+        diff = np.bincount((y * width + lo)[keep], minlength=res * width)
+        diff -= np.bincount((y * width + hi + 1)[keep], minlength=res * width)
+        acc += np.cumsum(diff.reshape(res, width), axis=1)[:, :res]
+
+    # Outline pixels (the edges are drawn as lines too) not already in a span
+    p = P[:, [2, 0, 1]].reshape(-1, 2)
+    q = P.reshape(-1, 2)
+    seg, x, y = _outline_pixels(p, q)
+    tri = seg // 3
+    inside = np.zeros(len(seg), dtype=bool)
+    if total:
+        in_rows = (y >= ya[tri]) & (y < ybot[tri])
+        r = first_row[tri[in_rows]] + y[in_rows] - ya[tri[in_rows]]
+        inside[in_rows] = (x[in_rows] >= lo_of[r]) & (x[in_rows] <= hi_of[r])
+    ok = ~inside & (x >= 0) & (x < res) & (y >= 0) & (y < res)
+    # A pixel shared by two edges of one triangle still counts once
+    key = np.unique(tri[ok] * (res * res) + y[ok] * res + x[ok])
+    acc += np.bincount(key % (res * res), minlength=res * res).reshape(res, res)
+
+
+def rasterize_uv(faces: np.ndarray, uv: np.ndarray, res: int) -> Tuple[np.ndarray, float, float]:
+    """Rasterize UV triangles into an accumulation buffer.
+
+    Each triangle covers exactly the pixels ``cv2.fillConvexPoly`` would
+    fill for its vertices snapped to the pixel grid, but nothing is drawn
+    per triangle: the scanline spans of all triangles are computed at once
+    and summed through a per-row difference array, so the work grows with
+    triangle heights and perimeters rather than with ``res * res`` per face.
+
+    Returns: (accum array, coverage_px, overlap_px)
+    """
+    acc = np.zeros((res, res), dtype=np.int64)
+    _accumulate(faces, uv, res, acc)
+    coverage_px = int(np.count_nonzero(acc >= 1))
+    overlap_px = int(np.count_nonzero(acc >= 2))
+    return np.minimum(acc, np.iinfo(np.uint16).max).astype(np.uint16), float(coverage_px), float(overlap_px)
+
+
+def _accumulate(faces: np.ndarray, uv: np.ndarray, res: int, acc: np.ndarray) -> None:
+    # Scale uv to pixel coordinates [0, res-1]
+    uv_px = np.clip((uv * (res - 1)).astype(np.float32), 0, res - 1)
+    P = uv_px[np.asarray(faces, dtype=np.int64)].astype(np.int32).astype(np.int64)
+    # Chunk so the per-row and per-outline-pixel arrays stay bounded
+    height = P[:, :, 1].max(axis=1) - P[:, :, 1].min(axis=1)
+    perimeter = np.abs(P - P[:, [1, 2, 0]]).max(axis=2).sum(axis=1) + 3
+    rows = height + perimeter
+    bounds = np.searchsorted(np.cumsum(rows), np.arange(RASTER_CHUNK_ROWS, int(rows.sum()), RASTER_CHUNK_ROWS))
+    for chunk in np.split(P, np.unique(bounds)):
+        if len(chunk):
+            _raster_chunk(chunk, res, acc)
+
+
+# Adaptive resolution: aim for about this many pixels per triangle, within bounds
+RASTER_PIXELS_PER_FACE = 8
+RASTER_MIN_RESOLUTION = 256
+RASTER_MAX_RESOLUTION = 2048
+
+
+def adaptive_resolution(num_faces: int, min_res: int = RASTER_MIN_RESOLUTION,
+                        max_res: int = RASTER_MAX_RESOLUTION) -> int:
+    """Power-of-two raster size giving a filled layout ~8 pixels per face."""
+    want = int(np.ceil(np.sqrt(max(int(num_faces), 1) * RASTER_PIXELS_PER_FACE)))
+    res = 1 << max(0, (want - 1).bit_length())
+    return int(min(max(res, min_res), max_res))
+
+
+class UVRasterizer:
+    """Coverage/overlap measurement that keeps its accumulator between calls.
+
+    The unwrap retry loop measures every Blender attempt; one instance
+    reuses a single buffer (grown only when a larger resolution is asked
+    for) instead of allocating a canvas per attempt.
+    """
+
+    def __init__(self, max_res: int = RASTER_MAX_RESOLUTION):
+        self.max_res = int(max_res)
+        self._acc: Optional[np.ndarray] = None
+
+    def _buffer(self, res: int) -> np.ndarray:
+        if self._acc is None or self._acc.shape[0] < res:
+            self._acc = np.zeros((res, res), dtype=np.int64)
+        acc = self._acc[:res, :res]
+        acc.fill(0)
+        return acc
+
+    def measure(self, faces, uv, res: Optional[int] = None, wrap: bool = True) -> Dict[str, float]:
+        """Coverage and overlap percentages of a UV layout.
+
+        ``res`` defaults to :func:`adaptive_resolution` for the face count,
+        capped at ``max_res``. UVs are wrapped into [0, 1) unless ``wrap``
+        is False. Returns ``uv_coverage_pct`` (of the raster) and
+        ``uv_overlap_pct`` (of covered pixels).
+        """
+        faces = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+        uv = np.asarray(uv, dtype=np.float64)[:, :2]
+        if wrap:
+            uv = np.mod(uv, 1.0)
+        if res is None:
+            res = adaptive_resolution(len(faces), max_res=self.max_res)
+        acc = self._buffer(int(res))
+        _accumulate(faces, uv, int(res), acc)
+        coverage = int(np.count_nonzero(acc))
+        overlap = int(np.count_nonzero(acc >= 2))
+        return {
+            'uv_raster_resolution': int(res),
+            'uv_coverage_pct': coverage / float(res * res) * 100.0,
+            'uv_overlap_pct': overlap / max(float(coverage), 1.0) * 100.0,
+        }
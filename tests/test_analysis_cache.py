@@ -0,0 +1,115 @@
+"""Tests for the persistent analysis report cache."""
+
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+try:
+    import trimesh
+    from refiner_core.analysis_cache import AnalysisCache, referenced_files
+    from refiner_core.analyzer import analyze_path
+    HAS_DEPS = True
+except ImportError:
+    HAS_DEPS = False
+
+
+@unittest.skipIf(not HAS_DEPS, "Dependencies not available")
+class TestAnalysisCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+        self.asset = self.tmp / 'asset.obj'
+        self.asset.write_text('v 0 0 0\n')
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _cache(self, **kwargs):
+        cache = AnalysisCache(self.tmp / 'cache.sqlite', **kwargs)
+        self.addCleanup(cache.close)
+        return cache
+
+    def test_hit_until_file_changes(self):
+        cache = self._cache()
+        self.assertIsNone(cache.get(self.asset, 'a', '1'))
+        cache.put(self.asset, 'a', '1', None, {'n': 1})
+        self.assertEqual(cache.get(self.asset, 'a', '1'), {'n': 1})
+        self.assertIsNone(cache.get(self.asset, 'a', '2'))
+        self.assertIsNone(cache.get(self.asset, 'a', '1', {'res': 512}))
+        self.asset.write_text('v 0 0 0\nv 1 0 0\n')
+        self.assertIsNone(cache.get(self.asset, 'a', '1'))
+        self.assertEqual((cache.hits, cache.misses), (1, 4))
+
+    def test_digest_rescues_touched_file_and_catches_same_stat_edit(self):
+        cache = self._cache(verify_hash=True)
+        cache.put(self.asset, 'a', '1', None, {'n': 1})
+        st = os.stat(self.asset)
+        os.utime(self.asset, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        self.assertEqual(cache.get(self.asset, 'a', '1'), {'n': 1})
+        # Same size and mtime, different bytes
+        st = os.stat(self.asset)
+        self.asset.write_text('v 9 9 9\n')
+        os.utime(self.asset, ns=(st.st_atime_ns, st.st_mtime_ns))
+        self.assertIsNone(cache.get(self.asset, 'a', '1'))
+
+    def test_size_cap_evicts_least_recently_used(self):
+        cache = self._cache(max_bytes=50)
+        other = self.tmp / 'other.obj'
+        other.write_text('v 1 1 1\n')
+        cache.put(self.asset, 'a', '1', None, {'pad': 'x' * 10})
+        cache.put(other, 'a', '1', None, {'pad': 'y' * 10})
+        cache.get(self.asset, 'a', '1')
+        cache.put(other, 'b', '1', None, {'pad': 'z' * 10})
+        self.assertIsNotNone(cache.get(self.asset, 'a', '1'))
+        self.assertIsNone(cache.get(other, 'a', '1'))
+        self.assertLessEqual(cache.nbytes, 50)
+        self.assertEqual(cache.invalidate(self.asset), 1)
+        self.assertEqual(len(cache), 1)
+        # The running total matches the table, also after a replace and from a new connection
+        cache.put(other, 'b', '1', None, {'pad': 'w' * 5})
+        self.assertEqual(cache.nbytes, 16)
+        self.assertEqual(self._cache().nbytes, 16)
+
+    def test_referenced_files_invalidate_reports(self):
+        cache = self._cache()
+        obj = self.tmp / 'model.obj'
+        obj.write_text('mtllib model.mtl\nv 0 0 0\n')
+        mtl = self.tmp / 'model.mtl'
+        mtl.write_text('newmtl m\nmap_Kd -bm 1 albedo.png\n')
+        self.assertEqual(referenced_files(obj), [mtl, self.tmp / 'albedo.png'])
+        cache.put(obj, 'a', '1', None, {'n': 1})
+        self.assertEqual(cache.get(obj, 'a', '1'), {'n': 1})
+        # A texture that was missing appears
+        (self.tmp / 'albedo.png').write_bytes(b'png')
+        self.assertIsNone(cache.get(obj, 'a', '1'))
+        cache.put(obj, 'a', '1', None, {'n': 2})
+        mtl.write_text('newmtl m\nmap_Kd -bm 1 albedo.png\nKd 1 0 0\n')
+        self.assertIsNone(cache.get(obj, 'a', '1'))
+
+        gltf = self.tmp / 'scene.gltf'
+        gltf.write_text(json.dumps({'buffers': [{'uri': 'scene.bin'}, {'uri': 'data:,'}]}))
+        buf = self.tmp / 'scene.bin'
+        buf.write_bytes(b'\0' * 8)
+        self.assertEqual(referenced_files(gltf), [buf])
+        cache.put(gltf, 'a', '1', None, {'n': 3})
+        self.assertEqual(cache.get(gltf, 'a', '1'), {'n': 3})
+        buf.write_bytes(b'\0' * 16)
+        self.assertIsNone(cache.get(gltf, 'a', '1'))
+
+    def test_analyze_path_reuses_report_across_sessions(self):
+        mesh_path = self.tmp / 'sphere.obj'
+        trimesh.creation.icosphere(subdivisions=1).export(mesh_path)
+        with AnalysisCache(self.tmp / 'cache.sqlite') as cache:
+            first = analyze_path(mesh_path, 'quick', cache=cache)
+        with AnalysisCache(self.tmp / 'cache.sqlite') as cache:
+            second = analyze_path(mesh_path, 'quick', cache=cache)
+            self.assertEqual(cache.hits, 1)
+            analyze_path(mesh_path, 'quick,uv', cache=cache)
+            self.assertEqual(cache.misses, 1)
+        self.assertEqual(first, second)
+
+
+if __name__ == '__main__':
+    unittest.main()
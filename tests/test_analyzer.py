@@ -0,0 +1,219 @@
+"""Tests for analyzer metrics."""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+try:
+    import numpy as np
+    import trimesh
+    from refiner_core.analyzer import (
+        METRIC_TIERS,
+        MeshAnalysis,
+        _analyze_geometry,
+        _symmetry_probe,
+        analyze_directory,
+        analyze_path,
+        parse_metrics,
+    )
+    from refiner_core import loaders
+    from refiner_core.uv_metrics import uv_islands
+    from uv_analyzer import analyze_geom
+    HAS_DEPS = True
+except ImportError:
+    HAS_DEPS = False
+
+
+@unittest.skipIf(not HAS_DEPS, "Dependencies not available")
+class TestGeometryTopology(unittest.TestCase):
+    def test_closed_parts_match_trimesh(self):
+        parts = [trimesh.creation.icosphere(subdivisions=1).apply_translation([3 * i, 0, 0]) for i in range(4)]
+        mesh = trimesh.util.concatenate(parts + [trimesh.creation.box().apply_translation([0, 5, 0])])
+        report = _analyze_geometry(mesh)
+        self.assertEqual(report['num_components'], len(mesh.split(only_watertight=False)))
+        self.assertEqual(report['euler_number'], mesh.euler_number)
+        self.assertTrue(report['is_watertight'])
+        self.assertTrue(report['is_winding_consistent'])
+        self.assertEqual((report['num_open_edges'], report['num_nonmanifold_edges']), (0, 0))
+        self.assertEqual(report['num_degenerate_faces'], 0)
+
+    def test_open_nonmanifold_and_degenerate_faces(self):
+        # Three fins and a zero-area sliver all sharing edge 0-1
+        vertices = [[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, -1, 0], [0, 0, 1], [2, 0, 0]]
+        faces = [[0, 1, 2], [1, 0, 3], [0, 1, 4], [1, 5, 0]]
+        report = _analyze_geometry(trimesh.Trimesh(vertices, faces, process=False))
+        self.assertEqual(report['num_nonmanifold_edges'], 1)
+        self.assertEqual(report['num_open_edges'], 8)
+        self.assertEqual(report['num_degenerate_faces'], 1)
+        self.assertEqual(report['num_components'], 1)
+        self.assertFalse(report['is_watertight'])
+
+    def test_euler_number_ignores_unreferenced_vertices_like_trimesh(self):
+        mesh = trimesh.creation.box()
+        mesh = trimesh.Trimesh(np.vstack([mesh.vertices, [[9.0, 9.0, 9.0]]]), mesh.faces, process=False)
+        self.assertEqual(_analyze_geometry(mesh)['euler_number'], mesh.euler_number)
+        self.assertEqual(mesh.euler_number, 2)
+
+
+@unittest.skipIf(not HAS_DEPS, "Dependencies not available")
+class TestMeshAnalysis(unittest.TestCase):
+    def test_reading_a_metric_computes_only_its_tier(self):
+        analysis = MeshAnalysis(trimesh.creation.icosphere(subdivisions=1))
+        self.assertFalse(analysis['has_uv'])
+        self.assertEqual(analysis.computed_tiers, ('uv',))
+        self.assertTrue(analysis['is_watertight'])
+        self.assertEqual(analysis.computed_tiers, ('topology', 'uv'))
+        self.assertIsNone(analysis.get('not_a_metric'))
+
+    def test_report_selects_tiers(self):
+        mesh = trimesh.creation.icosphere(subdivisions=1)
+        report = MeshAnalysis(mesh).report('quick,topology')
+        self.assertEqual(report['num_faces'], len(mesh.faces))
+        self.assertIn('num_components', report)
+        self.assertNotIn('symmetry_best_axis', report)
+        full = MeshAnalysis(mesh).report()
+        self.assertEqual({k: full[k] for k in report}, report)
+
+    def test_parse_metrics(self):
+        self.assertEqual(parse_metrics('symmetry, quick'), ('quick', 'symmetry'))
+        self.assertEqual(parse_metrics(['all']), parse_metrics(None))
+        self.assertNotIn('uv_quality', parse_metrics(None))
+        self.assertEqual(parse_metrics('all,uv_quality'), METRIC_TIERS)
+        with self.assertRaises(ValueError):
+            parse_metrics('quick,speed')
+
+
+@unittest.skipIf(not HAS_DEPS, "Dependencies not available")
+class TestAnalyzeDirectory(unittest.TestCase):
+    def test_streams_jsonl_and_resumes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp) / 'library'
+            (root / 'sub').mkdir(parents=True)
+            for i, sub in enumerate(['', 'sub', 'sub']):
+                trimesh.creation.icosphere(subdivisions=1).export(root / sub / f'm{i}.obj')
+            (root / 'notes.txt').write_text('skip me')
+            out = Path(tmp) / 'analysis.jsonl'
+            reports = list(analyze_directory(root, out, metrics='quick'))
+            self.assertEqual(len(reports), 3)
+            lines = [json.loads(line) for line in out.read_text().splitlines()]
+            self.assertEqual(sorted(r['file'] for r in lines), sorted(r['file'] for r in reports))
+            self.assertEqual(lines[0]['meshes'][0]['num_faces'], 80)
+            # Simulate a crash mid-write of the last record, then resume
+            out.write_text(out.read_text()[:-20])
+            resumed = list(analyze_directory(root, out, metrics='quick'))
+            self.assertEqual([r['file'] for r in resumed], [lines[-1]['file']])
+            self.assertEqual(list(analyze_directory(root, out, metrics='quick')), [])
+
+    def test_resume_retries_errors_and_matches_resolved_paths(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp) / 'library'
+            root.mkdir()
+            good, bad = root / 'good.obj', root / 'bad.obj'
+            trimesh.creation.icosphere(subdivisions=1).export(good)
+            bad.write_text('f 1 2 3\n')
+            out = Path(tmp) / 'analysis.jsonl'
+            first = {Path(r['file']).name: r for r in analyze_directory(root, out, metrics='quick')}
+            self.assertIn('error', first['bad.obj'])
+            trimesh.creation.icosphere(subdivisions=1).export(bad)
+            # Same library reached through a different spelling of the root
+            retried = list(analyze_directory(root / '..' / 'library', out, metrics='quick'))
+            self.assertEqual([Path(r['file']).name for r in retried], ['bad.obj'])
+            self.assertNotIn('error', retried[0])
+            self.assertEqual(list(analyze_directory(root, out, metrics='quick')), [])
+
+
+@unittest.skipIf(not HAS_DEPS, "Dependencies not available")
+class TestSymmetryProbe(unittest.TestCase):
+    def test_chamfer_matches_brute_force(self):
+        mesh = trimesh.creation.icosphere(subdivisions=2)
+        mesh.vertices = mesh.vertices + np.random.default_rng(3).normal(scale=0.02, size=mesh.vertices.shape)
+        scores = _symmetry_probe(mesh)['symmetry_median_distance']
+        V = np.asarray(mesh.vertices)
+        center = mesh.bounds.mean(axis=0)
+        for axis, idx in {'x': 0, 'y': 1, 'z': 2}.items():
+            M = V.copy()
+            M[:, idx] = 2 * center[idx] - M[:, idx]
+            d = np.linalg.norm(V[:, None, :] - M[None, :, :], axis=2)
+            expected = (d.min(axis=1).mean() + d.min(axis=0).mean()) / 2.0
+            self.assertAlmostEqual(scores[axis], expected, places=12)
+
+    def test_best_axis_for_mirror_symmetric_shape(self):
+        # A wedge is mirror-symmetric only across x
+        mesh = trimesh.Trimesh(vertices=[[-1, 0, 0], [1, 0, 0], [0, 2, 0], [0, 0.5, 1.5]],
+                               faces=[[0, 1, 2], [0, 3, 1], [1, 3, 2], [2, 3, 0]])
+        report = _symmetry_probe(mesh)
+        self.assertEqual(report['symmetry_best_axis'], 'x')
+        self.assertAlmostEqual(report['symmetry_best_chamfer'], 0.0)
+
+    def test_detects_rotated_mirror_plane(self):
+        # Bent ellipsoid symmetric only across y = 0, then rotated off-axis
+        mesh = trimesh.creation.icosphere(subdivisions=4)
+        V = mesh.vertices * [1.0, 0.6, 0.35]
+        V[:, 0] += 0.3 * V[:, 1] ** 2
+        V[:, 2] += 0.3 * V[:, 0]
+        rot = trimesh.transformations.euler_matrix(*np.radians([20, 35, 10]))[:3, :3]
+        mesh.vertices = V @ rot.T + [1.0, 2.0, 3.0]
+        report = _symmetry_probe(mesh)
+        normal = rot @ [0.0, 1.0, 0.0]
+        cos = float(np.dot(report['symmetry_plane_normal'], normal))
+        self.assertGreater(abs(cos), 1.0 - 1e-9)
+        self.assertAlmostEqual(report['symmetry_plane_offset'] * np.sign(cos),
+                               float(np.dot(normal, [1.0, 2.0, 3.0])), places=6)
+        self.assertLess(report['symmetry_plane_chamfer'], 1e-9)
+        self.assertGreater(report['symmetry_best_chamfer'], 1e-3)
+
+
+def _textured_sphere():
+    mesh = trimesh.creation.icosphere(subdivisions=3)
+    uv = mesh.vertices[:, :2] * 0.5 + 0.5
+    mesh.visual = trimesh.visual.TextureVisuals(uv=uv)
+    return mesh
+
+
+@unittest.skipIf(not HAS_DEPS, "Dependencies not available")
+class TestUnifiedAnalysis(unittest.TestCase):
+    def test_uv_quality_tier_matches_uv_analyzer(self):
+        mesh = _textured_sphere()
+        options = {'resolution': 256, 'exact_overlap': True, 'islands': True}
+        report = MeshAnalysis(mesh, uv_options=options).report('uv_quality')
+        expected = analyze_geom('mesh', mesh, 256, True, exact_overlap=True, islands=True)
+        for key in ('coverage_pct', 'overlap_pct_of_covered', 'stretch_ratio_median', 'inverted_tri_pct',
+                    'island_count', 'texel_density_median', 'overlap_area_pct', 'islands'):
+            self.assertEqual(report[key], expected[key], key)
+
+    def test_shared_adjacency_gives_same_islands(self):
+        mesh = _textured_sphere()
+        analysis = MeshAnalysis(mesh)
+        uv = analysis.arrays.uv
+        self.assertEqual(uv_islands(mesh.vertices, mesh.faces, uv, analysis.arrays.face_pairs)[0],
+                         uv_islands(mesh.vertices, mesh.faces, uv)[0])
+        # Tiers read the same derived arrays
+        analysis.tier('topology')
+        edges = analysis.arrays.edges
+        analysis.tier('uv_quality')
+        self.assertIs(analysis.arrays.edges, edges)
+        with self.assertRaises(ValueError):
+            MeshAnalysis(mesh, uv_options={'resolutoin': 64})
+
+    def test_analyze_path_loads_once_for_all_tiers(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            # Written by hand: trimesh drops UVs from its own OBJ export without a material
+            mesh = _textured_sphere()
+            path = Path(tmp) / 'sphere.obj'
+            lines = [f'v {x} {y} {z}' for x, y, z in mesh.vertices]
+            lines += [f'vt {u} {v}' for u, v in mesh.visual.uv]
+            lines += [f'f {a}/{a} {b}/{b} {c}/{c}' for a, b, c in mesh.faces + 1]
+            path.write_text('\n'.join(lines) + '\n')
+            with mock.patch.object(loaders, 'load_scene_or_mesh', wraps=loaders.load_scene_or_mesh) as load:
+                report = analyze_path(path, metrics='all,uv_quality', uv_options={'resolution': 128})
+            self.assertEqual(load.call_count, 1)
+            mesh = report['meshes'][0]
+            for key in ('num_faces', 'is_watertight', 'has_uv', 'coverage_pct', 'island_count',
+                        'symmetry_best_axis'):
+                self.assertIn(key, mesh)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+"""Tests for out-of-core (memmap) chunked smoothing."""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+try:
+    import numpy as np
+    import trimesh
+    from refiner_core import outofcore
+    from refiner_core.smoothing import smooth_vertices
+    HAS_DEPS = True
+except ImportError:
+    HAS_DEPS = False
+
+
+@unittest.skipIf(not HAS_DEPS, "Dependencies not available")
+class TestOutOfCore(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.temp_dir.name)
+        mesh = trimesh.creation.icosphere(subdivisions=5)
+        rng = np.random.default_rng(0)
+        mesh.vertices = mesh.vertices + rng.normal(scale=0.01, size=mesh.vertices.shape)
+        self.mesh = mesh
+        # Force many small chunks so halos cross chunk boundaries
+        self._min_core = outofcore.MIN_CORE_VERTICES
+        outofcore.MIN_CORE_VERTICES = 500
+
+    def tearDown(self):
+        outofcore.MIN_CORE_VERTICES = self._min_core
+        self.temp_dir.cleanup()
+
+    def test_obj_chunked_result_matches_in_memory(self):
+        src = self.temp_path / 'mesh.obj'
+        self.mesh.export(src.as_posix())
+        out = outofcore.smooth_file_out_of_core(src, self.temp_path / 'out', 'taubin', 4, 0.5, -0.53,
+                                                memory_budget_mb=0.1)
+        result = trimesh.load(out.as_posix(), process=False)
+        expected, _ = smooth_vertices(self.mesh.vertices, self.mesh.faces, 'taubin', 4, 0.5, -0.53)
+        np.testing.assert_array_equal(result.faces, self.mesh.faces)
+        np.testing.assert_allclose(result.vertices, expected, atol=1e-7)
+
+    def test_laplacian_restores_volume_like_in_memory(self):
+        src = self.temp_path / 'mesh.obj'
+        self.mesh.export(src.as_posix())
+        out = outofcore.smooth_file_out_of_core(src, self.temp_path / 'out', 'laplacian', 4, 0.5, -0.53,
+                                                memory_budget_mb=0.1)
+        result = trimesh.load(out.as_posix(), process=False)
+        expected, _ = smooth_vertices(self.mesh.vertices, self.mesh.faces, 'laplacian', 4, 0.5, -0.53,
+                                      center_mass=self.mesh.center_mass)
+        np.testing.assert_allclose(result.vertices, expected, atol=1e-7)
+        self.assertAlmostEqual(result.volume, self.mesh.volume, places=6)
+
+    def test_stl_soup_is_welded(self):
+        src = self.temp_path / 'mesh.stl'
+        self.mesh.export(src.as_posix())
+        mesh = outofcore.convert_to_memmap(src, self.temp_path / 'mm')
+        self.assertEqual(mesh.num_vertices, len(self.mesh.vertices))
+        self.assertEqual(mesh.num_faces, len(self.mesh.faces))
+
+    def test_incidence_in_small_blocks_matches_in_memory(self):
+        src = self.temp_path / 'mesh.obj'
+        self.mesh.export(src.as_posix())
+        mesh = outofcore.convert_to_memmap(src, self.temp_path / 'mm')
+        block_rows = outofcore.BLOCK_ROWS
+        outofcore.BLOCK_ROWS = 1000
+        try:
+            indptr, indices = outofcore.vertex_face_incidence(mesh)
+        finally:
+            outofcore.BLOCK_ROWS = block_rows
+        faces = np.asarray(mesh.faces())
+        np.testing.assert_array_equal(np.diff(indptr), np.bincount(faces.ravel(), minlength=mesh.num_vertices))
+        for v in (0, 17, mesh.num_vertices - 1):
+            np.testing.assert_array_equal(indices[indptr[v]:indptr[v + 1]],
+                                          np.flatnonzero((faces == v).any(axis=1)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+"""Tests for pipeline.process_file execution modes."""
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+try:
+    import numpy as np
+    import trimesh
+    from refiner_core import components
+    from refiner_core.components import component_batches, face_components
+    from refiner_core.pipeline import process_file
+    HAS_DEPS = True
+except ImportError:
+    HAS_DEPS = False
+
+
+PROCESS_ARGS = dict(
+    method='taubin', iterations=6, lamb=0.5, nu=-0.53,
+    smooth_textures=False, texture_method='bilateral', bilateral_d=9,
+    bilateral_sigma_color=75.0, bilateral_sigma_space=75.0,
+    gaussian_ksize=5, gaussian_sigma=1.2,
+)
+
+
+def _noisy_scene(count=4):
+    meshes = []
+    for i in range(count):
+        m = trimesh.creation.icosphere(subdivisions=2)
+        rng = np.random.default_rng(i)
+        m.vertices = m.vertices + rng.normal(scale=0.01, size=m.vertices.shape) + 3.0 * i
+        meshes.append(m)
+    return trimesh.Scene(meshes)
+
+
+@unittest.skipIf(not HAS_DEPS, "Dependencies not available")
+class TestSceneExecution(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.temp_dir.name)
+        self.src = self.temp_path / 'scene.glb'
+        _noisy_scene().export(self.src.as_posix())
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_parallel_workers_match_serial(self):
+        serial = process_file(self.src, self.temp_path / 'serial', **PROCESS_ARGS)
+        parallel = process_file(self.src, self.temp_path / 'parallel', workers=2, **PROCESS_ARGS)
+        a = trimesh.load(serial.as_posix())
+        b = trimesh.load(parallel.as_posix())
+        self.assertEqual(list(a.geometry), list(b.geometry))
+        for name in a.geometry:
+            np.testing.assert_allclose(a.geometry[name].vertices, b.geometry[name].vertices)
+
+    def test_face_coloured_geometries_are_repaired_in_process(self):
+        from refiner_core import pipeline
+        scene = _noisy_scene(count=2)
+        names = list(scene.geometry)
+        coloured = scene.geometry[names[0]]
+        coloured.visual.face_colors = np.tile([255, 0, 0, 255], (len(coloured.faces), 1))
+        run_tasks = pipeline._run_geometry_tasks
+        sent = []
+
+        def record(tasks, workers):
+            sent.extend(name for name, _, _ in tasks)
+            return run_tasks(tasks, workers)
+
+        with mock.patch('refiner_core.loaders.load_scene_or_mesh', return_value=(scene, True)), \
+                mock.patch.object(pipeline, '_run_geometry_tasks', side_effect=record):
+            process_file(self.src, self.temp_path / 'out', workers=2, **PROCESS_ARGS)
+        self.assertEqual(sent, names[1:])
+        self.assertEqual(coloured.visual.kind, 'face')
+        self.assertEqual(len(coloured.visual.face_colors), len(coloured.faces))
+
+
+@unittest.skipIf(not HAS_DEPS, "Dependencies not available")
+class TestComponentExecution(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.temp_dir.name)
+        self.parts = trimesh.util.concatenate(list(_noisy_scene(6).geometry.values()))
+        self.src = self.temp_path / 'parts.obj'
+        self.parts.export(self.src.as_posix())
+        self._min_faces = components.COMPONENT_BATCH_MIN_FACES
+        components.COMPONENT_BATCH_MIN_FACES = 300
+
+    def tearDown(self):
+        components.COMPONENT_BATCH_MIN_FACES = self._min_faces
+        self.temp_dir.cleanup()
+
+    def test_components_are_labelled_and_batched(self):
+        count, labels = face_components(self.parts.faces, len(self.parts.vertices))
+        self.assertEqual(count, 6)
+        batches = component_batches(labels, min_faces=700)
+        self.assertEqual(sum(len(b) for b in batches), len(self.parts.faces))
+        for batch in batches:
+            # Batches hold whole components only
+            for label in np.unique(labels[batch]):
+                self.assertEqual(np.sum(labels[batch] == label), np.sum(labels == label))
+
+    def test_split_components_match_whole_mesh(self):
+        serial = process_file(self.src, self.temp_path / 'serial', **PROCESS_ARGS)
+        split = process_file(self.src, self.temp_path / 'split', workers=2, split_components=True,
+                             **PROCESS_ARGS)
+        a = trimesh.load(serial.as_posix())
+        b = trimesh.load(split.as_posix())
+        self.assertEqual(len(a.faces), len(b.faces))
+        np.testing.assert_allclose(np.sort(a.vertices, axis=0), np.sort(b.vertices, axis=0))
+
+
+def _write_uv_obj(path, uv):
+    # Two triangles; trimesh drops UVs from its own OBJ export without a material
+    lines = ['v 0 0 0', 'v 1 0 0', 'v 1 1 0', 'v 0 1 0']
+    lines += [f'vt {u} {v}' for u, v in uv]
+    lines += ['f 1/1 2/2 3/3', 'f 1/1 3/3 4/4']
+    path.write_text('\n'.join(lines) + '\n')
+
+
+@unittest.skipIf(not HAS_DEPS, "Dependencies not available")
+class TestUnwrapGate(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_overlapping_unwrap_is_retried(self):
+        src = self.temp_path / 'quad.obj'
+        _write_uv_obj(src, [(0, 0), (1, 0), (1, 1), (0, 1)])
+        # First attempt folds both triangles onto each other, second is clean
+        bad = self.temp_path / 'bad.obj'
+        _write_uv_obj(bad, [(0, 0), (1, 0), (1, 1), (1, 0)])
+        good = self.temp_path / 'good.obj'
+        _write_uv_obj(good, [(0, 0), (1, 0), (1, 1), (0, 1)])
+        unwrap = mock.Mock(side_effect=[bad, good])
+        with mock.patch('refiner_core.loaders.try_blender_unwrap_uv', unwrap):
+            out = process_file(src, self.temp_path / 'out', unwrap_uv_with_blender=True,
+                               unwrap_attempts=3, **PROCESS_ARGS)
+        self.assertEqual(unwrap.call_count, 2)
+        self.assertIsNotNone(out)
+
+
+@unittest.skipIf(not HAS_DEPS, "Dependencies not available")
+class TestShardedExecution(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self.temp_dir.name)
+        self.src = self.temp_path / 'sphere.obj'
+        trimesh.creation.icosphere(subdivisions=3).export(self.src.as_posix())
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_tolerance_runs_are_not_sharded(self):
+        with mock.patch('refiner_core.sharding.smooth_sharded') as sharded:
+            process_file(self.src, self.temp_path / 'tol', shards=2, smoothing_tolerance=1e-3, **PROCESS_ARGS)
+            sharded.assert_not_called()
+            process_file(self.src, self.temp_path / 'plain', shards=2, **PROCESS_ARGS)
+            sharded.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+"""Tests for the array-based mesh repair engine."""
+
+import unittest
+
+try:
+    import numpy as np
+    import trimesh
+    from refiner_core.repair import (
+        fix_normals_trimesh,
+        orient_faces,
+        pre_repair_trimesh,
+        repair_arrays,
+        vertex_normals,
+        weld_vertices,
+    )
+    HAS_DEPS = True
+except ImportError:
+    HAS_DEPS = False
+
+
+def _triangle_soup(subdivisions=2):
+    mesh = trimesh.creation.icosphere(subdivisions=subdivisions)
+    soup = mesh.vertices[mesh.faces].reshape(-1, 3)
+    return mesh, soup, np.arange(len(soup)).reshape(-1, 3)
+
+
+@unittest.skipIf(not HAS_DEPS, "Dependencies not available")
+class TestRepairArrays(unittest.TestCase):
+    def test_report_counts_each_step(self):
+        mesh, soup, faces = _triangle_soup()
+        faces = np.vstack([faces, faces[:3][:, ::-1], [[0, 0, 1]]])
+        soup = np.vstack([soup, [[9.0, 9.0, 9.0]]])
+        result = repair_arrays(soup, faces)
+        self.assertEqual(result.report, {
+            'welded': 3 * len(mesh.faces) - len(mesh.vertices),
+            'degenerate': 1,
+            'duplicate': 3,
+            'unreferenced': 1,
+        })
+        self.assertEqual(len(result.vertices), len(mesh.vertices))
+        self.assertEqual(len(result.faces), len(mesh.faces))
+        self.assertEqual(result.vertex_map[-1], -1)
+        np.testing.assert_array_equal(result.vertices[result.vertex_map[faces[:5]]],
+                                      soup[faces[:5]])
+
+    def test_uv_seams_are_not_welded(self):
+        vertices = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [1, 0, 0], [1, 1, 0]], dtype=float)
+        faces = np.array([[0, 1, 2], [3, 4, 2]])
+        uv = np.array([[0, 0], [0.5, 0], [0, 1], [0.6, 0], [1, 1]])
+        self.assertEqual(repair_arrays(vertices, faces).report['welded'], 1)
+        self.assertEqual(repair_arrays(vertices, faces, uv=uv).report['welded'], 0)
+
+    def test_hard_edges_with_authored_normals_are_not_welded(self):
+        box = trimesh.creation.box()
+        soup = box.vertices[box.faces].reshape(-1, 3)
+        normals = np.repeat(box.face_normals, 3, axis=0)
+        faces = np.arange(len(soup)).reshape(-1, 3)
+        self.assertEqual(len(repair_arrays(soup, faces).vertices), 8)
+        self.assertEqual(len(repair_arrays(soup, faces, normals=normals).vertices), 24)
+        mesh = trimesh.Trimesh(soup, faces, vertex_normals=normals, process=False)
+        pre_repair_trimesh(mesh)
+        self.assertEqual(len(mesh.vertices), 24)
+
+    def test_weld_merges_pairs_straddling_grid_cells(self):
+        vertices = np.array([[0.49e-5, 0, 0], [0.51e-5, 0, 0], [1.0, 1.0, 1.0]])
+        source, inverse = weld_vertices(vertices, 1e-5)
+        np.testing.assert_array_equal(source, [0, 2])
+        np.testing.assert_array_equal(inverse, [0, 0, 1])
+
+    def test_weld_is_independent_of_chunk_size(self):
+        points = np.random.default_rng(0).random((2000, 3))
+        whole = weld_vertices(points, 0.02)
+        chunked = weld_vertices(points, 0.02, chunk_size=97)
+        np.testing.assert_array_equal(whole[0], chunked[0])
+        np.testing.assert_array_equal(whole[1], chunked[1])
+        self.assertLess(len(whole[0]), len(points))
+
+    def test_pre_repair_welds_soup(self):
+        mesh, soup, faces = _triangle_soup()
+        soup_mesh = trimesh.Trimesh(soup, faces, process=False)
+        pre_repair_trimesh(soup_mesh)
+        self.assertEqual(len(soup_mesh.vertices), len(mesh.vertices))
+        self.assertTrue(soup_mesh.is_watertight)
+
+
+@unittest.skipIf(not HAS_DEPS, "Dependencies not available")
+class TestOrientFaces(unittest.TestCase):
+    def _scrambled(self, mesh, seed=0):
+        faces = mesh.faces.copy()
+        flip = np.random.default_rng(seed).random(len(faces)) < 0.5
+        faces[flip] = faces[flip][:, ::-1]
+        return faces
+
+    def test_matches_trimesh_fix_normals_on_closed_bodies(self):
+        box = trimesh.creation.box().apply_translation([3, 0, 0])
+        meshes = [
+            trimesh.creation.icosphere(subdivisions=2),
+            trimesh.util.concatenate([trimesh.creation.icosphere(subdivisions=2), box]),
+        ]
+        for mesh in meshes:
+            faces = self._scrambled(mesh)
+            expected = trimesh.Trimesh(mesh.vertices, faces, process=False)
+            expected.fix_normals()
+            oriented, _ = orient_faces(mesh.vertices, faces)
+            np.testing.assert_array_equal(oriented, expected.faces)
+
+    def test_open_patch_is_consistently_wound(self):
+        sphere = trimesh.creation.icosphere(subdivisions=2)
+        patch = sphere.submesh([sphere.triangles_center[:, 2] > 0.2], append=True)
+        oriented, _ = orient_faces(patch.vertices, self._scrambled(patch))
+        self.assertTrue(trimesh.Trimesh(patch.vertices, oriented, process=False).is_winding_consistent)
+
+    def test_inverted_sphere_points_outwards(self):
+        sphere = trimesh.creation.icosphere(subdivisions=2)
+        oriented, flipped = orient_faces(sphere.vertices, sphere.faces[:, ::-1])
+        np.testing.assert_array_equal(oriented, sphere.faces)
+        self.assertTrue(flipped.all())
+
+    def test_fix_normals_keeps_authored_normals(self):
+        sphere = trimesh.creation.icosphere(subdivisions=2)
+        authored = np.tile([0.0, 0.0, 1.0], (len(sphere.vertices), 1))
+        mesh = trimesh.Trimesh(sphere.vertices, sphere.faces, vertex_normals=authored, process=False)
+        fix_normals_trimesh(mesh)
+        np.testing.assert_array_equal(mesh.vertex_normals, authored)
+
+    def test_vertex_normals_are_radial_on_sphere(self):
+        sphere = trimesh.creation.icosphere(subdivisions=3)
+        normals = vertex_normals(sphere.vertices, sphere.faces)
+        np.testing.assert_allclose(np.linalg.norm(normals, axis=1), 1.0)
+        self.assertGreater(np.einsum('ij,ij->i', normals, sphere.vertices).min(), 0.99)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+"""Tests for spatially sharded smoothing."""
+
+import unittest
+
+try:
+    import numpy as np
+    import trimesh
+    from refiner_core.sharding import shard_ranges, smooth_sharded
+    from refiner_core.smoothing import smooth_trimesh_inplace
+    HAS_DEPS = True
+except ImportError:
+    HAS_DEPS = False
+
+
+@unittest.skipIf(not HAS_DEPS, "Dependencies not available")
+class TestShardedSmoothing(unittest.TestCase):
+    def _noisy_sphere(self):
+        mesh = trimesh.creation.icosphere(subdivisions=4)
+        rng = np.random.default_rng(7)
+        mesh.vertices = mesh.vertices + rng.normal(scale=0.01, size=mesh.vertices.shape)
+        return mesh
+
+    def test_shard_ranges_cover_all_vertices(self):
+        ranges = shard_ranges(10, 3)
+        self.assertEqual(ranges[0][0], 0)
+        self.assertEqual(ranges[-1][1], 10)
+        self.assertEqual(sum(b - a for a, b in ranges), 10)
+
+    def test_sharded_matches_serial(self):
+        for method in ('taubin', 'laplacian'):
+            mesh = self._noisy_sphere()
+            serial = mesh.copy()
+            smooth_trimesh_inplace(serial, method, 4, 0.5, -0.53)
+            ran = smooth_sharded(mesh, method, 4, 0.5, -0.53, shards=3, workers=2)
+            self.assertEqual(ran, 4)
+            np.testing.assert_allclose(mesh.vertices, serial.vertices, atol=1e-12)
+            self.assertAlmostEqual(mesh.volume, serial.volume, places=9)
+
+    def test_rejects_implicit(self):
+        with self.assertRaises(ValueError):
+            smooth_sharded(self._noisy_sphere(), 'implicit', 4, 0.5, -0.53, shards=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+"""Tests for shared-memory array transport."""
+
+import unittest
+
+try:
+    import numpy as np
+    from refiner_core.shared_arrays import (
+        SharedArray,
+        SharedArrayStore,
+        attached_arrays,
+        export_arrays,
+        unpack_arrays,
+    )
+    HAS_DEPS = True
+except ImportError:
+    HAS_DEPS = False
+
+
+@unittest.skipIf(not HAS_DEPS, "Dependencies not available")
+class TestSharedArrays(unittest.TestCase):
+    def test_pack_attach_roundtrip(self):
+        verts = np.arange(30, dtype=np.float64).reshape(10, 3)
+        faces = np.array([[0, 1, 2]], dtype=np.int64)
+        with SharedArrayStore(min_bytes=64) as store:
+            packed = store.pack({'vertices': verts, 'faces': faces})
+            self.assertIsInstance(packed['vertices'], SharedArray)
+            # Small arrays are passed through untouched
+            self.assertIs(packed['faces'], faces)
+            with attached_arrays(packed) as views:
+                np.testing.assert_array_equal(views['vertices'], verts)
+                views['vertices'][0, 0] = -1.0
+            with attached_arrays(packed) as views:
+                self.assertEqual(views['vertices'][0, 0], -1.0)
+
+    def test_export_then_unpack_transfers_ownership(self):
+        data = np.linspace(0.0, 1.0, 64)
+        exported = export_arrays({'x': data, 'n': 3}, min_bytes=0)
+        out = unpack_arrays(exported)
+        np.testing.assert_array_equal(out['x'], data)
+        self.assertEqual(out['n'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
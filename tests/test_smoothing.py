@@ -0,0 +1,176 @@
+"""Tests for the sparse-operator smoothing engine."""
+
+import unittest
+
+try:
+    import numpy as np
+    import trimesh
+    from trimesh import smoothing as tmsmooth
+    from refiner_core.smoothing import (
+        ImplicitSolver,
+        build_laplacian_operator,
+        normalize_mesh_arrays,
+        smooth_trimesh_inplace,
+        smooth_vertices,
+    )
+    from refiner_core.operator_cache import OperatorCache, topology_key
+    from refiner_core.scheduler import SmoothingCostModel, plan_smoothing
+    HAS_DEPS = True
+except ImportError:
+    HAS_DEPS = False
+
+
+def _noisy_sphere(subdivisions=3, seed=0):
+    mesh = trimesh.creation.icosphere(subdivisions=subdivisions)
+    rng = np.random.default_rng(seed)
+    mesh.vertices = mesh.vertices + rng.normal(scale=0.01, size=mesh.vertices.shape)
+    return mesh
+
+
+@unittest.skipIf(not HAS_DEPS, "Dependencies not available")
+class TestSparseSmoothing(unittest.TestCase):
+    def test_operator_rows_average_neighbours(self):
+        faces = np.array([[0, 1, 2], [0, 2, 3]])
+        W = build_laplacian_operator(faces, 5)
+        sums = np.asarray(W.sum(axis=1)).ravel()
+        np.testing.assert_allclose(sums, np.ones(5))
+        # Vertex 4 is unreferenced and must map onto itself
+        self.assertEqual(W[4, 4], 1.0)
+        self.assertAlmostEqual(W[1, 0], 0.5)
+
+    def test_taubin_matches_trimesh(self):
+        mesh = _noisy_sphere()
+        expected = mesh.copy()
+        tmsmooth.filter_taubin(expected, lamb=0.5, nu=0.53, iterations=10)
+        smooth_trimesh_inplace(mesh, 'taubin', 10, 0.5, -0.53)
+        np.testing.assert_allclose(mesh.vertices, expected.vertices, atol=1e-10)
+
+    def test_laplacian_matches_trimesh(self):
+        mesh = _noisy_sphere()
+        expected = mesh.copy()
+        tmsmooth.filter_laplacian(expected, lamb=0.5, iterations=5)
+        smooth_trimesh_inplace(mesh, 'laplacian', 5, 0.5, -0.53)
+        np.testing.assert_allclose(mesh.vertices, expected.vertices, atol=1e-10)
+
+    def test_smooth_vertices_reuses_operator(self):
+        mesh = _noisy_sphere()
+        W = build_laplacian_operator(mesh.faces, len(mesh.vertices))
+        a, _ = smooth_vertices(mesh.vertices, mesh.faces, 'taubin', 4, 0.5, -0.53, operator=W)
+        b, _ = smooth_vertices(mesh.vertices, mesh.faces, 'taubin', 4, 0.5, -0.53)
+        np.testing.assert_allclose(a, b)
+
+    def test_implicit_matches_trimesh_backward_euler(self):
+        mesh = _noisy_sphere()
+        expected = mesh.copy()
+        tmsmooth.filter_laplacian(expected, lamb=5.0, iterations=1, implicit_time_integration=True)
+        smooth_trimesh_inplace(mesh, 'implicit', 10, 0.5, -0.53)
+        np.testing.assert_allclose(mesh.vertices, expected.vertices, atol=1e-10)
+
+    def test_implicit_cg_agrees_with_direct(self):
+        mesh = _noisy_sphere()
+        W = build_laplacian_operator(mesh.faces, len(mesh.vertices))
+        V = np.asarray(mesh.vertices)
+        direct = ImplicitSolver(W, 20.0, solver='direct').solve(V)
+        cg = ImplicitSolver(W, 20.0, solver='cg').solve(V)
+        np.testing.assert_allclose(direct, cg, atol=1e-6)
+
+    def test_tolerance_stops_early(self):
+        mesh = _noisy_sphere()
+        full, ran_full = smooth_vertices(mesh.vertices, mesh.faces, 'laplacian', 200, 0.5, -0.53)
+        early, ran = smooth_vertices(mesh.vertices, mesh.faces, 'laplacian', 200, 0.5, -0.53,
+                                     tolerance=1e-4)
+        self.assertEqual(ran_full, 200)
+        self.assertLess(ran, 200)
+        self.assertGreater(ran, 0)
+
+    def test_taubin_tolerance_stops_on_full_pairs(self):
+        mesh = _noisy_sphere()
+        _, ran = smooth_vertices(mesh.vertices, mesh.faces, 'taubin', 101, 0.5, -0.53, tolerance=1e-3)
+        self.assertEqual(ran % 2, 0)
+        self.assertEqual(smooth_trimesh_inplace(mesh, 'taubin', 101, 0.5, -0.53, tolerance=1e-3), ran)
+
+    def test_single_precision_matches_double(self):
+        mesh = _noisy_sphere()
+        for method in ('taubin', 'laplacian', 'implicit'):
+            double, _ = smooth_vertices(mesh.vertices, mesh.faces, method, 10, 0.5, -0.53)
+            single, _ = smooth_vertices(mesh.vertices, mesh.faces, method, 10, 0.5, -0.53,
+                                        precision='single')
+            self.assertEqual(single.dtype, np.float32)
+            np.testing.assert_allclose(single, double, atol=1e-5)
+
+    def test_single_precision_skips_float64_normalisation(self):
+        class Arrays:
+            vertices = np.zeros((3, 3), dtype=np.float32)
+            faces = np.array([[0, 1, 2]], dtype=np.int32)
+        single, double = Arrays(), Arrays()
+        normalize_mesh_arrays(single, 'single')
+        normalize_mesh_arrays(double, 'double')
+        self.assertIs(single.vertices, Arrays.vertices)
+        self.assertEqual((double.vertices.dtype, double.faces.dtype), (np.float64, np.int64))
+
+
+@unittest.skipIf(not HAS_DEPS, "Dependencies not available")
+class TestOperatorCache(unittest.TestCase):
+    def test_shared_topology_hits_cache(self):
+        cache = OperatorCache()
+        mesh = _noisy_sphere(seed=1)
+        other = _noisy_sphere(seed=2)
+        a, _ = smooth_vertices(mesh.vertices, mesh.faces, 'implicit', 4, 0.5, -0.53, cache=cache)
+        misses = cache.misses
+        b, _ = smooth_vertices(other.vertices, other.faces, 'implicit', 4, 0.5, -0.53, cache=cache)
+        self.assertEqual(cache.misses, misses)
+        self.assertGreater(cache.hits, 0)
+        expected, _ = smooth_vertices(other.vertices, other.faces, 'implicit', 4, 0.5, -0.53)
+        np.testing.assert_allclose(b, expected)
+        self.assertEqual(a.shape, b.shape)
+
+    def test_lru_eviction_respects_byte_cap(self):
+        cache = OperatorCache(max_bytes=100)
+        cache.put('a', object(), nbytes=60)
+        cache.put('b', object(), nbytes=30)
+        cache.get('a')
+        cache.put('c', object(), nbytes=30)
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertLessEqual(cache.nbytes, 100)
+
+    def test_topology_key_depends_on_faces(self):
+        faces = np.array([[0, 1, 2]])
+        self.assertEqual(topology_key(faces, 3), topology_key(faces.copy(), 3))
+        self.assertNotEqual(topology_key(faces, 3), topology_key(faces[:, ::-1], 3))
+
+
+@unittest.skipIf(not HAS_DEPS, "Dependencies not available")
+class TestSmoothingScheduler(unittest.TestCase):
+    def setUp(self):
+        # 1 microsecond per operator entry keeps the arithmetic readable
+        self.model = SmoothingCostModel(seconds_per_element=1e-6)
+
+    def test_no_budget_keeps_request(self):
+        plan = plan_smoothing(2_000_000, 3_000_000, 'taubin', 10, 0.5, model=self.model)
+        self.assertEqual((plan.iterations, plan.lamb), (10, 0.5))
+
+    def test_zero_iterations_are_kept(self):
+        for budget in (None, 0.052):
+            plan = plan_smoothing(1000, 1500, 'taubin', 0, 0.5, budget_seconds=budget, model=self.model)
+            self.assertEqual(plan.iterations, 0)
+
+    def test_budget_limits_iterations_and_keeps_taubin_pairs(self):
+        # 1000 vertices + 2 * 1500 edges = 4 ms per iteration, 32 ms setup
+        plan = plan_smoothing(1000, 1500, 'taubin', 10, 0.5, budget_seconds=0.052, model=self.model)
+        self.assertEqual(plan.iterations, 4)
+        self.assertEqual(plan.lamb, 0.5)
+        self.assertLessEqual(plan.estimated_seconds, 0.052)
+
+    def test_laplacian_raises_lambda_when_cut(self):
+        plan = plan_smoothing(1000, 1500, 'laplacian', 10, 0.2, budget_seconds=0.0525, model=self.model)
+        self.assertEqual(plan.iterations, 5)
+        self.assertAlmostEqual(plan.lamb, 0.4)
+
+    def test_calibration_probe_sets_cost(self):
+        model = SmoothingCostModel()
+        self.assertGreater(model.calibrate(grid=32, repeats=2), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,164 @@
+"""Tests for the UV quality analyzer."""
+
+import unittest
+
+try:
+    import numpy as np
+    import cv2
+    import trimesh
+    from uv_analyzer import analyze_geom, exact_uv_overlap, island_stats, rasterize_uv, uv_islands
+    HAS_DEPS = True
+except ImportError:
+    HAS_DEPS = False
+
+
+def _fill_convex_poly_reference(faces, uv, res):
+    # The original per-triangle full-canvas rasterizer
+    acc = np.zeros((res, res), dtype=np.uint16)
+    uv_px = np.clip((uv * (res - 1)).astype(np.float32), 0, res - 1)
+    for tri in faces:
+        mask = np.zeros((res, res), dtype=np.uint8)
+        cv2.fillConvexPoly(mask, uv_px[tri].astype(np.int32), 1)
+        acc += mask.astype(np.uint16)
+    return acc
+
+
+@unittest.skipIf(not HAS_DEPS, "Dependencies not available")
+class TestRasterizeUV(unittest.TestCase):
+    def test_matches_fill_convex_poly(self):
+        rng = np.random.default_rng(0)
+        for res in (16, 97):
+            for trial in range(10):
+                n = int(rng.integers(1, 40))
+                uv = rng.random((3 * n, 2)) * 1.2 - 0.1
+                if trial % 2:
+                    # Small, heavily overlapping triangles
+                    uv = uv * 0.1 + 0.4
+                faces = rng.integers(0, len(uv), (n, 3))
+                expected = _fill_convex_poly_reference(faces, uv, res)
+                acc, coverage, overlap = rasterize_uv(faces, uv, res)
+                np.testing.assert_array_equal(acc, expected)
+                self.assertEqual(coverage, np.count_nonzero(expected >= 1))
+                self.assertEqual(overlap, np.count_nonzero(expected >= 2))
+
+    def test_degenerate_triangles_draw_their_outline(self):
+        uv = np.array([[0.1, 0.1], [0.9, 0.5], [0.5, 0.3], [0.2, 0.2]])
+        faces = np.array([[0, 1, 2], [3, 3, 3]])
+        acc, _, _ = rasterize_uv(faces, uv, 32)
+        np.testing.assert_array_equal(acc, _fill_convex_poly_reference(faces, uv, 32))
+
+
+@unittest.skipIf(not HAS_DEPS, "Dependencies not available")
+class TestExactOverlap(unittest.TestCase):
+    def test_grid_without_overlap_reports_nothing(self):
+        # A 20x20 quad grid: neighbours share edges and vertices only
+        g = np.linspace(0.0, 1.0, 21)
+        uv = np.stack(np.meshgrid(g, g), axis=-1).reshape(-1, 2)
+        idx = np.arange(21 * 21).reshape(21, 21)
+        a, b, c, d = idx[:-1, :-1].ravel(), idx[:-1, 1:].ravel(), idx[1:, 1:].ravel(), idx[1:, :-1].ravel()
+        faces = np.concatenate([np.stack([a, b, c], 1), np.stack([a, c, d], 1)])
+        pairs, areas = exact_uv_overlap(faces, uv)
+        self.assertEqual(len(pairs), 0)
+        self.assertEqual(len(areas), 0)
+
+    def test_pairs_and_areas_match_brute_force(self):
+        rng = np.random.default_rng(1)
+        uv = rng.random((90, 2))
+        faces = rng.integers(0, len(uv), (30, 3))
+        pairs, areas = exact_uv_overlap(faces, uv)
+        # Independent check: point sampling on a fine lattice
+        xs = (np.arange(400) + 0.5) / 400
+        pts = np.stack(np.meshgrid(xs, xs), axis=-1).reshape(-1, 2)
+        def inside(tri):
+            e = [(tri[(k + 1) % 3, 0] - tri[k, 0]) * (pts[:, 1] - tri[k, 1])
+                 - (tri[(k + 1) % 3, 1] - tri[k, 1]) * (pts[:, 0] - tri[k, 0]) for k in range(3)]
+            e = np.stack(e)
+            return (e > 0).all(0) | (e < 0).all(0)
+        masks = [inside(uv[f]) for f in faces]
+        for (i, j), area in zip(pairs, areas):
+            self.assertAlmostEqual(area, np.count_nonzero(masks[i] & masks[j]) / len(pts), delta=0.01)
+        found = {tuple(p) for p in pairs}
+        for i in range(len(faces)):
+            for j in range(i + 1, len(faces)):
+                if np.count_nonzero(masks[i] & masks[j]) > 50:
+                    self.assertIn((i, j), found)
+
+    def test_stacked_layout_in_small_pair_blocks(self):
+        # Eight copies of one grid stacked on top of each other: crowded cells
+        from refiner_core import uv_metrics
+        g = np.linspace(0.0, 1.0, 6)
+        uv = np.stack(np.meshgrid(g, g), axis=-1).reshape(-1, 2)
+        idx = np.arange(36).reshape(6, 6)
+        a, b, c, d = idx[:-1, :-1].ravel(), idx[:-1, 1:].ravel(), idx[1:, 1:].ravel(), idx[1:, :-1].ravel()
+        grid = np.concatenate([np.stack([a, b, c], 1), np.stack([a, c, d], 1)])
+        faces = np.concatenate([grid + 36 * k for k in range(8)])
+        uv = np.tile(uv, (8, 1))
+        expected, expected_areas = exact_uv_overlap(faces, uv)
+        chunk = uv_metrics.OVERLAP_CHUNK_PAIRS
+        uv_metrics.OVERLAP_CHUNK_PAIRS = 7
+        try:
+            pairs, areas = exact_uv_overlap(faces, uv)
+        finally:
+            uv_metrics.OVERLAP_CHUNK_PAIRS = chunk
+        # Every copy of a face overlaps the other seven copies
+        self.assertEqual(len(expected), len(grid) * 28)
+        np.testing.assert_array_equal(pairs, expected)
+        np.testing.assert_allclose(areas, expected_areas)
+
+    def test_thin_sliver_overlap_is_found(self):
+        uv = np.array([[0.1, 0.1], [0.9, 0.1], [0.5, 0.9], [0.1, 0.1001], [0.9, 0.1001], [0.5, 0.0]])
+        faces = np.array([[0, 1, 2], [3, 4, 5]])
+        pairs, areas = exact_uv_overlap(faces, uv)
+        np.testing.assert_array_equal(pairs, [[0, 1]])
+        self.assertGreater(areas[0], 0.0)
+        self.assertLess(areas[0], 1e-4)
+
+
+def _two_quads(second_uv_scale=1.0, split_seam=True):
+    # Two unit quads sharing the edge x=1; the second quad's UVs start at
+    # u=0.5 (a seam) or continue the first quad's (no seam)
+    verts = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
+                      [1, 0, 0], [2, 0, 0], [2, 1, 0], [1, 1, 0]], dtype=np.float64)
+    faces = np.array([[0, 1, 2], [0, 2, 3], [4, 5, 6], [4, 6, 7]])
+    uv = verts[:, :2] * 0.25
+    if split_seam:
+        uv[4:] = (verts[4:, :2] - [1, 0]) * 0.25 * second_uv_scale + [0.5, 0]
+    return verts, faces, uv
+
+
+@unittest.skipIf(not HAS_DEPS, "Dependencies not available")
+class TestUVIslands(unittest.TestCase):
+    def test_seams_split_islands_but_duplicate_vertices_do_not(self):
+        verts, faces, uv = _two_quads(split_seam=True)
+        count, labels = uv_islands(verts, faces, uv)
+        self.assertEqual(count, 2)
+        np.testing.assert_array_equal(labels, [0, 0, 1, 1])
+        # Vertices 4 and 7 duplicate 1 and 2 with identical UVs: one island
+        verts, faces, uv = _two_quads(split_seam=False)
+        count, labels = uv_islands(verts, faces, uv)
+        self.assertEqual(count, 1)
+
+    def test_stats_per_island(self):
+        verts, faces, uv = _two_quads(second_uv_scale=3.0)
+        faces[3] = faces[3, [0, 2, 1]]
+        count, labels = uv_islands(verts, faces, uv)
+        stats = island_stats(verts, faces, uv, labels, count, 1024)
+        np.testing.assert_array_equal(stats['face_count'], [2, 2])
+        np.testing.assert_allclose(stats['uv_area'], [0.0625, 0.5625])
+        np.testing.assert_allclose(stats['area_3d'], [1.0, 1.0])
+        np.testing.assert_allclose(stats['texel_density'], [256.0, 768.0])
+        np.testing.assert_allclose(stats['uv_bbox'], [[0, 0, 0.25, 0.25], [0.5, 0, 1.25, 0.75]])
+        np.testing.assert_array_equal(stats['inverted_count'], [0, 1])
+
+    def test_analyze_geom_flags_texel_density_outliers(self):
+        verts, faces, uv = _two_quads(second_uv_scale=3.0)
+        mesh = trimesh.Trimesh(verts, faces, process=False,
+                               visual=trimesh.visual.TextureVisuals(uv=uv))
+        rep = analyze_geom('quads', mesh, 64, wrap_uv=False, islands=True)
+        self.assertEqual(rep['island_count'], 2)
+        self.assertEqual(rep['texel_outlier_islands'], 1)
+        self.assertEqual([i['faces'] for i in rep['islands']], [2, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
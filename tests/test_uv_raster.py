@@ -0,0 +1,38 @@
+"""Tests for the shared UV rasterizer."""
+
+import unittest
+
+try:
+    import numpy as np
+    from refiner_core.uv_raster import UVRasterizer, adaptive_resolution, rasterize_uv
+    HAS_DEPS = True
+except ImportError:
+    HAS_DEPS = False
+
+
+@unittest.skipIf(not HAS_DEPS, "Dependencies not available")
+class TestUVRasterizer(unittest.TestCase):
+    def test_adaptive_resolution_is_clamped_power_of_two(self):
+        self.assertEqual(adaptive_resolution(0), 256)
+        self.assertEqual(adaptive_resolution(100_000), 1024)
+        self.assertEqual(adaptive_resolution(10**8), 2048)
+        self.assertEqual(adaptive_resolution(10**8, max_res=512), 512)
+
+    def test_measure_matches_rasterize_and_reuses_buffer(self):
+        rng = np.random.default_rng(1)
+        uv = rng.random((60, 2))
+        faces = rng.integers(0, len(uv), (20, 3))
+        rast = UVRasterizer()
+        for res in (128, 64, 128):
+            met = rast.measure(faces, uv, res=res)
+            acc, coverage, overlap = rasterize_uv(faces, uv, res)
+            self.assertEqual(met['uv_raster_resolution'], res)
+            self.assertAlmostEqual(met['uv_coverage_pct'], coverage / res ** 2 * 100.0)
+            self.assertAlmostEqual(met['uv_overlap_pct'], overlap / max(coverage, 1) * 100.0)
+        buf = rast._acc
+        rast.measure(faces, uv, res=32)
+        self.assertIs(rast._acc, buf)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,30 @@
 import argparse
 from pathlib import Path
-from typing import Dict, Any, List, Tuple, Optional
+from typing import Dict, Any, List, Tuple
 
 import numpy as np
 
+# Metric code is shared with refiner_core.analyzer; the building blocks
+# scripts use stay importable from here
+from refiner_core.uv_metrics import (exact_uv_overlap, inverted_uv_tris, island_stats, tri_areas_2d,
+                                     tri_areas_3d, uv_islands, uv_quality, wrap01)
+from refiner_core.uv_raster import rasterize_uv
+
+__all__ = [
+    'analyze_file',
+    'analyze_geom',
+    'exact_uv_overlap',
+    'inverted_uv_tris',
+    'island_stats',
+    'main',
+    'process_path',
+    'rasterize_uv',
+    'tri_areas_2d',
+    'tri_areas_3d',
+    'uv_islands',
+    'wrap01',
+]
+
 
 def eprint(*a, **k):
     import sys
@@ -37,64 +58,10 @@ def load_geometries(path: Path):
     return geoms
 
 
-def wrap01(uv: np.ndarray) -> np.ndarray:
-    return np.mod(uv, 1.0)
-
-
-def tri_areas_2d(uv: np.ndarray, faces: np.ndarray) -> np.ndarray:
-    # uv: (N,2), faces: (M,3)
-    a = uv[faces[:, 0]]
-    b = uv[faces[:, 1]]
-    c = uv[faces[:, 2]]
-    # area = 0.5 * |(b-a) x (c-a)| in 2D
-    v1 = b - a
-    v2 = c - a
-    cross = v1[:, 0] * v2[:, 1] - v1[:, 1] * v2[:, 0]
-    return 0.5 * np.abs(cross)
-
-
-def tri_areas_3d(verts: np.ndarray, faces: np.ndarray) -> np.ndarray:
-    a = verts[faces[:, 0]]
-    b = verts[faces[:, 1]]
-    c = verts[faces[:, 2]]
-    v1 = b - a
-    v2 = c - a
-    cross = np.cross(v1, v2)
-    return 0.5 * np.linalg.norm(cross, axis=1)
-
-
-def inverted_uv_tris(uv: np.ndarray, faces: np.ndarray) -> np.ndarray:
-    a = uv[faces[:, 0]]
-    b = uv[faces[:, 1]]
-    c = uv[faces[:, 2]]
-    v1 = b - a
-    v2 = c - a
-    cross = v1[:, 0] * v2[:, 1] - v1[:, 1] * v2[:, 0]
-    return cross < 0.0
-
-
-def rasterize_uv(faces: np.ndarray, uv: np.ndarray, res: int) -> Tuple[np.ndarray, float, float]:
-    """Rasterize UV triangles into an accumulation buffer.
-
-    Returns: (accum array, coverage_px, overlap_px)
-    """
-    _, cv2 = try_imports()
-    acc = np.zeros((res, res), dtype=np.uint16)
-    # Scale uv to pixel coordinates [0, res-1]
-    uv_px = np.clip((uv * (res - 1)).astype(np.float32), 0, res - 1)
-    for tri in faces:
-        pts = uv_px[tri].astype(np.int32)
-        # Build a temp mask
-        mask = np.zeros((res, res), dtype=np.uint8)
-        # y is v-coordinate mapping to row (flip v to image row if desired)
-        cv2.fillConvexPoly(mask, pts[:, [0, 1]], 1)  # pts: [u,v]
-        acc += mask.astype(np.uint16)
-    coverage_px = int(np.count_nonzero(acc >= 1))
-    overlap_px = int(np.count_nonzero(acc >= 2))
-    return acc, float(coverage_px), float(overlap_px)
-
-
-def analyze_geom(name: str, mesh, res: int, wrap_uv: bool) -> Dict[str, Any]:
+
+
+def analyze_geom(name: str, mesh, res: int, wrap_uv: bool, exact_overlap: bool = False,
+                 texture_size: int = 1024, islands: bool = False) -> Dict[str, Any]:
     result: Dict[str, Any] = {"name": name}
     verts = np.asarray(mesh.vertices) if getattr(mesh, 'vertices', None) is not None else None
     faces = np.asarray(mesh.faces) if getattr(mesh, 'faces', None) is not None else None
@@ -116,44 +83,30 @@ def analyze_geom(name: str, mesh, res: int, wrap_uv: bool) -> Dict[str, Any]:
 
     result["has_uv"] = True
     uv = uv[:, :2].astype(np.float64, copy=False)
-    faces = faces.astype(np.int64, copy=False)
 
     # OOB before wrapping
     oob_mask = (uv[:, 0] < 0) | (uv[:, 0] > 1) | (uv[:, 1] < 0) | (uv[:, 1] > 1)
     oob_pct = float(np.count_nonzero(oob_mask)) / float(len(uv)) * 100.0
     result["uv_oob_vertex_pct"] = round(oob_pct, 4)
 
-    uv_wrapped = wrap01(uv) if wrap_uv else uv.copy()
-
-    # Areas and stretching
-    uv_area = tri_areas_2d(uv_wrapped, faces)
-    geo_area = tri_areas_3d(verts.astype(np.float64), faces)
-    valid = geo_area > 1e-12
-    stretch = np.zeros_like(geo_area)
-    stretch[valid] = uv_area[valid] / geo_area[valid]
-    # Use robust stats
-    if np.any(valid):
-        result["stretch_ratio_mean"] = float(np.mean(stretch[valid]))
-        result["stretch_ratio_median"] = float(np.median(stretch[valid]))
-    else:
-        result["stretch_ratio_mean"] = 0.0
-        result["stretch_ratio_median"] = 0.0
-
-    # Inverted UV triangles
-    inv_mask = inverted_uv_tris(uv_wrapped, faces)
-    result["inverted_tri_pct"] = round(float(np.count_nonzero(inv_mask)) / float(len(faces)) * 100.0, 4)
+    result.update(uv_quality(verts, faces, uv, res, wrap_uv, exact_overlap, texture_size, islands))
+    return result
 
-    # Rasterization into [0,1] to estimate coverage and overlap
-    _, coverage_px, overlap_px = rasterize_uv(faces, uv_wrapped, res)
-    total_px = float(res * res)
-    result["coverage_pct"] = round(coverage_px / total_px * 100.0, 4)
-    result["overlap_px"] = int(overlap_px)
-    result["overlap_pct_of_covered"] = round((overlap_px / max(coverage_px, 1.0)) * 100.0, 4)
 
-    return result
+# Bump when a metric's definition or report layout changes (invalidates cached reports)
+UV_ANALYZER_VERSION = '2'
 
 
-def analyze_file(path: Path, res: int, wrap_uv: bool) -> Dict[str, Any]:
+def analyze_file(path: Path, res: int, wrap_uv: bool, cache=None, exact_overlap: bool = False,
+                 texture_size: int = 1024, islands: bool = False) -> Dict[str, Any]:
+    if cache is not None:
+        params = {'resolution': int(res), 'wrap_uv': bool(wrap_uv), 'exact_overlap': bool(exact_overlap),
+                  'texture_size': int(texture_size), 'islands': bool(islands)}
+        rep = cache.get_or_compute(path, 'uv_analyzer', UV_ANALYZER_VERSION, params,
+                                   lambda: analyze_file(path, res, wrap_uv, exact_overlap=exact_overlap,
+                                                        texture_size=texture_size, islands=islands))
+        rep["file"] = str(path)
+        return rep
     geoms = load_geometries(path)
     out: Dict[str, Any] = {
         "file": str(path),
@@ -165,20 +118,22 @@ def analyze_file(path: Path, res: int, wrap_uv: bool) -> Dict[str, Any]:
         return out
     for name, geom in geoms:
         try:
-            out["meshes"].append(analyze_geom(name, geom, res, wrap_uv))
+            out["meshes"].append(analyze_geom(name, geom, res, wrap_uv, exact_overlap, texture_size, islands))
         except Exception as ex:
             out["meshes"].append({"name": name, "error": str(ex)})
     return out
 
 
-def process_path(input_path: Path, res: int, wrap_uv: bool) -> List[Dict[str, Any]]:
+def process_path(input_path: Path, res: int, wrap_uv: bool, cache=None,
+                 exact_overlap: bool = False, texture_size: int = 1024,
+                 islands: bool = False) -> List[Dict[str, Any]]:
     results: List[Dict[str, Any]] = []
     if input_path.is_dir():
         for ext in ('*.obj', '*.glb', '*.gltf'):
             for p in input_path.rglob(ext):
-                results.append(analyze_file(p, res, wrap_uv))
+                results.append(analyze_file(p, res, wrap_uv, cache, exact_overlap, texture_size, islands))
     else:
-        results.append(analyze_file(input_path, res, wrap_uv))
+        results.append(analyze_file(input_path, res, wrap_uv, cache, exact_overlap, texture_size, islands))
     return results
 
 
@@ -200,7 +155,9 @@ def print_summary(reports: List[Dict[str, Any]]):
             if not m.get("has_uv", False):
                 print(f"  {name}: no UVs")
                 continue
-            print(f"  {name}: coverage={m['coverage_pct']}% overlapCovered={m['overlap_pct_of_covered']}% oobVerts={m['uv_oob_vertex_pct']}% invTris={m['inverted_tri_pct']}% stretch(med)={m['stretch_ratio_median']:.6f}")
+            exact = f" overlapExact={m['overlap_area_pct']}% ({m['overlap_pairs']} pairs)" if 'overlap_area_pct' in m else ''
+            print(f"  {name}: coverage={m['coverage_pct']}% overlapCovered={m['overlap_pct_of_covered']}%{exact} oobVerts={m['uv_oob_vertex_pct']}% invTris={m['inverted_tri_pct']}% stretch(med)={m['stretch_ratio_median']:.6f}")
+            print(f"    islands={m['island_count']} texelDensity(med)={m['texel_density_median']}/unit outlierIslands={m['texel_outlier_islands']}")
 
 
 def main(argv=None):
@@ -209,17 +166,32 @@ def main(argv=None):
     ap.add_argument('--resolution', type=int, default=1024, help='Raster resolution for coverage/overlap')
     ap.add_argument('--no-wrap', action='store_true', help='Do not wrap UVs into [0,1] for coverage calc')
     ap.add_argument('--json-out', type=str, default=None, help='Write full JSON report to this path')
+    ap.add_argument('--exact-overlap', action='store_true',
+                    help='Also compute resolution-independent overlap from exact triangle intersections')
+    ap.add_argument('--texture-size', type=int, default=1024,
+                    help='Texture size in pixels used to express texel density (texels per world unit)')
+    ap.add_argument('--islands', action='store_true', help='Include per-island statistics in the JSON report')
+    ap.add_argument('--cache', type=str, default=None, help='SQLite file caching reports; unchanged files are not re-analysed')
+    ap.add_argument('--cache-verify-hash', action='store_true', help='Also check a content hash on every cache hit')
     args = ap.parse_args(argv)
 
     input_path = Path(args.input).expanduser().resolve()
     if not input_path.exists():
         eprint(f"Input not found: {input_path}")
         return 1
+    cache = None
+    if args.cache:
+        from refiner_core.analysis_cache import AnalysisCache
+        cache = AnalysisCache(Path(args.cache).expanduser().resolve(), verify_hash=args.cache_verify_hash)
     try:
-        reports = process_path(input_path, args.resolution, not args.no_wrap)
+        reports = process_path(input_path, args.resolution, not args.no_wrap, cache, args.exact_overlap,
+                               args.texture_size, args.islands)
     except Exception as ex:
         eprint(f"Analysis failed: {ex}")
         return 2
+    finally:
+        if cache is not None:
+            cache.close()
 
     print_summary(reports)
     if args.json_out: